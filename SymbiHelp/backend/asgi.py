@@ -0,0 +1,233 @@
+"""
+ASGI entry point for the async serving mode.
+
+Views marked @llm_view in main.py (/chat and /predict) run their DB work on a
+bounded thread pool and await Groq on the event loop with AsyncGroq, so one
+process can hold hundreds of LLM calls in flight. Every other route runs the
+Flask app unchanged on the same thread pool.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 --workers 2
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker -w 2
+
+ASGI_THREADS (default 32) bounds the threads running Flask/DB code per process;
+keep it near the DB pool size (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+"""
+
+import asyncio
+import contextvars
+import inspect
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import unquote
+
+from flask import g, jsonify
+import httpx
+from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+import main
+import request_metrics
+import tracing
+from main import logger
+from request_profiler import profile_requested
+from wsgi import app
+
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 32))
+LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 60))
+LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', 500))  # The client's default of 100 would cap in-flight calls
+
+executor = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix='asgi-flask')
+
+config = app.config['SYMBIHELP_CONFIG']
+async_groq_client = None
+if config.llm_enabled:
+    async_groq_client = AsyncGroq(
+        api_key=config.groq_api_key,
+        base_url=config.groq_base_url,
+        timeout=LLM_TIMEOUT_SECONDS,
+        http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_CONNECTIONS
+        ))
+    )
+
+def build_environ(scope, body):
+    """PEP 3333 environ for an ASGI http scope with a fully read body"""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': unquote(scope['path'], errors='surrogateescape').encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            key = name
+        else:
+            key = f'HTTP_{name}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ConnectionError('Client disconnected')
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+async def send_response(send, status, headers, body):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def run_wsgi(environ):
+    """Run the Flask app for one request and collect the whole response"""
+    response_start = {}
+
+    def start_response(status, headers, exc_info=None):
+        response_start['status'] = int(status.split(' ', 1)[0])
+        response_start['headers'] = headers
+
+    result = app.wsgi_app(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response_start['status'], response_start['headers'], body
+
+async def complete_llm_call_async(call):
+    if async_groq_client is None or call.messages is None:
+        return call.fallback(None)
+    try:
+        chat = await async_groq_client.chat.completions.create(
+            model=config.groq_model,
+            messages=call.messages,
+            temperature=call.temperature,
+            max_tokens=call.max_tokens,
+        )
+        return (chat.choices[0].message.content or "").strip()
+    except Exception as e:
+        return call.fallback(e)
+
+async def run_llm_view(environ):
+    """Drive an @llm_view request: Flask/DB steps on the thread pool, Groq calls on the loop.
+
+    The request context lives in one contextvars.Context that every step runs
+    in, so it survives the hops between threads.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    request_context = app.request_context(environ)
+    pushed = []
+
+    def in_context(fn, *args):
+        return loop.run_in_executor(executor, context.run, fn, *args)
+
+    def begin():
+        request_context.push()
+        pushed.append(True)
+        rv = app.preprocess_request()
+        if rv is None:
+            g.defer_llm_calls = True
+            rv = app.dispatch_request()
+        return rv
+
+    def step(flow, value, llm_timing):
+        if llm_timing is not None:
+            start_ns, end_ns = llm_timing
+            request_metrics.add_stage_time('groq', (end_ns - start_ns) / 1e9)
+            tracing.record_span('groq', start_ns, end_ns)
+        try:
+            call = flow.send(value)
+        except StopIteration as stop:
+            return None, stop.value
+        main.db.session.commit()  # Don't hold a pooled connection while waiting on Groq
+        return call, None
+
+    def finish(rv):
+        response = app.process_response(app.make_response(rv))
+        return response.status_code, list(response.headers.items()), response.get_data()
+
+    try:
+        rv = await in_context(begin)
+        if inspect.isgenerator(rv):
+            flow, value, llm_timing = rv, None, None
+            while True:
+                call, result = await in_context(step, flow, value, llm_timing)
+                if call is None:
+                    rv = result
+                    break
+                llm_start = time.time_ns()
+                value = await complete_llm_call_async(call)
+                llm_timing = (llm_start, time.time_ns())
+        return await in_context(finish, rv)
+    except Exception as e:
+        logger.error("Error serving %s %s: %s", environ['REQUEST_METHOD'], environ['PATH_INFO'], e)
+        return await in_context(finish, (jsonify({
+            'status': 'error',
+            'message': 'Internal server error'
+        }), HTTPStatus.INTERNAL_SERVER_ERROR))
+    finally:
+        if pushed:
+            await in_context(request_context.pop)
+
+def is_llm_route(environ):
+    adapter = app.url_map.bind_to_environ(environ)
+    try:
+        endpoint, _ = adapter.match()
+    except Exception:
+        return False
+    # functools.wraps copies the marker up through the other decorators
+    return getattr(app.view_functions.get(endpoint), 'llm_view', False)
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if async_groq_client is not None:
+                    await async_groq_client.close()
+                executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    try:
+        body = await read_body(receive)
+    except ConnectionError:
+        return
+    environ = build_environ(scope, body)
+
+    # Profiled requests take the plain WSGI path so one thread sees the whole request
+    if scope['method'] == 'POST' and is_llm_route(environ) and not profile_requested(environ):
+        status, headers, response_body = await run_llm_view(environ)
+    else:
+        loop = asyncio.get_running_loop()
+        status, headers, response_body = await loop.run_in_executor(executor, run_wsgi, environ)
+    await send_response(send, status, headers, response_body)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare /chat throughput of the WSGI and ASGI serving modes against a mock LLM.
+
+1. Start the mock Groq server with a fixed delay per completion:
+
+    python3 mock_groq_server.py --port 9100 --latency fixed:1.0
+
+2. Start the API in either mode, pointed at the mock:
+
+    GROQ_BASE_URL=http://127.0.0.1:9100 gunicorn -w 2 --threads 8 -b 127.0.0.1:5000 wsgi:app
+    GROQ_BASE_URL=http://127.0.0.1:9100 uvicorn asgi:application --workers 2 --port 5000
+
+3. Drive 200 concurrent chat sessions while probing a DB-only endpoint:
+
+    python3 bench_chat_concurrency.py --url http://127.0.0.1:5000 --sessions 200 --messages 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+def describe(label, latencies):
+    if not latencies:
+        print(f"{label:<12} no successful requests")
+        return
+    ms = [value * 1000 for value in latencies]
+    print(f"{label:<12} n={len(ms):<6} p50={percentile(ms, 50):8.1f} ms  p95={percentile(ms, 95):8.1f} ms  "
+          f"p99={percentile(ms, 99):8.1f} ms  mean={statistics.mean(ms):8.1f} ms")
+
+async def login(client, email, password):
+    response = await client.post('/login', json={'email': email, 'password': password})
+    if response.status_code != 200:
+        response = await client.post('/register', json={'email': email, 'password': password,
+                                                          'full_name': 'Chat Bench'})
+    response.raise_for_status()
+    return response.json()['token']
+
+async def chat_session(client, token, messages, latencies, statuses):
+    headers = {'Authorization': f'Bearer {token}'}
+    for i in range(messages):
+        start = time.perf_counter()
+        try:
+            response = await client.post('/chat', json={'query': f'Is it safe to exercise in week {20 + i}?'},
+                                         headers=headers)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] = statuses.get(type(e).__name__, 0) + 1
+
+async def probe_db(client, token, stop, latencies):
+    headers = {'Authorization': f'Bearer {token}'}
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            response = await client.get('/get-health-logs', headers=headers)
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.sessions + 10, max_keepalive_connections=args.sessions + 10)
+    async with httpx.AsyncClient(base_url=args.url.rstrip('/'), limits=limits, timeout=args.timeout) as client:
+        token = await login(client, 'chat-bench@symbihelp.local', 'chat-bench-password')
+
+        chat_latencies, probe_latencies, statuses = [], [], {}
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_db(client, token, stop, probe_latencies))
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            chat_session(client, token, args.messages, chat_latencies, statuses) for _ in range(args.sessions)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    total = args.sessions * args.messages
+    print(f"{args.sessions} sessions x {args.messages} messages = {total} chats in {elapsed:.1f}s "
+          f"-> {len(chat_latencies) / elapsed:.1f} successful chats/s")
+    print(f"Statuses: {dict(sorted(statuses.items(), key=str))}")
+    describe('/chat', chat_latencies)
+    describe('db probe', probe_latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent /chat sessions')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--messages', type=int, default=5, help='Sequential chats per session')
+    parser.add_argument('--timeout', type=float, default=120)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
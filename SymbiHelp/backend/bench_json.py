@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare JSON encode time of the stdlib and orjson providers on API-shaped payloads.
+
+Builds payloads shaped like /get-health-logs, /admin/mothers and
+/nurse/assigned-mothers (with embedded trends), encodes each one repeatedly
+with both backends and prints the median time per encode:
+
+    python3 bench_json.py --repeat 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from flask import Flask
+
+from json_provider import FastJSONProvider, orjson
+
+def health_logs_payload(rows):
+    start = datetime(2026, 1, 1, 8, 30)
+    return {
+        'status': 'success',
+        'logs': [{
+            'id': i,
+            'timestamp': start + timedelta(hours=i),
+            'data': {'Age': 29, 'SystolicBP': 110 + i % 30, 'DiastolicBP': 70 + i % 20,
+                     'BS': round(5 + random.random() * 3, 2), 'BodyTemp': 98.2, 'HeartRate': 60 + i % 25},
+            'consent_shared': bool(i % 2)
+        } for i in range(rows)],
+        'next_cursor': 'WyIyMDI2LTAxLTAxVDA4OjMwOjAwIiwgMV0'
+    }
+
+def mothers_payload(mothers, trend_points):
+    start = datetime(2026, 1, 1)
+    return {
+        'status': 'success',
+        'mothers': [{
+            'id': i,
+            'email': f'mother{i}@example.com',
+            'full_name': f'Mother {i}',
+            'due_date': (start + timedelta(days=200 + i)).date(),
+            'created_at': start + timedelta(days=i),
+            'assigned_at': start + timedelta(days=i, hours=3),
+            'share_consent': True,
+            'latest_risk_probability': np.float64(random.random() * 100),
+            'health_trends': [{
+                'date': (start + timedelta(days=d)).date(),
+                'systolic_bp': np.float32(110 + d % 30),
+                'diastolic_bp': np.float32(70 + d % 20),
+                'blood_sugar': np.float32(6.1),
+                'heart_rate': np.int64(72)
+            } for d in range(trend_points)]
+        } for i in range(mothers)]
+    }
+
+PAYLOADS = {
+    '/get-health-logs (200 rows)': lambda: health_logs_payload(200),
+    '/admin/mothers (500 mothers)': lambda: mothers_payload(500, 0),
+    '/nurse/assigned-mothers (100 x 10 trends)': lambda: mothers_payload(100, 10),
+}
+
+def time_encode(provider, payload, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        provider.dumps(payload)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON providers')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    random.seed(1)
+
+    app = Flask(__name__)
+    backends = ['stdlib'] + (['orjson'] if orjson is not None else [])
+    providers = {name: FastJSONProvider(app, name) for name in backends}
+    if orjson is None:
+        print("orjson is not installed; only the stdlib encoder is measured")
+
+    print(f"{'payload':<44}{'bytes':>9}" + ''.join(f"{name + ' ms':>12}" for name in backends)
+          + (f"{'speedup':>10}" if len(backends) > 1 else ''))
+    for label, build in PAYLOADS.items():
+        payload = build()
+        size = len(providers['stdlib'].dumps(payload).encode('utf-8'))
+        timings = {name: time_encode(provider, payload, args.repeat) for name, provider in providers.items()}
+        row = f"{label:<44}{size:>9}" + ''.join(f"{timings[name] * 1000:>12.3f}" for name in backends)
+        if len(backends) > 1:
+            row += f"{timings['stdlib'] / timings['orjson']:>9.1f}x"
+        print(row)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Count the SQL statements each authenticated endpoint issues per request.
+
+Boots the app against an in-memory SQLite database, seeds one mother, nurse and
+admin, then calls each endpoint once and prints the number of statements sent
+to the database. Run it before and after a change to compare:
+
+    python3 bench_queries_per_request.py
+"""
+
+import logging
+import os
+import sys
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ.setdefault('JWT_SECRET_KEY', 'bench-queries-secret-key-0123456789')
+os.environ.setdefault('FLASK_ENV', 'development')
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.getcwd())
+
+import main  # noqa: E402
+from wsgi import app  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+ENDPOINTS = [
+    ('GET', '/get-mother-profile', 'mother', None),
+    ('GET', '/get-timeline', 'mother', None),
+    ('GET', '/get-health-logs', 'mother', None),
+    ('GET', '/test-results', 'mother', None),
+    ('POST', '/update-health-log', 'mother', 'health_log'),
+    ('GET', '/get-appointments', 'mother', None),
+    ('GET', '/nurse/assigned-mothers', 'nurse', None),
+    ('GET', '/get-assigned-mothers', 'nurse', None),
+    ('GET', '/admin/nurses', 'admin', None),
+    ('GET', '/admin/users', 'admin', None),
+]
+
+HEALTH_DATA = {'Age': 30, 'SystolicBP': 120, 'DiastolicBP': 80, 'BS': 7.0, 'BodyTemp': 98, 'HeartRate': 70}
+
+def main_bench():
+    logging.disable(logging.CRITICAL)
+    statements = [0]
+    with app.app_context():
+        event.listen(main.db.engine, 'before_cursor_execute',
+                     lambda *args: statements.__setitem__(0, statements[0] + 1))
+
+    client = app.test_client()
+    tokens = {}
+    users = {}
+    for role in ('mother', 'nurse', 'admin'):
+        response = client.post('/register', json={
+            'email': f'{role}@bench.local', 'password': 'bench', 'full_name': role.title(), 'role': role
+        }).get_json()
+        tokens[role] = {'Authorization': f"Bearer {response['token']}"}
+        users[role] = response['user']['id']
+
+    client.post('/update-consent', json={'consent': True}, headers=tokens['mother'])
+    client.post('/update-due-date', json={'due_date': '2026-12-01'}, headers=tokens['mother'])
+    client.post('/admin/assign-mother', json={'mother_id': users['mother'], 'nurse_id': users['nurse']},
+                headers=tokens['admin'])
+    for _ in range(12):
+        client.post('/update-health-log', json={'health_data': HEALTH_DATA}, headers=tokens['mother'])
+
+    print(f"{'endpoint':<36}{'status':>8}{'queries':>9}")
+    for method, path, role, body in ENDPOINTS:
+        statements[0] = 0
+        payload = {'health_data': HEALTH_DATA} if body == 'health_log' else None
+        response = client.open(path, method=method, json=payload, headers=tokens[role])
+        print(f"{method + ' ' + path:<36}{response.status_code:>8}{statements[0]:>9}")
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,98 @@
+"""
+Settings that decide how the app is wired: database backend, secrets and the LLM.
+
+Config.from_env() reads them from the environment (main.py loads .env first);
+create_app() in main.py also takes a Config directly, e.g.
+
+    app = create_app(Config(database_url='sqlite://', jwt_secret_key='bench-secret'))
+
+DATABASE_URL selects the backend:
+    postgresql://...      production: SSL, connect timeout, optional PgBouncer mode
+    sqlite:///path/x.db   file database (WAL) for local performance work
+    sqlite://             in-memory database; one connection shared by every thread
+
+GROQ_API_KEY is optional. Without it the LLM-backed endpoints answer with
+their fallback text instead of calling Groq, so the app boots offline.
+
+Tuning knobs (pool sizes, cache sizes, timeouts) are not part of Config; they
+stay environment variables read next to the code they tune.
+"""
+
+import os
+
+from sqlalchemy.engine import make_url
+
+DEFAULT_GROQ_MODEL = 'llama-3.1-70b-versatile'
+
+class ConfigError(Exception):
+    pass
+
+def env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def normalize_database_url(url):
+    # SQLAlchemy dropped the 'postgres' alias that Heroku-style URLs still use
+    return url.replace('postgres://', 'postgresql://', 1) if url.startswith('postgres://') else url
+
+def database_backend(url):
+    """'postgresql', 'sqlite', ... for a database URL"""
+    return make_url(url).get_backend_name()
+
+def is_sqlite_memory(url):
+    parsed = make_url(url)
+    return (parsed.get_backend_name() == 'sqlite'
+            and (parsed.database in (None, '', ':memory:') or parsed.query.get('mode') == 'memory'))
+
+class Config:
+    def __init__(self, database_url, jwt_secret_key, env='production', groq_api_key=None, groq_base_url=None,
+                 groq_model=DEFAULT_GROQ_MODEL, database_replica_urls=(), pgbouncer=False):
+        missing = [name for name, value in (('DATABASE_URL', database_url), ('JWT_SECRET_KEY', jwt_secret_key))
+                   if not value]
+        if missing:
+            raise ConfigError(f"Missing environment variables: {', '.join(missing)}")
+        self.database_url = normalize_database_url(database_url)
+        self.database_replica_urls = [normalize_database_url(url) for url in database_replica_urls]
+        self.jwt_secret_key = jwt_secret_key
+        self.env = env.lower()  # 'development' or 'production'
+        self.groq_api_key = groq_api_key or None
+        self.groq_base_url = groq_base_url or None  # Point at a mock server for load tests
+        self.groq_model = groq_model
+        self.pgbouncer = pgbouncer
+        self.database_backend = database_backend(self.database_url)
+        if self.database_backend != 'postgresql' and self.pgbouncer:
+            raise ConfigError("DB_PGBOUNCER only applies to a postgresql DATABASE_URL")
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            database_url=os.getenv('DATABASE_URL'),
+            jwt_secret_key=os.getenv('JWT_SECRET_KEY'),
+            env=os.getenv('FLASK_ENV', 'production'),
+            groq_api_key=os.getenv('GROQ_API_KEY'),
+            groq_base_url=os.getenv('GROQ_BASE_URL'),
+            groq_model=os.getenv('GROQ_MODEL', DEFAULT_GROQ_MODEL),
+            # Optional read replicas (comma-separated URLs)
+            database_replica_urls=[url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',')
+                                   if url.strip()],
+            # PgBouncer transaction pooling: let PgBouncer own the pool and avoid server-side prepared statements
+            pgbouncer=env_bool('DB_PGBOUNCER')
+        )
+
+    @property
+    def is_development(self):
+        return self.env == 'development'
+
+    @property
+    def is_sqlite(self):
+        return self.database_backend == 'sqlite'
+
+    @property
+    def sqlite_in_memory(self):
+        return is_sqlite_memory(self.database_url)
+
+    @property
+    def llm_enabled(self):
+        return bool(self.groq_api_key)
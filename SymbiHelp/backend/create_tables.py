@@ -27,9 +27,20 @@ CREATE TABLE IF NOT EXISTS users (
     due_date DATE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_admin BOOLEAN DEFAULT FALSE,
-    share_consent BOOLEAN DEFAULT FALSE
+    share_consent BOOLEAN DEFAULT FALSE,
+    token_version INTEGER DEFAULT 0 NOT NULL,
+    data_version INTEGER DEFAULT 0 NOT NULL
 );
 
+-- Create refresh_tokens table (single-use refresh tokens)
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    jti VARCHAR(32) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    expires_at TIMESTAMP NOT NULL,
+    used_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens (user_id);
+
 -- Create test_results table
 CREATE TABLE IF NOT EXISTS test_results (
     id SERIAL PRIMARY KEY,
@@ -56,7 +67,13 @@ CREATE TABLE IF NOT EXISTS mother_health_logs (
     user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     data JSONB NOT NULL,
-    consent_shared BOOLEAN DEFAULT FALSE
+    consent_shared BOOLEAN DEFAULT FALSE,
+    age DOUBLE PRECISION,
+    systolic_bp DOUBLE PRECISION,
+    diastolic_bp DOUBLE PRECISION,
+    blood_sugar DOUBLE PRECISION,
+    body_temp DOUBLE PRECISION,
+    heart_rate DOUBLE PRECISION
 );
 
 -- Create nurse_mother_assignments table
@@ -68,15 +85,33 @@ CREATE TABLE IF NOT EXISTS nurse_mother_assignments (
     CONSTRAINT unique_nurse_mother UNIQUE (nurse_id, mother_id)
 );
 
--- Create appointments table
+-- Create appointments table; a nurse or a mother can never hold two overlapping live bookings
+CREATE EXTENSION IF NOT EXISTS btree_gist;
 CREATE TABLE IF NOT EXISTS appointments (
     id SERIAL PRIMARY KEY,
     mother_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     nurse_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     date_time TIMESTAMP NOT NULL,
+    duration_minutes INTEGER DEFAULT 30 NOT NULL,
+    end_time TIMESTAMP NOT NULL,
     status VARCHAR(20) DEFAULT 'pending' NOT NULL,
-    notes TEXT
+    notes TEXT,
+    CONSTRAINT appointments_nurse_no_overlap
+        EXCLUDE USING gist (nurse_id WITH =, tsrange(date_time, end_time) WITH &&) WHERE (status <> 'cancelled'),
+    CONSTRAINT appointments_mother_no_overlap
+        EXCLUDE USING gist (mother_id WITH =, tsrange(date_time, end_time) WITH &&) WHERE (status <> 'cancelled')
 );
+
+-- Composite indexes for keyset pagination of list endpoints
+CREATE INDEX IF NOT EXISTS ix_mother_health_logs_user_timestamp_id ON mother_health_logs (user_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_test_results_user_date_id ON test_results (user_id, test_date, id);
+CREATE INDEX IF NOT EXISTS ix_test_scores_user_date_id ON test_scores (user_id, test_date, id);
+CREATE INDEX IF NOT EXISTS ix_appointments_mother_date_id ON appointments (mother_id, date_time, id);
+CREATE INDEX IF NOT EXISTS ix_appointments_nurse_date_id ON appointments (nurse_id, date_time, id);
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
+
+-- Case-insensitive email uniqueness; /login looks users up by lower(email)
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email));
 """
 
 def create_tables():
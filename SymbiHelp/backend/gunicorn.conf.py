@@ -0,0 +1,41 @@
+"""
+Gunicorn settings (picked up automatically from the working directory):
+
+    gunicorn wsgi:app
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker
+
+Prepares the shared prometheus_client store so /metrics on any worker reports
+totals for all of them. /metrics needs an admin token; set METRICS_BIND (e.g.
+127.0.0.1:9102) to also serve the metrics unauthenticated on an internal
+address for Prometheus. Command-line flags still override the values below.
+"""
+
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Must be set before any worker imports prometheus_client
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'symbihelp-prometheus'))
+
+def on_starting(server):
+    # Samples left over from a previous run would be added to the new totals
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+def when_ready(server):
+    metrics_bind = os.getenv('METRICS_BIND')
+    if metrics_bind:
+        from request_metrics import start_scrape_server
+        if start_scrape_server(metrics_bind):
+            server.log.info("Serving metrics on %s", metrics_bind)
+        else:
+            server.log.warning("METRICS_BIND is set but prometheus_client is not installed")
+
+def child_exit(server, worker):
+    from request_metrics import mark_process_dead
+    mark_process_dead(worker.pid)
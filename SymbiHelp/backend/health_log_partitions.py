@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Monthly range partition maintenance for mother_health_logs (PostgreSQL only).
+
+The app calls ensure_future_partitions() on startup. Run this file from cron to
+create partitions ahead of time and to archive cold months:
+
+    python3 health_log_partitions.py create --months-ahead 3
+    python3 health_log_partitions.py archive --older-than-months 12 --mode table
+    python3 health_log_partitions.py archive --older-than-months 12 --mode file --archive-dir ./archive
+
+The table must first be converted with migrate_partition_health_logs.py.
+"""
+
+import argparse
+import gzip
+import os
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+PARENT_TABLE = 'mother_health_logs'
+DEFAULT_PARTITION = 'mother_health_logs_default'
+ARCHIVE_TABLE = 'mother_health_logs_archive'
+PARTITION_NAME = re.compile(r'^mother_health_logs_y(\d{4})m(\d{2})$')
+LOCK_KEY = 'mother_health_logs_partitions'
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+def add_months(day, months):
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+def is_partitioned(connection):
+    """True when mother_health_logs is a partitioned table"""
+    result = connection.execute(text("""
+        SELECT 1
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = :table_name
+    """), {'table_name': PARENT_TABLE})
+    return result.fetchone() is not None
+
+def list_month_partitions(connection):
+    """Attached monthly partitions as a {month_start: table_name} dict"""
+    result = connection.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table_name
+    """), {'table_name': PARENT_TABLE})
+    partitions = {}
+    for (name,) in result:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+def create_month_partition(connection, month):
+    """Create the partition for `month`, moving any matching rows out of the default partition"""
+    name = partition_name(month)
+    bounds = {'start': month, 'end': add_months(month, 1)}
+
+    has_default = connection.execute(
+        text("SELECT to_regclass(:name)"), {'name': DEFAULT_PARTITION}
+    ).scalar() is not None
+    stray_rows = has_default and connection.execute(text(f"""
+        SELECT 1 FROM {DEFAULT_PARTITION}
+        WHERE timestamp >= :start AND timestamp < :end
+        LIMIT 1
+    """), bounds).fetchone()
+
+    if not stray_rows:
+        connection.execute(text(f"""
+            CREATE TABLE {name} PARTITION OF {PARENT_TABLE}
+            FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')
+        """))
+        return name
+
+    # Postgres refuses to add a partition whose range already has rows in the default
+    # partition, so build it standalone, move the rows across and attach it afterwards
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+    connection.execute(text(f"""
+        INSERT INTO {name}
+        SELECT * FROM {DEFAULT_PARTITION}
+        WHERE timestamp >= :start AND timestamp < :end
+    """), bounds)
+    connection.execute(text(f"""
+        DELETE FROM {DEFAULT_PARTITION}
+        WHERE timestamp >= :start AND timestamp < :end
+    """), bounds)
+    connection.execute(text(f"""
+        ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name}
+        FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')
+    """))
+    return name
+
+def ensure_future_partitions(connection, months_ahead=3, today=None):
+    """Make sure partitions exist from the current month through `months_ahead` months.
+
+    Returns the names of the partitions that were created. Does nothing when the
+    table has not been partitioned yet.
+    """
+    if not is_partitioned(connection):
+        return []
+
+    # Serialize concurrent callers (e.g. several workers starting at once)
+    connection.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {'key': LOCK_KEY})
+
+    existing = list_month_partitions(connection)
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            created.append(create_month_partition(connection, month))
+    return created
+
+def ensure_archive_table(connection):
+    connection.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {ARCHIVE_TABLE}
+        (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)
+    """))
+    # lz4 TOAST compression needs PostgreSQL 14+; older servers keep the default pglz
+    try:
+        with connection.begin_nested():
+            connection.execute(text(f"ALTER TABLE {ARCHIVE_TABLE} ALTER COLUMN data SET COMPRESSION lz4"))
+    except Exception:
+        pass
+
+def archive_partition_to_file(connection, name, archive_dir):
+    """COPY a detached partition into a gzip-compressed CSV file"""
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{name}.csv.gz"
+
+    raw_connection = connection.connection.dbapi_connection
+    with open(path, 'wb') as raw_file:
+        with gzip.GzipFile(fileobj=raw_file, mode='wb') as archive_file, raw_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER true)", archive_file)
+        # The partition is dropped in the same transaction, so the file must be durable first
+        raw_file.flush()
+        os.fsync(raw_file.fileno())
+    return path
+
+def archive_partitions(connection, older_than_months=12, mode='table', archive_dir='archive', today=None):
+    """Detach monthly partitions that ended more than `older_than_months` ago and archive them.
+
+    mode='table' moves rows into mother_health_logs_archive, mode='file' writes
+    one gzip CSV per partition. The partition is dropped once its rows are archived.
+    """
+    if not is_partitioned(connection):
+        raise RuntimeError(f"{PARENT_TABLE} is not partitioned")
+
+    connection.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {'key': LOCK_KEY})
+
+    cutoff = add_months(month_start(today or date.today()), -older_than_months)
+    if mode == 'table':
+        ensure_archive_table(connection)
+
+    archived = []
+    for month, name in sorted(list_month_partitions(connection).items()):
+        if add_months(month, 1) > cutoff:
+            continue
+
+        connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if mode == 'table':
+            connection.execute(text(f"INSERT INTO {ARCHIVE_TABLE} SELECT * FROM {name}"))
+            destination = ARCHIVE_TABLE
+        else:
+            destination = archive_partition_to_file(connection, name, archive_dir)
+        rows = connection.execute(text(f"SELECT COUNT(*) FROM {name}")).scalar()
+        connection.execute(text(f"DROP TABLE {name}"))
+        archived.append((name, rows, str(destination)))
+    return archived
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain mother_health_logs monthly partitions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    create_parser = subparsers.add_parser('create', help='Create partitions for upcoming months')
+    create_parser.add_argument('--months-ahead', type=int,
+                               default=int(os.getenv('HEALTH_LOG_PARTITION_MONTHS_AHEAD', 3)))
+
+    archive_parser = subparsers.add_parser('archive', help='Archive and drop cold partitions')
+    archive_parser.add_argument('--older-than-months', type=int,
+                                default=int(os.getenv('HEALTH_LOG_ARCHIVE_AFTER_MONTHS', 12)))
+    archive_parser.add_argument('--mode', choices=['table', 'file'], default='table')
+    archive_parser.add_argument('--archive-dir', default=os.getenv('HEALTH_LOG_ARCHIVE_DIR', 'archive'))
+    args = parser.parse_args()
+
+    env_path = Path(__file__).parent / '.env'
+    load_dotenv(dotenv_path=env_path, override=True)
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("Error: DATABASE_URL environment variable not set")
+        sys.exit(1)
+    database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    try:
+        engine = create_engine(database_url, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+        with engine.begin() as connection:
+            if args.command == 'create':
+                created = ensure_future_partitions(connection, args.months_ahead)
+                for name in created:
+                    print(f"✓ Created {name}")
+                print(f"Partitions up to date ({len(created)} created)")
+            else:
+                archived = archive_partitions(connection, args.older_than_months, args.mode, args.archive_dir)
+                for name, rows, destination in archived:
+                    print(f"✓ Archived {name}: {rows} rows -> {destination}")
+                print(f"Archived {len(archived)} partition(s)")
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Flask JSON provider backed by orjson, with a stdlib fallback.
+
+Both encoders write datetime and date values as ISO 8601 strings and NumPy
+scalars and arrays as plain numbers and lists, so handlers can put model
+attributes and model outputs straight into the response dict.
+
+Select the encoder with JSON_PROVIDER=auto|orjson|stdlib (auto uses orjson
+when it is installed).
+"""
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; the stdlib encoder is used instead
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def default(value):
+    """Types neither encoder handles natively"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if np is not None:
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def stdlib_dumps(obj, **kwargs):
+    kwargs.setdefault('default', default)
+    kwargs.setdefault('ensure_ascii', False)
+    kwargs.setdefault('separators', (',', ':'))
+    return json.dumps(obj, **kwargs)
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def orjson_dumps(obj):
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+
+class FastJSONProvider(JSONProvider):
+    """JSONProvider that encodes with orjson when available"""
+
+    mimetype = 'application/json'
+
+    def __init__(self, app, backend='auto'):
+        super().__init__(app)
+        if backend not in ('auto', 'orjson', 'stdlib'):
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        if backend == 'orjson' and orjson is None:
+            raise RuntimeError("JSON_PROVIDER=orjson but orjson is not installed")
+        self.backend = 'stdlib' if backend == 'stdlib' or orjson is None else 'orjson'
+
+    def dumps(self, obj, **kwargs):
+        # orjson takes no formatting kwargs; callers asking for them get the stdlib encoder
+        if self.backend == 'orjson' and not kwargs:
+            return orjson_dumps(obj).decode('utf-8')
+        return stdlib_dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.backend == 'orjson':
+            body = orjson_dumps(obj)
+        else:
+            body = stdlib_dumps(obj).encode('utf-8')
+        return self._app.response_class(body, mimetype=self.mimetype)
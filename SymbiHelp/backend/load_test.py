@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Mixed-traffic HTTP load test with a stored baseline and regression check.
+
+Virtual users log in as synthetic accounts and loop over weighted actions with
+exponential think time:
+- Mothers write health logs, read their timeline and logs, and call /predict and /chat.
+- Nurses poll their dashboard (assigned mothers, appointments).
+- Admins poll the admin dashboard.
+
+Polling clients send If-None-Match, so 304s count as successes, as they would
+from the app.
+
+Prepare a database and the mock LLM, start the API, then run:
+
+    python3 seed_synthetic_data.py --mothers 2000 --end-date 2026-10-01 --seed 42
+    python3 mock_groq_server.py --port 9100 --latency lognormal:0.8,0.4 --seed 7
+    GROQ_BASE_URL=http://127.0.0.1:9100 gunicorn wsgi:app
+    python3 load_test.py --url http://127.0.0.1:5000
+
+The report shows throughput and p50/p95/p99 per endpoint. It is compared with
+load_test_baseline.json when that file exists. An endpoint regresses when its
+p95 or p99 grows by more than --tolerance (and by at least --min-delta-ms), or
+its error rate rises by more than a percentage point (and by at least
+TAIL_SAMPLES errors). A percentile is only
+compared when both runs have at least TAIL_SAMPLES requests beyond it, since a
+p99 over a few hundred requests is a handful of outliers. Total throughput
+regresses when it drops by more than --tolerance. Any regression exits with
+status 1. Use --save-baseline to record a new baseline after an intended
+change. Baselines are only comparable on the same machine, data set and
+server settings, which are stored in the file's "meta" block.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+DEFAULT_BASELINE = Path(__file__).parent / 'load_test_baseline.json'
+
+CHAT_QUESTIONS = [
+    'Is it safe to exercise in the third trimester?',
+    'What should I eat to keep my blood sugar stable?',
+    'How much water should I drink each day?',
+    'Is mild swelling in my feet normal?',
+    'How can I sleep better during pregnancy?',
+]
+
+def health_data(rng):
+    return {
+        'Age': rng.randint(18, 42),
+        'SystolicBP': rng.randint(95, 150),
+        'DiastolicBP': rng.randint(60, 100),
+        'BS': round(rng.uniform(6.0, 12.0), 1),
+        'BodyTemp': round(rng.uniform(97.5, 100.5), 1),
+        'HeartRate': rng.randint(60, 95),
+    }
+
+# (weight, endpoint label, method, path, body builder)
+ACTIONS = {
+    'mother': [
+        (3, 'POST /update-health-log', 'POST', '/update-health-log',
+         lambda rng: {'health_data': health_data(rng), 'consent_shared': rng.random() < 0.7}),
+        (4, 'GET /get-timeline', 'GET', '/get-timeline', None),
+        (2, 'GET /get-health-logs', 'GET', '/get-health-logs', None),
+        (1, 'GET /get-appointments', 'GET', '/get-appointments', None),
+        (1, 'POST /predict', 'POST', '/predict', lambda rng: health_data(rng)),
+        (1, 'POST /chat', 'POST', '/chat', lambda rng: {'query': rng.choice(CHAT_QUESTIONS)}),
+    ],
+    'nurse': [
+        (3, 'GET /nurse/assigned-mothers', 'GET', '/nurse/assigned-mothers', None),
+        (2, 'GET /get-appointments', 'GET', '/get-appointments', None),
+        (1, 'GET /get-assigned-mothers', 'GET', '/get-assigned-mothers', None),
+    ],
+    'admin': [
+        (2, 'GET /admin/stats', 'GET', '/admin/stats', None),
+        (1, 'GET /admin/mothers', 'GET', '/admin/mothers', None),
+        (1, 'GET /admin/users', 'GET', '/admin/users', None),
+        (1, 'GET /admin/test-results', 'GET', '/admin/test-results', None),
+    ],
+}
+
+class Recorder:
+    def __init__(self, measure_from):
+        self.measure_from = measure_from
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.failed_logins = []
+
+    def latency_summary(self, label):
+        ms = [value * 1000 for value in self.latencies[label]]
+        return {
+            'count': len(ms),
+            'p50_ms': round(percentile(ms, 50), 2) if ms else None,
+            'p95_ms': round(percentile(ms, 95), 2) if ms else None,
+            'p99_ms': round(percentile(ms, 99), 2) if ms else None,
+        }
+
+    def record(self, label, started, elapsed, status):
+        if started < self.measure_from:
+            return  # Warm-up
+        if isinstance(status, int) and (200 <= status < 300 or status == 304):
+            self.latencies[label].append(elapsed)
+        else:
+            self.errors[label][str(status)] += 1
+
+async def request(client, recorder, label, method, path, token=None, body=None, etags=None):
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    if etags is not None and path in etags:
+        headers['If-None-Match'] = etags[path]
+    started = time.monotonic()
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, path, json=body, headers=headers)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        recorder.record(label, started, time.perf_counter() - start, type(e).__name__)
+        return None
+    recorder.record(label, started, time.perf_counter() - start, status)
+    if etags is not None and 'ETag' in response.headers:
+        etags[path] = response.headers['ETag']
+    return response
+
+async def login(client, recorder, email, password, limit):
+    """Access token for `email`, or None; at most `limit` logins run at once"""
+    async with limit:
+        for _ in range(10):
+            response = await request(client, recorder, 'POST /login', 'POST', '/login',
+                                     body={'email': email, 'password': password})
+            if response is None or response.status_code != 503:
+                break
+            # The bcrypt pool is shedding load; come back when it says to
+            await asyncio.sleep(float(response.headers.get('Retry-After', 1)))
+    if response is None or response.status_code != 200:
+        recorder.failed_logins.append(f"{email}: {response.status_code if response is not None else 'no response'}")
+        return None
+    return response.json()['token']
+
+async def virtual_user(client, recorder, role, index, token, args, deadline):
+    rng = random.Random(f'{args.seed}:{role}:{index}')
+    # Stagger start-up so the first requests don't all land in the same instant
+    await asyncio.sleep(rng.uniform(0, args.ramp_up))
+    etags = {}
+    actions = ACTIONS[role]
+    weights = [action[0] for action in actions]
+    while time.monotonic() < deadline:
+        _, label, method, path, build_body = rng.choices(actions, weights)[0]
+        await request(client, recorder, label, method, path, token=token,
+                      body=build_body(rng) if build_body else None,
+                      etags=etags if method == 'GET' else None)
+        await asyncio.sleep(rng.expovariate(1 / args.think_time) if args.think_time else 0)
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+def summarize(recorder, seconds):
+    endpoints = {}
+    for label in sorted(set(recorder.latencies) | set(recorder.errors)):
+        ms = [value * 1000 for value in recorder.latencies[label]]
+        errors = sum(recorder.errors[label].values())
+        total = len(ms) + errors
+        endpoints[label] = {
+            'count': len(ms),
+            'errors': dict(recorder.errors[label]),
+            'error_rate': round(errors / total, 4) if total else 0,
+            'rps': round(len(ms) / seconds, 2),
+            'p50_ms': round(percentile(ms, 50), 2) if ms else None,
+            'p95_ms': round(percentile(ms, 95), 2) if ms else None,
+            'p99_ms': round(percentile(ms, 99), 2) if ms else None,
+            'mean_ms': round(statistics.mean(ms), 2) if ms else None,
+        }
+    successes = sum(endpoint['count'] for endpoint in endpoints.values())
+    return {'total_rps': round(successes / seconds, 2), 'endpoints': endpoints}
+
+def print_report(results):
+    print(f"\n{'endpoint':<30}{'n':>7}{'rps':>8}{'err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for label, e in results['endpoints'].items():
+        fmt = lambda value: f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+        print(f"{label:<30}{e['count']:>7}{e['rps']:>8.1f}{e['error_rate'] * 100:>7.1f}"
+              f"{fmt(e['p50_ms'])}{fmt(e['p95_ms'])}{fmt(e['p99_ms'])}")
+        if e['errors']:
+            print(f"{'':<30}errors: {e['errors']}")
+    print(f"\nTotal: {results['total_rps']:.1f} successful requests/s")
+    login = results['login']
+    print(f"Logins (before the measured run): {login['count']} in {login['seconds']:.1f}s, "
+          f"p50={login['p50_ms']} ms, p95={login['p95_ms']} ms, {login['failed']} failed")
+
+# Requests needed above a percentile, or extra errors, before a difference counts
+TAIL_SAMPLES = 10
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Human-readable regressions of `results` against `baseline`"""
+    regressions = []
+    if results['total_rps'] < baseline['total_rps'] * (1 - tolerance):
+        regressions.append(f"total throughput {results['total_rps']:.1f} rps vs baseline {baseline['total_rps']:.1f}")
+    for label, old in baseline['endpoints'].items():
+        new = results['endpoints'].get(label)
+        if new is None or not new['count']:
+            regressions.append(f"{label}: no successful requests (baseline had {old['count']})")
+            continue
+        for key, pct in (('p95_ms', 95), ('p99_ms', 99)):
+            if min(old['count'], new['count']) * (100 - pct) / 100 < TAIL_SAMPLES:
+                continue
+            if new[key] > old[key] * (1 + tolerance) and new[key] - old[key] >= min_delta_ms:
+                regressions.append(f"{label}: {key[:3]} {new[key]:.1f} ms vs baseline {old[key]:.1f} ms "
+                                   f"(+{(new[key] / old[key] - 1) * 100:.0f}%)")
+        new_errors, old_errors = sum(new['errors'].values()), sum(old['errors'].values())
+        if new['error_rate'] > old['error_rate'] + 0.01 and new_errors - old_errors >= TAIL_SAMPLES:
+            regressions.append(f"{label}: error rate {new['error_rate']:.1%} vs baseline {old['error_rate']:.1%}")
+    return regressions
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+async def run(args):
+    users = [(role, index) for role, count in (('mother', args.mothers), ('nurse', args.nurses),
+                                                ('admin', args.admins)) for index in range(count)]
+    limits = httpx.Limits(max_connections=len(users) + 10)
+    async with httpx.AsyncClient(base_url=args.url.rstrip('/'), limits=limits, timeout=args.timeout) as client:
+        # Sessions are opened before the clock starts: logins are bcrypt-bound and would swamp the mix
+        login_recorder = Recorder(measure_from=0)
+        login_start = time.monotonic()
+        limit = asyncio.Semaphore(args.login_concurrency)
+        tokens = await asyncio.gather(*(
+            login(client, login_recorder, f'{role}{index:07d}@{args.email_domain}', args.password, limit)
+            for role, index in users
+        ))
+        login_seconds = time.monotonic() - login_start
+        if login_recorder.failed_logins:
+            print(f"⚠️  {len(login_recorder.failed_logins)} virtual users could not log in "
+                  f"(e.g. {login_recorder.failed_logins[0]}); is the database seeded with seed_synthetic_data.py?")
+
+        measure_from = time.monotonic() + args.ramp_up + args.warmup
+        deadline = measure_from + args.duration
+        recorder = Recorder(measure_from)
+        await asyncio.gather(*(
+            virtual_user(client, recorder, role, index, token, args, deadline)
+            for (role, index), token in zip(users, tokens) if token
+        ))
+
+    results = summarize(recorder, args.duration)
+    results['login'] = {'seconds': round(login_seconds, 2), 'failed': len(login_recorder.failed_logins),
+                        **login_recorder.latency_summary('POST /login')}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Mixed-traffic load test with baseline tracking')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds, after ramp-up and warm-up')
+    parser.add_argument('--ramp-up', type=float, default=5)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument('--mothers', type=int, default=50, help='Concurrent mother sessions')
+    parser.add_argument('--nurses', type=int, default=5)
+    parser.add_argument('--admins', type=int, default=1)
+    parser.add_argument('--login-concurrency', type=int, default=4, help='Logins in flight while opening sessions')
+    parser.add_argument('--think-time', type=float, default=1.0, help='Mean seconds between a user\'s actions')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--email-domain', default='synthetic.symbihelp.local')
+    parser.add_argument('--password', default='synthetic-password')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Write this run to --baseline')
+    parser.add_argument('--output', type=Path, help='Also write this run\'s results here')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown (0.2 = 20%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=25, help='Ignore latency changes smaller than this')
+    parser.add_argument('--label', default='', help='Describe the server setup, stored with the results')
+    args = parser.parse_args()
+
+    print(f"Load test: {args.mothers} mothers, {args.nurses} nurses, {args.admins} admins "
+          f"for {args.duration:.0f}s against {args.url}")
+    results = asyncio.run(run(args))
+    results['meta'] = {
+        'git_commit': git_commit(),
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'machine': f"{platform.system()} {platform.machine()}, python {platform.python_version()}",
+        'label': args.label,
+        'config': {key: getattr(args, key) for key in
+                   ('duration', 'mothers', 'nurses', 'admins', 'think_time', 'seed')},
+    }
+    print_report(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline['meta'].get('config') != results['meta']['config']:
+        print("⚠️  Baseline was recorded with a different configuration; comparison may not be meaningful")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) beyond {args.tolerance:.0%} of baseline "
+              f"({baseline['meta'].get('git_commit')}):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print(f"\n✓ Within {args.tolerance:.0%} of baseline ({baseline['meta'].get('git_commit')})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Check that a burst of logins does not slow down the rest of the API.
+
+Probes GET /get-health-logs at a steady rate, first on its own and then while
+many clients log in at once, and prints latency percentiles for both phases
+plus how the logins were answered (200 or 503 from the bcrypt pool).
+
+Start the server with several threads so the probe and the logins share a worker:
+
+    gunicorn -w 1 --threads 16 -b 127.0.0.1:5000 wsgi:app
+    python3 load_test_login_burst.py --url http://127.0.0.1:5000 --logins 200 --concurrency 32
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+def call(url, method='GET', body=None, token=None):
+    """Returns (status, json body, seconds)"""
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(url, data=data, headers=headers, method=method)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    elapsed = time.perf_counter() - start
+    try:
+        return status, json.loads(payload or b'{}'), elapsed
+    except ValueError:
+        return status, {}, elapsed
+
+def ensure_user(base_url, email, password):
+    status, body, _ = call(f'{base_url}/login', 'POST', {'email': email, 'password': password})
+    if status != 200:
+        status, body, _ = call(f'{base_url}/register', 'POST',
+                               {'email': email, 'password': password, 'full_name': 'Load Test'})
+    if status not in (200, 201):
+        sys.exit(f'Could not log in or register {email}: {status} {body}')
+    return body['token']
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(label, latencies):
+    ms = [value * 1000 for value in latencies]
+    print(f"{label:<14} n={len(ms):<5} p50={percentile(ms, 50):7.1f} ms  "
+          f"p95={percentile(ms, 95):7.1f} ms  p99={percentile(ms, 99):7.1f} ms  "
+          f"mean={statistics.mean(ms):7.1f} ms")
+
+def probe(base_url, token, interval, stop):
+    latencies = []
+    while not stop.is_set():
+        status, _, elapsed = call(f'{base_url}/get-health-logs', token=token)
+        if status == 200:
+            latencies.append(elapsed)
+        time.sleep(interval)
+    return latencies
+
+def run_probe(base_url, token, interval, seconds):
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(probe, base_url, token, interval, stop)
+        time.sleep(seconds)
+        stop.set()
+        return future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure /get-health-logs latency during a login burst')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--logins', type=int, default=200, help='Logins in the burst')
+    parser.add_argument('--concurrency', type=int, default=32, help='Logins in flight at once')
+    parser.add_argument('--baseline-seconds', type=float, default=5)
+    parser.add_argument('--probe-interval', type=float, default=0.05)
+    parser.add_argument('--password', default='load-test-password')
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip('/')
+    probe_token = ensure_user(base_url, 'loadtest-probe@symbihelp.local', args.password)
+    login_email = 'loadtest-login@symbihelp.local'
+    ensure_user(base_url, login_email, args.password)
+
+    print(f"Baseline: probing /get-health-logs for {args.baseline_seconds}s...")
+    baseline = run_probe(base_url, probe_token, args.probe_interval, args.baseline_seconds)
+
+    print(f"Burst: {args.logins} logins, {args.concurrency} concurrent...")
+    stop = threading.Event()
+    login_results = []
+    with ThreadPoolExecutor(max_workers=1) as probe_executor:
+        probe_future = probe_executor.submit(probe, base_url, probe_token, args.probe_interval, stop)
+        burst_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            login_results = list(executor.map(
+                lambda _: call(f'{base_url}/login', 'POST', {'email': login_email, 'password': args.password}),
+                range(args.logins)
+            ))
+        burst_seconds = time.perf_counter() - burst_start
+        stop.set()
+        during_burst = probe_future.result()
+
+    print()
+    summarize('baseline', baseline)
+    summarize('during burst', during_burst)
+    login_statuses = Counter(status for status, _, _ in login_results)
+    summarize('logins', [elapsed for _, _, elapsed in login_results])
+    print(f"Login statuses: {dict(sorted(login_statuses.items()))} in {burst_seconds:.1f}s")
+
+    if baseline and during_burst:
+        ratio = percentile(during_burst, 95) / percentile(baseline, 95)
+        print(f"p95 during burst is {ratio:.2f}x the baseline")
+
+if __name__ == '__main__':
+    main()
@@ -1,69 +1,68 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, current_app, request, jsonify, g, has_request_context, make_response, send_file
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
 import pandas as pd
 import numpy as np
 import pickle
 from http import HTTPStatus
-from groq import Groq
 from dotenv import load_dotenv
 import os
-import bcrypt
 import jwt
-from datetime import datetime, timedelta
-from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy import func
+from datetime import date, datetime, timedelta
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy import create_engine, event, func, insert, text, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB, ExcludeConstraint
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from functools import wraps
 import logging
+import base64
+import csv
+import gzip
+import hashlib
+import io
+import json
+import random
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
+from health_log_partitions import ensure_future_partitions
+from password_hashing import PasswordHasher, PasswordHasherBusy, is_bcrypt_hash
+from json_provider import FastJSONProvider
+from config import Config, env_bool, is_sqlite_memory
+import structured_logging
+from structured_logging import SAMPLED, redact_email
+import request_metrics
+from query_monitor import QueryMonitor
+from request_profiler import AUTHORIZED_KEY, USER_ID_KEY, RequestProfiler, profile_requested
+from tracing import Tracer, span
+from request_metrics import stage_timer
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+try:
+    from groq import Groq
+except ImportError:  # Optional dependency; the LLM endpoints answer with their fallbacks without it
+    Groq = None
+
+# Set up logging: records are queued by request threads and written as JSON by a listener thread
+structured_logging.configure_logging()
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file in the same directory as main.py
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path, override=True)
 
-# Environment variables
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-DATABASE_URL = os.getenv('DATABASE_URL')
-JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
-ENV = os.getenv('FLASK_ENV', 'production').lower()  # 'development' or 'production'
-
-# Environment specific settings
-IS_DEVELOPMENT = ENV == 'development'
-
-# Validate environment variables with detailed logging
-missing_vars = []
-if not DATABASE_URL:
-    missing_vars.append('DATABASE_URL')
-if not JWT_SECRET_KEY:
-    missing_vars.append('JWT_SECRET_KEY')
-if not GROQ_API_KEY:
-    missing_vars.append('GROQ_API_KEY')
-if missing_vars:
-    logger.error(f"Missing environment variables: {', '.join(missing_vars)}")
-    raise Exception(f"Missing environment variables: {', '.join(missing_vars)}")
-
-# Configure Groq AI provider
-groq_client = None
-if GROQ_API_KEY:
-    try:
-        groq_client = Groq(api_key=GROQ_API_KEY)
-        logger.info("Groq client configured successfully")
-    except Exception as e:
-        logger.error(f"Failed to configure Groq client: {str(e)}")
-        groq_client = None
-
-app = Flask(__name__)
+# Every route and request hook lives on this blueprint; create_app() registers it
+api = Blueprint('api', __name__)
 
 # Handle OPTIONS requests for CORS preflight
-@app.before_request
+@api.before_app_request
 def handle_options():
     if request.method == 'OPTIONS':
         response = jsonify({})
-        if IS_DEVELOPMENT:
+        if current_app.config['IS_DEVELOPMENT']:
             response.headers.add('Access-Control-Allow-Origin', 'http://localhost:8081')
         else:
             response.headers.add('Access-Control-Allow-Origin', 'https://your-frontend-domain.com')
@@ -72,51 +71,295 @@ def handle_options():
         response.headers.add('Access-Control-Allow-Credentials', 'true')
         return response, 200
 
-# Configure CORS based on environment
-if IS_DEVELOPMENT:
-    # In development, allow all origins for easier testing
-    CORS(app, resources={
-        r"/*": {
-            "origins": ["http://localhost:8081", "http://127.0.0.1:8081"],
-            "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-            "supports_credentials": True,
-            "expose_headers": ["Content-Disposition"]
-        }
-    })
-else:
-    # In production, restrict to your frontend domain
-    CORS(app, resources={
-        r"/*": {
-            "origins": ["https://your-frontend-domain.com"],  # Replace with your actual frontend domain
-            "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-            "supports_credentials": True,
-            "expose_headers": ["Content-Disposition"]
-        }
-    })
-
-# Configure SQLAlchemy
-app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL.replace("postgres://", "postgresql://")
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Compress larger text responses for clients that accept gzip
+GZIP_MIN_BYTES = int(os.getenv('GZIP_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+
+@api.after_app_request
+def compress_response(response):
+    if (response.status_code != HTTPStatus.OK
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype == 'application/json' or (response.mimetype or '').startswith('text/'))
+            or 'gzip' not in request.accept_encodings):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def configure_cors(app, is_development):
+    if is_development:
+        # In development, allow all origins for easier testing
+        CORS(app, resources={
+            r"/*": {
+                "origins": ["http://localhost:8081", "http://127.0.0.1:8081"],
+                "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+                "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
+                "supports_credentials": True,
+                "expose_headers": ["Content-Disposition"]
+            }
+        })
+    else:
+        # In production, restrict to your frontend domain
+        CORS(app, resources={
+            r"/*": {
+                "origins": ["https://your-frontend-domain.com"],  # Replace with your actual frontend domain
+                "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+                "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
+                "supports_credentials": True,
+                "expose_headers": ["Content-Disposition"]
+            }
+        })
 
-# Configure SSL based on environment
-if IS_DEVELOPMENT:
-    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        'connect_args': {
-            'sslmode': 'disable',  # Disable SSL for local development
-            'connect_timeout': 5
-        }
-    }
-else:
-    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        'connect_args': {
-            'sslmode': 'require',  # Require SSL in production
-            'connect_timeout': 5
-        }
+# Connection pool defaults per environment; every value can be overridden with a DB_* variable
+POOL_DEFAULTS = {
+    'development': {
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_timeout': 10,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True
+    },
+    'production': {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 5,
+        'pool_recycle': 300,  # Managed Postgres drops idle SSL connections
+        'pool_pre_ping': True
     }
+}
+
+class PoolMetrics:
+    """Process-wide connection pool counters for the metrics endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe_wait(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def on_checkout(self, *args):
+        with self._lock:
+            self.in_use += 1
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def snapshot(self, pool):
+        with self._lock:
+            data = {
+                'pool_class': type(pool).__name__,
+                'pgbouncer_mode': current_app.config['DB_PGBOUNCER'],
+                'in_use': self.in_use,
+                'checkouts': self.checkouts,
+                'checkout_timeouts': self.timeouts,
+                'checkout_wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0,
+                'checkout_wait_max_ms': round(self.wait_max * 1000, 3)
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                'pool_size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': max(0, pool.overflow())
+            })
+        return data
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
 
-db = SQLAlchemy(app)
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.observe_wait(time.perf_counter() - start)
+
+# SQLite (local performance work): how long a writer waits for the database lock, and WAL so readers don't block it
+SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', 30))
+SQLITE_WAL = env_bool('SQLITE_WAL', True)
+
+def build_engine_options(database_url, config, instrumented=True):
+    """Engine options for `database_url` from the backend, the environment defaults and DB_* overrides."""
+    defaults = POOL_DEFAULTS['development' if config.is_development else 'production']
+    if database_url.startswith('sqlite'):
+        options = {'connect_args': {'check_same_thread': False, 'timeout': SQLITE_BUSY_TIMEOUT}}
+        if is_sqlite_memory(database_url):
+            # Every new connection would open a new, empty database; share one across all threads
+            options['poolclass'] = StaticPool
+            return options
+    else:
+        options = {'connect_args': {
+            'sslmode': 'disable' if config.is_development else 'require',  # Require SSL in production
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5))
+        }}
+
+    if config.pgbouncer:
+        # PgBouncer already pools server connections; holding a second pool here only pins them
+        options['poolclass'] = NullPool
+        if database_url.startswith('postgresql+psycopg:'):
+            # psycopg 3 prepares statements server-side after a few executions
+            options['connect_args']['prepare_threshold'] = None
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool if instrumented else QueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', defaults['pool_size'])),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', defaults['max_overflow'])),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', defaults['pool_timeout'])),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', defaults['pool_recycle'])),
+        'pool_pre_ping': env_bool('DB_POOL_PRE_PING', defaults['pool_pre_ping'])
+    })
+    return options
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    if SQLITE_WAL:
+        cursor.execute('PRAGMA journal_mode=WAL')  # Ignored (stays 'memory') for in-memory databases
+        cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+# GET requests read from a replica (DATABASE_REPLICA_URLS) unless the caller wrote recently,
+# so they always see their own writes.
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+
+class RecentWriters:
+    """Users who committed a write within the read-your-writes window, shared through Redis.
+
+    Every worker must see every write, so the marks live in Redis with the
+    window as their expiry; this process's own marks are also kept locally to
+    skip the round trip. Without Redis only the local marks exist: a caller
+    whose write went through another worker may briefly read stale data from a
+    replica. If a configured Redis cannot be reached, every caller counts as a
+    recent writer and reads from the primary.
+    """
+
+    def __init__(self, window_seconds, redis_url=None):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._expires = {}
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.2)
+            except ImportError:
+                logger.warning("READ_YOUR_WRITES_REDIS_URL is set but the redis package is not installed")
+
+    @property
+    def shared(self):
+        return self._redis is not None
+
+    @staticmethod
+    def _shared_key(user_id):
+        return f"symbihelp:recent-write:{user_id}"
+
+    def mark(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            self._expires[user_id] = now + self.window_seconds
+            if len(self._expires) > 10000:
+                self._expires = {uid: exp for uid, exp in self._expires.items() if exp > now}
+        if self._redis is not None:
+            try:
+                self._redis.set(self._shared_key(user_id), 1, px=int(self.window_seconds * 1000))
+            except Exception as e:
+                logger.warning("Read-your-writes store unavailable: %s", e)
+
+    def is_recent(self, user_id):
+        with self._lock:
+            expires = self._expires.get(user_id)
+        if expires is not None and expires > time.monotonic():
+            return True
+        if self._redis is None:
+            return False
+        try:
+            return bool(self._redis.exists(self._shared_key(user_id)))
+        except Exception as e:
+            logger.warning("Read-your-writes store unavailable: %s", e)
+            return True
+
+recent_writers = RecentWriters(
+    READ_YOUR_WRITES_SECONDS,
+    redis_url=os.getenv('READ_YOUR_WRITES_REDIS_URL') or os.getenv('TIMELINE_CACHE_REDIS_URL')
+)
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Session that sends read-only requests to a replica and everything else to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica_engines = current_app.extensions['replica_engines']
+        if bind is None and replica_engines and self._use_replica():
+            if '_replica_engine' not in g:
+                # Stick to one replica for the whole request
+                g._replica_engine = random.choice(replica_engines)
+            return g._replica_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def commit(self):
+        with span('db.commit'):
+            super().commit()
+
+    def _use_replica(self):
+        if self._flushing or not has_request_context():
+            return False
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        user_id = getattr(request, 'user_id', None)
+        return user_id is None or not recent_writers.is_recent(user_id)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def mark_session_wrote(session, flush_context):
+    session.info['wrote'] = True
+
+@event.listens_for(RoutingSession, 'after_commit')
+def remember_recent_writer(session):
+    if session.info.pop('wrote', False) and has_request_context():
+        user_id = getattr(request, 'user_id', None)
+        if user_id is not None:
+            recent_writers.mark(user_id)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Admins can profile a single request with `X-Profile: 1` or `?profile=1`; other requests skip the profiler
+REQUEST_PROFILING = env_bool('REQUEST_PROFILING', True)
+
+# Nested spans per request (auth, queries, inference, Groq, commit) written as NDJSON; see trace_summary.py.
+# Only TRACE_SAMPLE_RATE of requests record spans; raise it while investigating a slow endpoint
+tracer = Tracer(
+    os.getenv('TRACE_DIR', os.path.join(tempfile.gettempdir(), 'symbihelp-traces')),
+    sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', 0.01)),
+    max_bytes=int(os.getenv('TRACE_FILE_MAX_BYTES', 50 * 1024 * 1024)),
+    backups=int(os.getenv('TRACE_FILE_BACKUPS', 5)),
+    queue_size=int(os.getenv('TRACE_QUEUE_SIZE', 10000)),
+    enabled=env_bool('TRACING', True)
+)
+
+# JSONB on Postgres (what the migrations create), plain JSON elsewhere
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
 
 # Models
 class User(db.Model):
@@ -131,13 +374,29 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_admin = db.Column(db.Boolean, default=False)
     share_consent = db.Column(db.Boolean, default=False)  # Consent for data sharing with nurses
+    token_version = db.Column(db.Integer, default=0, nullable=False)  # Bump to revoke every issued token
+    data_version = db.Column(db.Integer, default=0, nullable=False)  # Bumped on every write to the user's data; used for ETags
     test_results = db.relationship('TestResult', backref='user', lazy=True)
     test_scores = db.relationship('TestScore', backref='user', lazy=True)
     health_logs = db.relationship('MotherHealthLog', backref='user', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+        # Emails are unique case-insensitively; /login looks users up by lower(email)
+        db.Index('ix_users_email_lower', func.lower(email), unique=True),
+    )
+
     def __repr__(self):
         return f"<User {self.email}>"
 
+class RefreshToken(db.Model):
+    """One issued refresh token; /refresh consumes it, so each token works once"""
+    __tablename__ = 'refresh_tokens'
+    jti = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    used_at = db.Column(db.DateTime, nullable=True)
+
 class TestResult(db.Model):
     __tablename__ = 'test_results'
     id = db.Column(db.Integer, primary_key=True)
@@ -145,7 +404,10 @@ class TestResult(db.Model):
     score = db.Column(db.Float, nullable=False)
     test_date = db.Column(db.DateTime, default=datetime.utcnow)
     risk_level = db.Column(db.String(50), nullable=False)
-    details = db.Column(db.JSON, nullable=True)
+    details = db.Column(JSONType, nullable=True)
+
+    # Supports keyset pagination of a user's results ordered by (test_date, id)
+    __table_args__ = (db.Index('ix_test_results_user_date_id', 'user_id', 'test_date', 'id'),)
 
     def __repr__(self):
         return f"<TestResult {self.id} for User {self.user_id}>"
@@ -157,7 +419,9 @@ class TestScore(db.Model):
     score = db.Column(db.Integer, nullable=False)  # User's achieved score
     max_score = db.Column(db.Integer, default=15, nullable=False)  # Fixed maximum score of 15
     test_date = db.Column(db.DateTime, default=datetime.utcnow)  # Date and time of test
-    topics = db.Column(db.JSON, nullable=True)
+    topics = db.Column(JSONType, nullable=True)
+
+    __table_args__ = (db.Index('ix_test_scores_user_date_id', 'user_id', 'test_date', 'id'),)
 
     def __repr__(self):
         return f"<TestScore {self.id} for User {self.user_id}>"
@@ -167,12 +431,94 @@ class MotherHealthLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
-    data = db.Column(db.JSON, nullable=False)  # Store health data as JSON
+    data = db.Column(JSONType, nullable=False)  # Store health data as JSON
     consent_shared = db.Column(db.Boolean, default=False)  # Consent for sharing with nurses
+    # Typed copies of the vitals in `data`, populated on write so trend views read plain columns
+    age = db.Column(db.Float, nullable=True)
+    systolic_bp = db.Column(db.Float, nullable=True)
+    diastolic_bp = db.Column(db.Float, nullable=True)
+    blood_sugar = db.Column(db.Float, nullable=True)
+    body_temp = db.Column(db.Float, nullable=True)
+    heart_rate = db.Column(db.Float, nullable=True)
+
+    __table_args__ = (db.Index('ix_mother_health_logs_user_timestamp_id', 'user_id', 'timestamp', 'id'),)
+
+    # Health data key -> typed column
+    VITALS_COLUMNS = {
+        'Age': 'age',
+        'SystolicBP': 'systolic_bp',
+        'DiastolicBP': 'diastolic_bp',
+        'BS': 'blood_sugar',
+        'BodyTemp': 'body_temp',
+        'HeartRate': 'heart_rate'
+    }
+
+    @staticmethod
+    def vitals_from_data(health_data):
+        vitals = {}
+        for key, column in MotherHealthLog.VITALS_COLUMNS.items():
+            try:
+                vitals[column] = float(health_data.get(key))
+            except (TypeError, ValueError):
+                vitals[column] = None
+        return vitals
+
+    @classmethod
+    def from_health_data(cls, user_id, health_data, consent_shared=False, **kwargs):
+        return cls(
+            user_id=user_id,
+            data=health_data,
+            consent_shared=consent_shared,
+            **cls.vitals_from_data(health_data),
+            **kwargs
+        )
 
     def __repr__(self):
         return f"<MotherHealthLog {self.id} for User {self.user_id}>"
 
+REQUIRED_HEALTH_FIELDS = ['Age', 'SystolicBP', 'DiastolicBP', 'BS', 'BodyTemp', 'HeartRate']
+
+# Health logs newer than this are "hot"; older monthly partitions are only read when needed
+HEALTH_LOG_HOT_DAYS = int(os.getenv('HEALTH_LOG_HOT_DAYS', 90))
+HEALTH_LOG_PARTITION_MONTHS_AHEAD = int(os.getenv('HEALTH_LOG_PARTITION_MONTHS_AHEAD', 3))
+
+def latest_health_logs(columns, user_id, limit):
+    """Newest `limit` health log rows for a user, selecting only `columns`.
+
+    The hot window is searched first so a partitioned table is pruned to recent
+    months; older rows are read only when the window holds fewer than `limit`.
+    """
+    query = db.session.query(*columns).filter(MotherHealthLog.user_id == user_id)\
+        .order_by(MotherHealthLog.timestamp.desc(), MotherHealthLog.id.desc())
+    if HEALTH_LOG_HOT_DAYS <= 0:
+        return query.limit(limit).all()
+
+    hot_since = datetime.utcnow() - timedelta(days=HEALTH_LOG_HOT_DAYS)
+    rows = query.filter(MotherHealthLog.timestamp >= hot_since).limit(limit).all()
+    if len(rows) < limit:
+        rows += query.filter(MotherHealthLog.timestamp < hot_since).limit(limit - len(rows)).all()
+    return rows
+
+def get_health_trends(user_id, limit=10):
+    """Latest `limit` vitals for a user, read from the typed columns only."""
+    rows = latest_health_logs([
+        MotherHealthLog.timestamp,
+        MotherHealthLog.systolic_bp,
+        MotherHealthLog.diastolic_bp,
+        MotherHealthLog.blood_sugar,
+        MotherHealthLog.body_temp,
+        MotherHealthLog.heart_rate
+    ], user_id, limit)
+
+    return [{
+        'date': row.timestamp.strftime('%Y-%m-%d'),
+        'systolic_bp': row.systolic_bp or 0,
+        'diastolic_bp': row.diastolic_bp or 0,
+        'blood_sugar': row.blood_sugar or 0,
+        'body_temp': row.body_temp or 0,
+        'heart_rate': row.heart_rate or 0
+    } for row in rows]
+
 class NurseMotherAssignment(db.Model):
     __tablename__ = 'nurse_mother_assignments'
     id = db.Column(db.Integer, primary_key=True)
@@ -193,19 +539,216 @@ class Appointment(db.Model):
     mother_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     nurse_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     date_time = db.Column(db.DateTime, nullable=False)
+    duration_minutes = db.Column(db.Integer, default=30, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)  # date_time + duration, stored for overlap queries
     status = db.Column(db.String(20), default='pending', nullable=False)
     notes = db.Column(db.Text, nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_appointments_mother_date_id', 'mother_id', 'date_time', 'id'),
+        db.Index('ix_appointments_nurse_date_id', 'nurse_id', 'date_time', 'id'),
+        # Postgres rejects overlapping live bookings even when two requests race past the overlap check
+        # (needs btree_gist, created by init_database); other backends rely on that check alone
+        ExcludeConstraint((nurse_id, '='), (func.tsrange(date_time, end_time), '&&'),
+                          name='appointments_nurse_no_overlap', using='gist',
+                          where=text("status <> 'cancelled'")).ddl_if(dialect='postgresql'),
+        ExcludeConstraint((mother_id, '='), (func.tsrange(date_time, end_time), '&&'),
+                          name='appointments_mother_no_overlap', using='gist',
+                          where=text("status <> 'cancelled'")).ddl_if(dialect='postgresql'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
             'mother_id': self.mother_id,
             'nurse_id': self.nurse_id,
-            'date_time': self.date_time.isoformat(),
+            'date_time': self.date_time,
+            'duration_minutes': self.duration_minutes,
+            'end_time': self.end_time,
             'status': self.status,
             'notes': self.notes or ''
         }
 
+# Per-user change counter behind the ETags of the user's read endpoints
+VERSIONED_BY_USER = (MotherHealthLog, TestResult, TestScore)
+
+def bump_data_version(session, user_ids):
+    """Increment users.data_version for `user_ids` (call directly for writes that bypass the ORM unit of work)"""
+    if user_ids:
+        session.connection().execute(
+            update(User.__table__)
+            .where(User.__table__.c.id.in_(sorted(user_ids)))
+            .values(data_version=User.__table__.c.data_version + 1)
+        )
+        session.info.setdefault('versioned_users', set()).update(user_ids)
+
+@event.listens_for(RoutingSession, 'before_flush')
+def collect_changed_users(session, flush_context, instances):
+    changed = session.info.setdefault('changed_users', set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, VERSIONED_BY_USER):
+            changed.add(obj.user_id)
+        elif isinstance(obj, User) and obj.id is not None and session.is_modified(obj):
+            changed.add(obj.id)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def bump_changed_users(session, flush_context):
+    bump_data_version(session, session.info.pop('changed_users', None))
+
+class TimelineCache:
+    """Per-user timeline snapshots: an in-process LRU in front of an optional Redis.
+
+    Snapshots are keyed by (user_id, data_version), so a write makes the old
+    snapshot unreachable in every process; committed writes also evict it
+    from this process straight away.
+    """
+
+    def __init__(self, max_entries, redis_url=None, ttl_seconds=86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.2)
+            except ImportError:
+                logger.warning("TIMELINE_CACHE_REDIS_URL is set but the redis package is not installed")
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _shared_key(user_id, version):
+        return f"symbihelp:timeline:{user_id}:{version}"
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+
+        snapshot = None
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._shared_key(user_id, version))
+                snapshot = json.loads(raw) if raw else None
+            except Exception as e:
+                logger.warning("Timeline cache store unavailable: %s", e)
+        with self._lock:
+            if snapshot is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self._store_local(user_id, version, snapshot)
+        return snapshot
+
+    def put(self, user_id, version, snapshot):
+        self._store_local(user_id, version, snapshot)
+        if self._redis is not None:
+            try:
+                self._redis.set(self._shared_key(user_id, version), json.dumps(snapshot), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning("Timeline cache store unavailable: %s", e)
+
+    def _store_local(self, user_id, version, snapshot):
+        with self._lock:
+            self._entries[user_id] = (version, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def snapshot_metrics(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'shared_store': self._redis is not None,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0
+            }
+
+timeline_cache = TimelineCache(
+    max_entries=int(os.getenv('TIMELINE_CACHE_SIZE', 10000)),
+    redis_url=os.getenv('TIMELINE_CACHE_REDIS_URL'),
+    ttl_seconds=int(os.getenv('TIMELINE_CACHE_TTL_SECONDS', 86400))
+)
+
+@event.listens_for(RoutingSession, 'after_commit')
+def evict_changed_timelines(session):
+    changed = session.info.pop('versioned_users', None)
+    if changed:
+        timeline_cache.invalidate(changed)
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def forget_changed_users(session):
+    session.info.pop('changed_users', None)
+    session.info.pop('versioned_users', None)
+
+# Appointment lengths are bounded so overlap checks can range-scan the (nurse_id, date_time) index
+DEFAULT_APPOINTMENT_MINUTES = int(os.getenv('DEFAULT_APPOINTMENT_MINUTES', 30))
+MAX_APPOINTMENT_MINUTES = int(os.getenv('MAX_APPOINTMENT_MINUTES', 240))
+MAX_FREE_SLOT_RANGE_DAYS = 31
+
+def overlapping_appointments(start, end, nurse_id=None, mother_id=None, query=None):
+    """Filter `query` (all appointment columns by default) to non-cancelled bookings
+    of the nurse and/or mother that overlap [start, end)."""
+    if nurse_id is not None and mother_id is not None:
+        owner = (Appointment.nurse_id == nurse_id) | (Appointment.mother_id == mother_id)
+    elif nurse_id is not None:
+        owner = Appointment.nurse_id == nurse_id
+    else:
+        owner = Appointment.mother_id == mother_id
+    if query is None:
+        query = Appointment.query
+    return query.filter(
+        owner,
+        Appointment.status != 'cancelled',
+        Appointment.date_time < end,
+        # Lower bound on the start keeps this an index range scan instead of a full history scan
+        Appointment.date_time > start - timedelta(minutes=MAX_APPOINTMENT_MINUTES),
+        Appointment.end_time > start
+    )
+
+def compute_free_slots(busy, range_start, range_end, slot_minutes, day_start, day_end):
+    """Sweep sorted busy (start, end) intervals and return free slots of `slot_minutes` within working hours."""
+    slot = timedelta(minutes=slot_minutes)
+    free_slots = []
+    busy_index = 0
+    day = range_start.date()
+    while day <= range_end.date():
+        window_start = max(datetime.combine(day, day_start), range_start)
+        window_end = min(datetime.combine(day, day_end), range_end)
+        cursor = window_start
+        # Skip intervals that finished before this window
+        while busy_index < len(busy) and busy[busy_index][1] <= cursor:
+            busy_index += 1
+        scan = busy_index
+        while cursor + slot <= window_end:
+            if scan < len(busy) and busy[scan][0] < cursor + slot:
+                # Slot collides with the next busy interval; jump past it
+                cursor = max(cursor, busy[scan][1])
+                scan += 1
+                continue
+            free_slots.append({'start': cursor, 'end': cursor + slot})
+            cursor += slot
+        day += timedelta(days=1)
+    return free_slots
+
 # Load the scaler and model
 try:
     with open('scaler.pkl', 'rb') as f:
@@ -213,14 +756,75 @@ try:
     with open('logistic_regression_model.pkl', 'rb') as f:
         model = pickle.load(f)
 except FileNotFoundError as e:
-    logger.error(f"Model or scaler file not found: {str(e)}")
+    logger.error("Model or scaler file not found: %s", e)
     raise Exception(f"Model or scaler file not found: {str(e)}")
 
 # Risk mapping
 risk_mapping = {0: 'Low Risk', 1: 'High/Mid Risk'}
 
-# Utility function for AI recommendation using Groq
-def get_ai_recommendation(input_data, predicted_risk):
+class LLMCall:
+    """A Groq chat completion requested by an LLM-bound view.
+
+    `fallback(error)` supplies the text to use when Groq is not configured
+    (error is None) or the call fails. A call without messages goes straight
+    to its fallback.
+    """
+
+    def __init__(self, messages, temperature, max_tokens, fallback):
+        self.messages = messages
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.fallback = fallback
+
+def complete_llm_call(call):
+    """Run `call` with the blocking Groq client (WSGI mode; asgi.py awaits AsyncGroq instead)"""
+    groq_client = current_app.extensions['groq']
+    if not groq_client or call.messages is None:
+        return call.fallback(None)
+    try:
+        with stage_timer('groq'):
+            chat = groq_client.chat.completions.create(
+                model=current_app.config['GROQ_MODEL'],
+                messages=call.messages,
+                temperature=call.temperature,
+                max_tokens=call.max_tokens,
+            )
+        return (chat.choices[0].message.content or "").strip()
+    except Exception as e:
+        return call.fallback(e)
+
+def llm_view(f):
+    """Mark a generator view that yields LLMCall objects and receives their text.
+
+    Under WSGI the calls are completed inline. When g.defer_llm_calls is set
+    (ASGI mode, see asgi.py) the generator is returned so the server can
+    await the calls on its event loop instead of blocking a thread. Either way
+    the request's DB transaction is ended first, so no pooled connection is
+    held while waiting on Groq.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        flow = f(*args, **kwargs)
+        if g.get('defer_llm_calls'):
+            return flow
+        try:
+            call = next(flow)
+            while True:
+                db.session.commit()
+                call = flow.send(complete_llm_call(call))
+        except StopIteration as stop:
+            return stop.value
+    decorated.llm_view = True
+    return decorated
+
+# AI recommendation using Groq
+def recommendation_call(input_data, predicted_risk):
+    def fallback(error):
+        if error is not None:
+            logger.error("Error generating Groq recommendation: %s", error)
+            logger.info("Falling back to basic recommendations")
+        return get_fallback_recommendation(input_data, predicted_risk)
+
     try:
         prompt = (
             "You are a medical assistant specializing in maternal health. Based on the following patient data and predicted risk, "
@@ -233,25 +837,20 @@ def get_ai_recommendation(input_data, predicted_risk):
             f"Heart Rate: {input_data.get('HeartRate', 0)}\n"
             f"Predicted Risk: {predicted_risk}"
         )
-
-        if groq_client:
-            chat = groq_client.chat.completions.create(
-                model="llama-3.1-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a helpful medical assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=350,
-            )
-            return (chat.choices[0].message.content or "").strip()
-        else:
-            return get_fallback_recommendation(input_data, predicted_risk)
-        
     except Exception as e:
-        logger.error(f"Error generating Groq recommendation: {str(e)}")
+        logger.error("Error building Groq recommendation prompt: %s", e)
         logger.info("Falling back to basic recommendations")
-        return get_fallback_recommendation(input_data, predicted_risk)
+        return LLMCall(messages=None, temperature=0.3, max_tokens=350, fallback=fallback)
+
+    return LLMCall(
+        messages=[
+            {"role": "system", "content": "You are a helpful medical assistant."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.3,
+        max_tokens=350,
+        fallback=fallback
+    )
 
 # Fallback recommendation system when Groq API is unavailable
 def get_fallback_recommendation(input_data, predicted_risk):
@@ -305,45 +904,158 @@ def get_fallback_recommendation(input_data, predicted_risk):
         return " ".join(recommendations)
         
     except Exception as e:
-        logger.error(f"Error generating fallback recommendation: {str(e)}")
+        logger.error("Error generating fallback recommendation: %s", e)
         return "Continue with regular prenatal care and consult your healthcare provider for personalized advice."
 
-# Utility function for chatbot using Groq
-def get_chat_response(query):
-    try:
-        prompt = (
-            "You are a knowledgeable and friendly chatbot specializing in maternal health and general wellness. "
-            "Answer clearly and concisely within 180 words.\n\n"
-            f"User question: {query}"
-        )
-        if groq_client:
-            chat = groq_client.chat.completions.create(
-                model="llama-3.1-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.4,
-                max_tokens=400,
-            )
-            return (chat.choices[0].message.content or "").strip()
-        else:
+# Chatbot using Groq
+def chat_call(query):
+    prompt = (
+        "You are a knowledgeable and friendly chatbot specializing in maternal health and general wellness. "
+        "Answer clearly and concisely within 180 words.\n\n"
+        f"User question: {query}"
+    )
+
+    def fallback(error):
+        if error is None:
             return "AI service is not configured."
-    except Exception as e:
-        logger.error(f"Error generating chat response: {str(e)}")
-        return f"Error generating chat response: {str(e)}"
+        logger.error("Error generating chat response: %s", error)
+        return f"Error generating chat response: {str(error)}"
+
+    return LLMCall(
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.4,
+        max_tokens=400,
+        fallback=fallback
+    )
 
 # Initialize database
-def init_database():
+def init_database(app):
     with app.app_context():
         try:
+            if db.engine.dialect.name == 'postgresql':
+                # The appointment exclusion constraints index an integer column with GiST
+                with db.engine.begin() as connection:
+                    connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
             db.create_all()
             logger.info("Database tables created successfully")
+            if db.engine.dialect.name == 'postgresql':
+                # No-op until mother_health_logs has been partitioned
+                with db.engine.begin() as connection:
+                    created = ensure_future_partitions(connection, HEALTH_LOG_PARTITION_MONTHS_AHEAD)
+                if created:
+                    logger.info("Created health log partitions: %s", ', '.join(created))
         except OperationalError as e:
-            logger.error(f"Database initialization error: {str(e)}")
+            logger.error("Database initialization error: %s", e)
             raise Exception(f"Database initialization error: {str(e)}")
 
-init_database()
+# Short-lived access tokens carry the role claims; refresh tokens are single-use (RefreshToken rows)
+# and are also checked against User.token_version
+ACCESS_TOKEN_MINUTES = int(os.getenv('ACCESS_TOKEN_MINUTES', 15))
+REFRESH_TOKEN_DAYS = int(os.getenv('REFRESH_TOKEN_DAYS', 30))
+
+def issue_tokens(user):
+    """Access + refresh token pair for `user`, as returned by /login, /register and /refresh.
+
+    Records the refresh token in the session; the caller commits.
+    """
+    now = datetime.utcnow()
+    jti = uuid.uuid4().hex
+    # Expired rows are no longer needed to detect reuse
+    RefreshToken.query.filter(RefreshToken.user_id == user.id, RefreshToken.expires_at < now).delete()
+    db.session.add(RefreshToken(jti=jti, user_id=user.id, expires_at=now + timedelta(days=REFRESH_TOKEN_DAYS)))
+    is_admin = bool(user.is_admin) or user.role == 'admin'
+    access_token = jwt.encode({
+        'type': 'access',
+        'user_id': user.id,
+        'email': user.email,
+        'role': user.role,
+        'adm': is_admin,
+        'ver': user.token_version or 0,
+        'iat': now,
+        'exp': now + timedelta(minutes=ACCESS_TOKEN_MINUTES)
+    }, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+    refresh_token = jwt.encode({
+        'type': 'refresh',
+        'user_id': user.id,
+        'jti': jti,
+        'ver': user.token_version or 0,
+        'iat': now,
+        'exp': now + timedelta(days=REFRESH_TOKEN_DAYS)
+    }, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+    return {
+        'token': access_token,
+        'refresh_token': refresh_token,
+        'expires_in': ACCESS_TOKEN_MINUTES * 60
+    }
+
+# bcrypt runs in a bounded process pool so a login burst cannot starve the request workers
+password_hasher = PasswordHasher(
+    workers=int(os.getenv('BCRYPT_POOL_WORKERS', 2)),
+    max_pending=int(os.getenv('BCRYPT_MAX_PENDING', 16)),
+    timeout=float(os.getenv('BCRYPT_TIMEOUT_SECONDS', 5)),
+    rounds=int(os.getenv('BCRYPT_ROUNDS', 12)),
+    start_method=os.getenv('BCRYPT_POOL_START_METHOD') or None
+)
+BCRYPT_RETRY_AFTER_SECONDS = int(os.getenv('BCRYPT_RETRY_AFTER_SECONDS', 2))
+# Turn off once migrate_hash_legacy_passwords.py --verify reports no plaintext rows
+ALLOW_LEGACY_PLAINTEXT_PASSWORDS = env_bool('ALLOW_LEGACY_PLAINTEXT_PASSWORDS', True)
+
+def password_hasher_busy_response():
+    response = jsonify({
+        'status': 'error',
+        'message': 'Too many sign-in requests, please retry shortly'
+    })
+    response.headers['Retry-After'] = str(BCRYPT_RETRY_AFTER_SECONDS)
+    return response, HTTPStatus.SERVICE_UNAVAILABLE
+
+def revoke_user_tokens(user):
+    """Invalidate every refresh token issued to `user`; access tokens lapse within ACCESS_TOKEN_MINUTES."""
+    user.token_version = (user.token_version or 0) + 1
+
+class Principal:
+    """The authenticated caller, kept on `g` for the rest of the request.
+
+    Role and admin flag come from the access token claims, so role guards never
+    touch the database. The user row is loaded only if a handler asks for it,
+    and then reused for the rest of the request. If the row is gone (the
+    account was deleted while its token is still valid) `user` is None and
+    require_auth answers 401 whatever the handler returned.
+    """
+
+    def __init__(self, user_id, claims=None):
+        self.id = user_id
+        self._claims = claims if claims and 'role' in claims and 'adm' in claims else None
+        self._user = None
+        self.user_missing = False
+
+    @property
+    def user(self):
+        if self._user is None and not self.user_missing:
+            self._user = db.session.get(User, self.id)
+            self.user_missing = self._user is None
+        return self._user
+
+    @property
+    def role(self):
+        if self._claims:
+            return self._claims['role']
+        return self.user.role if self.user else None
+
+    @property
+    def is_admin(self):
+        if self._claims:
+            return bool(self._claims['adm'])
+        return bool(self.user) and (bool(self.user.is_admin) or self.user.role == 'admin')
+
+    @property
+    def share_consent(self):
+        return bool(self.user) and bool(self.user.share_consent)
+
+    def has_role(self, *roles):
+        return self.role in roles or ('admin' in roles and self.is_admin)
 
 # Authentication decorator to handle OPTIONS requests
 def require_auth(f):
@@ -351,6 +1063,9 @@ def require_auth(f):
     def decorated(*args, **kwargs):
         if request.method == 'OPTIONS':
             return jsonify({}), HTTPStatus.OK  # Allow preflight requests
+        if 'principal' in g:
+            # Already authenticated in this request (one handler delegating to another)
+            return f(*args, **kwargs)
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
             return jsonify({
@@ -359,8 +1074,10 @@ def require_auth(f):
             }), HTTPStatus.UNAUTHORIZED
         token = auth_header.split(' ')[1]
         try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
-            request.user_id = payload['user_id']
+            with span('auth.jwt_decode'):
+                payload = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+            if payload.get('type') == 'refresh':
+                raise jwt.InvalidTokenError('Refresh tokens cannot be used for API access')
         except jwt.ExpiredSignatureError:
             return jsonify({
                 'status': 'error',
@@ -371,19 +1088,189 @@ def require_auth(f):
                 'status': 'error',
                 'message': 'Invalid token'
             }), HTTPStatus.UNAUTHORIZED
-        return f(*args, **kwargs)
+
+        request.user_id = payload['user_id']
+        # Tokens issued before claims-based auth have no 'adm' claim; their role is read from the database
+        g.principal = Principal(request.user_id, payload)
+        response = f(*args, **kwargs)
+        if g.principal.user_missing:
+            # Handlers read g.principal.user inside their own error handling, so settle it here once
+            db.session.rollback()
+            logger.warning("Token for missing user_id %s used on %s %s", request.user_id, request.method, request.path)
+            return jsonify({
+                'status': 'error',
+                'message': 'User not found'
+            }), HTTPStatus.UNAUTHORIZED
+        return response
     return decorated
 
+def require_role(*roles, message='Unauthorized access'):
+    """Allow only callers with one of `roles`; 'admin' also admits users flagged is_admin.
+
+    Must be applied below @require_auth.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not g.principal.has_role(*roles):
+                logger.warning("Unauthorized %s %s attempt by user_id %s", request.method, request.path, g.principal.id)
+                return jsonify({
+                    'status': 'error',
+                    'message': message
+                }), HTTPStatus.FORBIDDEN
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+@require_auth
+@require_role('admin', message='Only admins can profile requests')
+def authorize_profiling():
+    request.environ[AUTHORIZED_KEY] = True
+    request.environ[USER_ID_KEY] = g.principal.id
+
+@api.before_app_request
+def check_profiling_request():
+    # A refused caller gets the 401/403 instead of an unprofiled response
+    if REQUEST_PROFILING and profile_requested(request.environ):
+        return authorize_profiling()
+
+def conditional_get(per_day=False):
+    """Answer If-None-Match with 304 before the handler builds the body.
+
+    The ETag is derived from the caller's data_version, the endpoint and its
+    query string; `per_day` also folds in today's date for responses computed
+    relative to it. Must be applied below @require_auth.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user = g.principal.user
+            if not user:
+                return f(*args, **kwargs)
+
+            key = f"{request.endpoint}:{user.id}:{user.data_version or 0}:{request.query_string.decode('latin-1')}"
+            if per_day:
+                key += f":{date.today()}"
+            etag = hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=HTTPStatus.NOT_MODIFIED)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != HTTPStatus.OK:
+                    return response
+            # Weak: the body may be re-encoded (gzip) on the way out
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated
+    return decorator
+
+# Keyset pagination for list endpoints
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 50))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 200))
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(sort_value, row_id):
+    payload = json.dumps([sort_value.isoformat() if sort_value is not None else None, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return (datetime.fromisoformat(sort_value) if sort_value is not None else None), int(row_id)
+    except Exception:
+        raise InvalidCursor('Invalid cursor')
+
+def paginate_keyset(query, sort_column, id_column):
+    """Return one page of `query` newest first plus the cursor for the next page.
+
+    Reads `cursor` and `limit` from the query string. Clients that send neither
+    get every row and no cursor, as before pagination existed. Rows whose sort
+    value is NULL come after all dated rows, ordered by id; when paging they are
+    read with a separate query so the (time, id) comparison can keep using the
+    index, and that query is skipped for NOT NULL sort columns.
+    """
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit', type=int)
+    if cursor is None and limit is None:
+        order = sort_column.desc().nulls_last() if sort_column.nullable else sort_column.desc()
+        return query.order_by(order, id_column.desc()).all(), None
+    limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+    fetch = limit + 1  # One extra row tells whether another page exists
+
+    sort_value, row_id = decode_cursor(cursor) if cursor else (None, None)
+    rows = []
+    if not cursor or sort_value is not None:
+        dated = query.filter(sort_column.isnot(None)) if sort_column.nullable else query
+        if cursor:
+            dated = dated.filter(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+        rows = dated.order_by(sort_column.desc(), id_column.desc()).limit(fetch).all()
+    if sort_column.nullable and len(rows) < fetch:
+        undated = query.filter(sort_column.is_(None))
+        if cursor and sort_value is None:
+            undated = undated.filter(id_column < row_id)
+        rows += undated.order_by(id_column.desc()).limit(fetch - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+def invalid_cursor_response():
+    return jsonify({
+        'status': 'error',
+        'message': 'Invalid cursor'
+    }), HTTPStatus.BAD_REQUEST
+
 # Root endpoint
-@app.route('/', methods=['GET'])
+@api.route('/', methods=['GET'])
 def home():
     return jsonify({
         'status': 'success',
         'message': 'Welcome to SymbiHelp API'
     }), HTTPStatus.OK
 
+@api.route('/metrics', methods=['GET'])
+@require_auth
+@require_role('admin', message='Only admins can read metrics')
+def prometheus_metrics():
+    rendered = request_metrics.render_latest()
+    if rendered is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Metrics are disabled: prometheus_client is not installed'
+        }), HTTPStatus.SERVICE_UNAVAILABLE
+    body, content_type = rendered
+    response = make_response(body, HTTPStatus.OK)
+    response.headers['Content-Type'] = content_type
+    return response
+
+@api.route('/metrics/timeline-cache', methods=['GET'])
+@require_auth
+@require_role('admin', message='Only admins can read metrics')
+def timeline_cache_metrics():
+    return jsonify({
+        'status': 'success',
+        'cache': timeline_cache.snapshot_metrics()
+    }), HTTPStatus.OK
+
+@api.route('/metrics/db-pool', methods=['GET'])
+@require_auth
+@require_role('admin', message='Only admins can read metrics')
+def db_pool_metrics():
+    return jsonify({
+        'status': 'success',
+        'pool': pool_metrics.snapshot(db.engine.pool)
+    }), HTTPStatus.OK
+
 # Routes
-@app.route('/register', methods=['POST'])
+@api.route('/register', methods=['POST'])
 def register():
     try:
         data = request.get_json()
@@ -418,7 +1305,11 @@ def register():
                 'message': 'Inputs cannot be empty'
             }), HTTPStatus.BAD_REQUEST
 
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        try:
+            hashed_password = password_hasher.hash(password)
+        except PasswordHasherBusy as e:
+            logger.warning("Registration rejected, password hasher busy: %s", e)
+            return password_hasher_busy_response()
         new_user = User(
             email=email,
             password=hashed_password,
@@ -429,26 +1320,22 @@ def register():
 
         try:
             db.session.commit()
-            logger.info(f"User registered: {email} with role: {role}")
+            logger.info("User registered: %s with role: %s", redact_email(email), role)
         except IntegrityError:
             db.session.rollback()
-            logger.warning(f"Registration failed: Email already exists - {email}")
+            logger.warning("Registration failed: Email already exists - %s", redact_email(email))
             return jsonify({
                 'status': 'error',
                 'message': 'Email already exists'
             }), HTTPStatus.BAD_REQUEST
 
-        token = jwt.encode({
-            'user_id': new_user.id,
-            'email': new_user.email,
-            'role': new_user.role,
-            'exp': datetime.utcnow() + timedelta(hours=24)
-        }, JWT_SECRET_KEY, algorithm='HS256')
+        tokens = issue_tokens(new_user)
+        db.session.commit()
 
         return jsonify({
             'status': 'success',
             'message': 'User registered successfully',
-            'token': token,
+            **tokens,
             'user': {
                 'id': new_user.id, 
                 'email': new_user.email, 
@@ -460,13 +1347,13 @@ def register():
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error registering user: {str(e)}")
+        logger.error("Error registering user: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error registering user: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/login', methods=['POST'])
+@api.route('/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
@@ -494,59 +1381,54 @@ def login():
         # Case-insensitive email matching to support legacy rows
         user = User.query.filter(func.lower(User.email) == email).first()
         if not user:
-            logger.warning(f"Login failed: User not found - {email}")
+            logger.warning("Login failed: User not found - %s", redact_email(email))
             return jsonify({
                 'status': 'error',
                 'message': 'User not found'
             }), HTTPStatus.UNAUTHORIZED
 
         # Support legacy plaintext passwords by detecting non-bcrypt hashes and migrating on successful login
-        def is_bcrypt_hash(value: str) -> bool:
-            try:
-                return isinstance(value, str) and value.startswith(('$2a$', '$2b$', '$2y$')) and len(value) >= 60
-            except Exception:
-                return False
-
         password_ok = False
         if is_bcrypt_hash(user.password):
             try:
-                password_ok = bcrypt.checkpw(password.encode('utf-8'), user.password.encode('utf-8'))
+                password_ok = password_hasher.check(password, user.password)
+            except PasswordHasherBusy as e:
+                logger.warning("Login rejected, password hasher busy: %s", e)
+                return password_hasher_busy_response()
             except Exception as e:
-                logger.error(f"Bcrypt check failed for {email}: {str(e)}")
+                logger.error("Bcrypt check failed for %s: %s", redact_email(email), e)
                 password_ok = False
+        elif not ALLOW_LEGACY_PLAINTEXT_PASSWORDS:
+            logger.error("Login failed: password for %s is not a bcrypt hash and legacy passwords are disabled", redact_email(email))
         else:
             # Legacy: stored password is plaintext. Compare directly and then migrate to bcrypt.
             if password == user.password:
                 password_ok = True
                 try:
-                    user.password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                    user.password = password_hasher.hash(password)
                     db.session.commit()
-                    logger.info(f"Migrated legacy password to bcrypt for {email}")
+                    logger.info("Migrated legacy password to bcrypt for %s", redact_email(email))
                 except Exception as e:
                     db.session.rollback()
-                    logger.error(f"Failed migrating password for {email}: {str(e)}")
+                    logger.error("Failed migrating password for %s: %s", redact_email(email), e)
             else:
                 password_ok = False
 
         if not password_ok:
-            logger.warning(f"Login failed: Invalid password for {email}")
+            logger.warning("Login failed: Invalid password for %s", redact_email(email))
             return jsonify({
                 'status': 'error',
                 'message': 'Invalid password'
             }), HTTPStatus.UNAUTHORIZED
 
-        token = jwt.encode({
-            'user_id': user.id,
-            'email': user.email,
-            'role': user.role,
-            'exp': datetime.utcnow() + timedelta(hours=24)
-        }, JWT_SECRET_KEY, algorithm='HS256')
+        tokens = issue_tokens(user)
+        db.session.commit()
 
-        logger.info(f"User logged in: {email} with role: {user.role}")
+        logger.info("User logged in: %s with role: %s", redact_email(email), user.role, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'message': 'Login successful',
-            'token': token,
+            **tokens,
             'user': {
                 'id': user.id,
                 'email': user.email,
@@ -557,13 +1439,106 @@ def login():
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error logging in: {str(e)}")
+        logger.error("Error logging in: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error logging in: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/predict_dummy', methods=['GET'])
+@api.route('/refresh', methods=['POST'])
+def refresh():
+    try:
+        data = request.get_json() or {}
+        refresh_token = data.get('refresh_token')
+        if not refresh_token or not isinstance(refresh_token, str):
+            return jsonify({
+                'status': 'error',
+                'message': 'refresh_token is required'
+            }), HTTPStatus.BAD_REQUEST
+
+        try:
+            payload = jwt.decode(refresh_token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+        except jwt.ExpiredSignatureError:
+            return jsonify({
+                'status': 'error',
+                'message': 'Refresh token has expired'
+            }), HTTPStatus.UNAUTHORIZED
+        except jwt.InvalidTokenError:
+            payload = None
+        if not payload or payload.get('type') != 'refresh':
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid refresh token'
+            }), HTTPStatus.UNAUTHORIZED
+
+        user = db.session.get(User, payload['user_id'])
+        if not user or payload.get('ver') != (user.token_version or 0) or not payload.get('jti'):
+            return jsonify({
+                'status': 'error',
+                'message': 'Refresh token has been revoked'
+            }), HTTPStatus.UNAUTHORIZED
+
+        # Rotation: the token is consumed atomically, so of two requests presenting it only one succeeds
+        consumed = db.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.jti == payload['jti'], RefreshToken.user_id == user.id, RefreshToken.used_at.is_(None))
+            .values(used_at=datetime.utcnow())
+        ).rowcount
+        if not consumed:
+            # A rotated token came back: assume it leaked and end every session of the user
+            revoke_user_tokens(user)
+            db.session.commit()
+            logger.warning("Refresh token reused for user_id %s; all sessions revoked", user.id)
+            return jsonify({
+                'status': 'error',
+                'message': 'Refresh token has been revoked'
+            }), HTTPStatus.UNAUTHORIZED
+
+        tokens = issue_tokens(user)
+        db.session.commit()
+        return jsonify({
+            'status': 'success',
+            **tokens
+        }), HTTPStatus.OK
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error refreshing token: %s", e)
+        return jsonify({
+            'status': 'error',
+            'message': f'Error refreshing token: {str(e)}'
+        }), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@api.route('/logout', methods=['POST'])
+@require_auth
+def logout():
+    """Revoke every refresh token of the caller (all devices)"""
+    try:
+        user = g.principal.user
+        if not user:
+            return jsonify({
+                'status': 'error',
+                'message': 'User not found'
+            }), HTTPStatus.UNAUTHORIZED
+
+        revoke_user_tokens(user)
+        db.session.commit()
+
+        logger.info("Tokens revoked for user_id %s", request.user_id)
+        return jsonify({
+            'status': 'success',
+            'message': 'Logged out successfully'
+        }), HTTPStatus.OK
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error logging out user_id %s: %s", request.user_id, e)
+        return jsonify({
+            'status': 'error',
+            'message': f'Error logging out: {str(e)}'
+        }), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@api.route('/predict_dummy', methods=['GET'])
 def predict_dummy():
     try:
         dummy_data = pd.DataFrame({
@@ -575,29 +1550,31 @@ def predict_dummy():
             'HeartRate': [70, 80, 75, 65, 85]
         })
 
-        dummy_data_scaled = scaler.transform(dummy_data)
-        predictions = model.predict(dummy_data_scaled)
+        with stage_timer('inference'):
+            dummy_data_scaled = scaler.transform(dummy_data)
+            predictions = model.predict(dummy_data_scaled)
         predicted_risks = [risk_mapping[pred] for pred in predictions]
 
         results = dummy_data.to_dict(orient='records')
         for i, result in enumerate(results):
             result['Predicted_Risk'] = predicted_risks[i]
 
-        logger.info("Dummy predictions generated successfully")
+        logger.info("Dummy predictions generated successfully", extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'predictions': results
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error making dummy predictions: {str(e)}")
+        logger.error("Error making dummy predictions: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error making predictions: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/predict', methods=['POST'])
+@api.route('/predict', methods=['POST'])
 @require_auth
+@llm_view
 def predict():
     try:
         data = request.get_json()
@@ -613,8 +1590,7 @@ def predict():
         
         if use_mother_data and mother_id:
             # Verify nurse has access to this mother
-            user = User.query.get(request.user_id)
-            if not user or user.role != 'nurse':
+            if g.principal.role != 'nurse':
                 return jsonify({
                     'status': 'error',
                     'message': 'Unauthorized access. Only nurses can use mother data.'
@@ -640,9 +1616,16 @@ def predict():
                     'message': 'Mother has not given consent for data sharing'
                 }), HTTPStatus.FORBIDDEN
             
-            latest_log = MotherHealthLog.query.filter_by(user_id=mother_id)\
-                .order_by(MotherHealthLog.timestamp.desc()).first()
-            
+            latest_logs = latest_health_logs([
+                MotherHealthLog.age,
+                MotherHealthLog.systolic_bp,
+                MotherHealthLog.diastolic_bp,
+                MotherHealthLog.blood_sugar,
+                MotherHealthLog.body_temp,
+                MotherHealthLog.heart_rate
+            ], mother_id, 1)
+            latest_log = latest_logs[0] if latest_logs else None
+
             if not latest_log:
                 return jsonify({
                     'status': 'error',
@@ -650,15 +1633,7 @@ def predict():
                 }), HTTPStatus.NOT_FOUND
             
             # Use mother's health data
-            log_data = latest_log.data
-            features = [
-                float(log_data.get('Age', 0)),
-                float(log_data.get('SystolicBP', 0)),
-                float(log_data.get('DiastolicBP', 0)),
-                float(log_data.get('BS', 0)),
-                float(log_data.get('BodyTemp', 0)),
-                float(log_data.get('HeartRate', 0))
-            ]
+            features = [value or 0.0 for value in latest_log]
             
             # Store the prediction under the mother's user ID
             prediction_user_id = mother_id
@@ -674,17 +1649,16 @@ def predict():
             ]
             prediction_user_id = request.user_id
 
-        scaled_features = scaler.transform([features])
-        prediction = model.predict(scaled_features)[0]
-        probability = model.predict_proba(scaled_features)[0][1]
+        with stage_timer('inference'):
+            scaled_features = scaler.transform([features])
+            prediction = model.predict(scaled_features)[0]
+            probability = model.predict_proba(scaled_features)[0][1]
         risk_level = risk_mapping[prediction]
 
-        try:
-            recommendation = get_ai_recommendation(data, risk_level)
-            logger.info(f"Recommendation generated successfully for risk level: {risk_level}")
-        except Exception as e:
-            logger.error(f"Error getting recommendation: {str(e)}")
-            recommendation = "Unable to generate personalized recommendations at this time. Please consult your healthcare provider."
+        # Built from the features actually scored; with use_mother_data the request body has no vitals
+        vitals = dict(zip(('Age', 'SystolicBP', 'DiastolicBP', 'BS', 'BodyTemp', 'HeartRate'), features))
+        recommendation = yield recommendation_call(vitals, risk_level)
+        logger.info("Recommendation generated successfully for risk level: %s", risk_level, extra=SAMPLED)
 
         test_result = TestResult(
             user_id=prediction_user_id,
@@ -702,11 +1676,11 @@ def predict():
         db.session.add(test_result)
         db.session.commit()
 
-        logger.info(f"Prediction made for user_id {prediction_user_id} by nurse {request.user_id}: {risk_level}")
+        logger.info("Prediction made for user_id %s by nurse %s: %s", prediction_user_id, request.user_id, risk_level, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'prediction': risk_level,
-            'probability': float(probability * 100),
+            'probability': probability * 100,
             'recommendation': recommendation,
             'test_result_id': test_result.id,
             'used_mother_data': use_mother_data,
@@ -715,13 +1689,14 @@ def predict():
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error making prediction: {str(e)}")
+        logger.error("Error making prediction: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error making prediction: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/chat', methods=['POST'])
+@api.route('/chat', methods=['POST'])
+@llm_view
 def chat():
     try:
         data = request.get_json()
@@ -744,7 +1719,7 @@ def chat():
             auth_header = request.headers.get('Authorization')
             if auth_header and auth_header.startswith('Bearer '):
                 token = auth_header.split(' ')[1]
-                payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
+                payload = jwt.decode(token, current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
                 user_id = payload.get('user_id')
                 user = User.query.get(user_id)
                 if user and user.role == 'mother':
@@ -757,22 +1732,22 @@ def chat():
         except Exception:
             personalization = ""
 
-        response = get_chat_response(query + personalization)
+        response = yield chat_call(query + personalization)
 
-        logger.info("Chat response generated successfully")
+        logger.info("Chat response generated successfully", extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'response': response
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error processing chat query: {str(e)}")
+        logger.error("Error processing chat query: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error processing query: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/test-results', methods=['POST'])
+@api.route('/test-results', methods=['POST'])
 @require_auth
 def save_test_result():
     try:
@@ -792,54 +1767,62 @@ def save_test_result():
         db.session.add(new_test_result)
         db.session.commit()
 
-        logger.info(f"Test result saved for user_id {request.user_id}")
+        logger.info("Test result saved for user_id %s", request.user_id, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'message': 'Test result saved successfully',
             'test_result': {
                 'id': new_test_result.id,
                 'score': new_test_result.score,
-                'test_date': new_test_result.test_date.isoformat(),
+                'test_date': new_test_result.test_date,
                 'risk_level': new_test_result.risk_level
             }
         }), HTTPStatus.CREATED
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error saving test result: {str(e)}")
+        logger.error("Error saving test result: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error saving test result: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/test-results', methods=['GET'])
+@api.route('/test-results', methods=['GET'])
 @require_auth
+@conditional_get()
 def get_test_results():
     try:
-        test_results = TestResult.query.filter_by(user_id=request.user_id).order_by(TestResult.test_date.desc()).all()
-        
+        test_results, next_cursor = paginate_keyset(
+            TestResult.query.filter_by(user_id=request.user_id),
+            TestResult.test_date,
+            TestResult.id
+        )
+
         results = [{
             'id': result.id,
             'score': result.score,
-            'test_date': result.test_date.isoformat(),
+            'test_date': result.test_date,
             'risk_level': result.risk_level,
             'details': result.details
         } for result in test_results]
 
-        logger.info(f"Test results retrieved for user_id {request.user_id}")
+        logger.info("Test results retrieved for user_id %s", request.user_id, extra=SAMPLED)
         return jsonify({
             'status': 'success',
-            'test_results': results
+            'test_results': results,
+            'next_cursor': next_cursor
         }), HTTPStatus.OK
 
+    except InvalidCursor:
+        return invalid_cursor_response()
     except Exception as e:
-        logger.error(f"Error retrieving test results: {str(e)}")
+        logger.error("Error retrieving test results: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving test results: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/test-scores', methods=['POST'])
+@api.route('/test-scores', methods=['POST'])
 @require_auth
 def save_test_score():
     try:
@@ -865,7 +1848,7 @@ def save_test_score():
         db.session.add(new_test_score)
         db.session.commit()
 
-        logger.info(f"New test score saved for user_id {request.user_id}: {score}/15 at {new_test_score.test_date.isoformat()}")
+        logger.info("New test score saved for user_id %s: %s/15 at %s", request.user_id, score, new_test_score.test_date, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'message': 'Test score saved successfully',
@@ -873,58 +1856,59 @@ def save_test_score():
                 'id': new_test_score.id,
                 'score': new_test_score.score,
                 'max_score': new_test_score.max_score,
-                'test_date': new_test_score.test_date.isoformat(),
+                'test_date': new_test_score.test_date,
                 'topics': new_test_score.topics
             }
         }), HTTPStatus.CREATED
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error saving test score for user_id {request.user_id}: {str(e)}")
+        logger.error("Error saving test score for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error saving test score: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/test-scores', methods=['GET'])
+@api.route('/test-scores', methods=['GET'])
 @require_auth
+@conditional_get()
 def get_test_scores():
     try:
-        test_scores = TestScore.query.filter_by(user_id=request.user_id).order_by(TestScore.test_date.desc()).all()
-        
+        test_scores, next_cursor = paginate_keyset(
+            TestScore.query.filter_by(user_id=request.user_id),
+            TestScore.test_date,
+            TestScore.id
+        )
+
         results = [{
             'id': score.id,
             'score': score.score,
             'max_score': score.max_score,
-            'test_date': score.test_date.isoformat(),
+            'test_date': score.test_date,
             'topics': score.topics
         } for score in test_scores]
 
-        logger.info(f"Multiple test scores retrieved for user_id {request.user_id}: {len(results)} entries")
+        logger.info("Multiple test scores retrieved for user_id %s: %s entries", request.user_id, len(results), extra=SAMPLED)
         return jsonify({
             'status': 'success',
-            'test_scores': results
+            'test_scores': results,
+            'next_cursor': next_cursor
         }), HTTPStatus.OK
 
+    except InvalidCursor:
+        return invalid_cursor_response()
     except Exception as e:
-        logger.error(f"Error retrieving test scores for user_id {request.user_id}: {str(e)}")
+        logger.error("Error retrieving test scores for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving test scores: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/admin/stats', methods=['GET'])
+@api.route('/admin/stats', methods=['GET'])
 @require_auth
+@require_role('admin', message='Unauthorized access')
 def get_admin_stats():
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized admin stats access attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access'
-            }), HTTPStatus.FORBIDDEN
-
         total_users = User.query.count()
         time_period = request.args.get('period', 'week')
         now = datetime.utcnow()
@@ -988,10 +1972,10 @@ def get_admin_stats():
                 'user_name': user.full_name if user else 'Unknown User',
                 'score': activity.score,
                 'max_score': activity.max_score,
-                'date': activity.test_date.isoformat()
+                'date': activity.test_date
             })
             
-        logger.info(f"Admin stats retrieved by user_id {request.user_id} with {total_tests} tests in period {time_period}")
+        logger.info("Admin stats retrieved by user_id %s with %s tests in period %s", request.user_id, total_tests, time_period, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'data': {
@@ -1005,58 +1989,49 @@ def get_admin_stats():
         }), HTTPStatus.OK
         
     except Exception as e:
-        logger.error(f"Error retrieving admin stats for user_id {request.user_id}: {str(e)}")
+        logger.error("Error retrieving admin stats for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving admin stats: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/admin/users', methods=['GET'])
+@api.route('/admin/users', methods=['GET'])
 @require_auth
+@require_role('admin', message='Unauthorized access')
 def get_all_users():
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized users list access attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access'
-            }), HTTPStatus.FORBIDDEN
-
-        users = User.query.all()
+        users, next_cursor = paginate_keyset(User.query, User.created_at, User.id)
         user_list = [{
             'id': user.id,
             'email': user.email,
             'full_name': user.full_name,
             'is_admin': user.is_admin,
-            'created_at': user.created_at.isoformat()
+            'created_at': user.created_at
         } for user in users]
 
-        logger.info(f"User list retrieved by admin user_id {request.user_id}")
+        logger.info("User list retrieved by admin user_id %s", request.user_id, extra=SAMPLED)
         return jsonify({
             'status': 'success',
-            'users': user_list
+            'users': user_list,
+            'next_cursor': next_cursor
         }), HTTPStatus.OK
 
+    except InvalidCursor:
+        return invalid_cursor_response()
     except Exception as e:
-        logger.error(f"Error retrieving user list for user_id {request.user_id}: {str(e)}")
+        logger.error("Error retrieving user list for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving user list: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Mother Dashboard Endpoints
-@app.route('/update-due-date', methods=['POST'])
+@api.route('/update-due-date', methods=['POST'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can update due date.')
 def update_due_date():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized due date update attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can update due date.'
-            }), HTTPStatus.FORBIDDEN
+        user = g.principal.user
 
         data = request.get_json()
         due_date_str = data.get('due_date')
@@ -1078,31 +2053,26 @@ def update_due_date():
         user.due_date = due_date
         db.session.commit()
 
-        logger.info(f"Due date updated for user_id {request.user_id}: {due_date}")
+        logger.info("Due date updated for user_id %s: %s", request.user_id, due_date)
         return jsonify({
             'status': 'success',
             'message': 'Due date updated successfully',
-            'due_date': due_date.isoformat()
+            'due_date': due_date
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error updating due date for user_id {request.user_id}: {str(e)}")
+        logger.error("Error updating due date for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error updating due date: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/update-birthdate', methods=['POST'])
+@api.route('/update-birthdate', methods=['POST'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can update birthdate.')
 def update_birthdate():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized birthdate update attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can update birthdate.'
-            }), HTTPStatus.FORBIDDEN
+        user = g.principal.user
 
         data = request.get_json()
         birthdate_str = data.get('birthdate')
@@ -1131,32 +2101,25 @@ def update_birthdate():
         user.birthdate = birthdate
         db.session.commit()
 
-        logger.info(f"Birthdate updated for user_id {request.user_id}: {birthdate}")
+        logger.info("Birthdate updated for user_id %s: %s", request.user_id, birthdate)
         return jsonify({
             'status': 'success',
             'message': 'Birthdate updated successfully',
-            'birthdate': birthdate.isoformat()
+            'birthdate': birthdate
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error updating birthdate for user_id {request.user_id}: {str(e)}")
+        logger.error("Error updating birthdate for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error updating birthdate: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/update-health-log', methods=['POST'])
+@api.route('/update-health-log', methods=['POST'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can update health logs.')
 def update_health_log():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized health log update attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can update health logs.'
-            }), HTTPStatus.FORBIDDEN
-
         data = request.get_json()
         health_data = data.get('health_data')
         consent_shared = data.get('consent_shared', False)
@@ -1168,8 +2131,7 @@ def update_health_log():
             }), HTTPStatus.BAD_REQUEST
 
         # Validate required health data fields
-        required_fields = ['Age', 'SystolicBP', 'DiastolicBP', 'BS', 'BodyTemp', 'HeartRate']
-        for field in required_fields:
+        for field in REQUIRED_HEALTH_FIELDS:
             if field not in health_data or not health_data[field]:
                 return jsonify({
                     'status': 'error',
@@ -1177,16 +2139,16 @@ def update_health_log():
                 }), HTTPStatus.BAD_REQUEST
 
         # Create new health log entry
-        health_log = MotherHealthLog(
+        health_log = MotherHealthLog.from_health_data(
             user_id=request.user_id,
-            data=health_data,
+            health_data=health_data,
             consent_shared=consent_shared
         )
         
         db.session.add(health_log)
         db.session.commit()
 
-        logger.info(f"Health log created for user_id {request.user_id}")
+        logger.info("Health log created for user_id %s", request.user_id, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'message': 'Health log updated successfully',
@@ -1194,96 +2156,87 @@ def update_health_log():
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error updating health log for user_id {request.user_id}: {str(e)}")
+        logger.error("Error updating health log for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error updating health log: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/get-health-logs', methods=['GET'])
+@api.route('/get-health-logs', methods=['GET'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can view their health logs.')
 def get_health_logs():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized health logs access attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can view their health logs.'
-            }), HTTPStatus.FORBIDDEN
-
-        # Get health logs for the user, ordered by most recent first
-        health_logs = MotherHealthLog.query.filter_by(user_id=request.user_id)\
-            .order_by(MotherHealthLog.timestamp.desc()).all()
+        # Get one page of health logs for the user, ordered by most recent first
+        health_logs, next_cursor = paginate_keyset(
+            MotherHealthLog.query.filter_by(user_id=request.user_id),
+            MotherHealthLog.timestamp,
+            MotherHealthLog.id
+        )
 
         logs_data = []
         for log in health_logs:
             logs_data.append({
                 'id': log.id,
-                'timestamp': log.timestamp.isoformat(),
+                'timestamp': log.timestamp,
                 'data': log.data,
                 'consent_shared': log.consent_shared
             })
 
-        logger.info(f"Health logs retrieved for user_id {request.user_id}: {len(logs_data)} logs")
+        logger.info("Health logs retrieved for user_id %s: %s logs", request.user_id, len(logs_data), extra=SAMPLED)
         return jsonify({
             'status': 'success',
-            'logs': logs_data
+            'logs': logs_data,
+            'next_cursor': next_cursor
         }), HTTPStatus.OK
 
+    except InvalidCursor:
+        return invalid_cursor_response()
     except Exception as e:
-        logger.error(f"Error retrieving health logs for user_id {request.user_id}: {str(e)}")
+        logger.error("Error retrieving health logs for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving health logs: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/get-mother-profile', methods=['GET'])
+@api.route('/get-mother-profile', methods=['GET'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can view their profile.')
+@conditional_get()
 def get_mother_profile():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized mother profile access attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can view their profile.'
-            }), HTTPStatus.FORBIDDEN
+        user = g.principal.user
 
         profile_data = {
             'id': user.id,
             'email': user.email,
             'full_name': user.full_name,
             'role': user.role,
-            'due_date': user.due_date.isoformat() if user.due_date else None,
-            'birthdate': user.birthdate.isoformat() if user.birthdate else None,
-            'created_at': user.created_at.isoformat()
+            'due_date': user.due_date,
+            'birthdate': user.birthdate,
+            'created_at': user.created_at
         }
 
-        logger.info(f"Mother profile retrieved for user_id {request.user_id}")
+        logger.info("Mother profile retrieved for user_id %s", request.user_id, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'profile': profile_data
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error retrieving mother profile for user_id {request.user_id}: {str(e)}")
+        logger.error("Error retrieving mother profile for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving mother profile: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/get-timeline', methods=['GET'])
+@api.route('/get-timeline', methods=['GET'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can view their timeline.')
+@conditional_get(per_day=True)
 def get_timeline():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized timeline access attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can view their timeline.'
-            }), HTTPStatus.FORBIDDEN
+        user = g.principal.user
 
         if not user.due_date:
             return jsonify({
@@ -1296,64 +2249,50 @@ def get_timeline():
         pregnancy_start = user.due_date - timedelta(days=280)  # 40 weeks = 280 days
         current_week = min(40, max(1, ((today - pregnancy_start).days // 7) + 1))
 
-        # Get health logs for trends
-        health_logs = MotherHealthLog.query.filter_by(user_id=request.user_id)\
-            .order_by(MotherHealthLog.timestamp.desc()).limit(10).all()
-
-        # Prepare health trends data
-        health_trends = []
-        for log in health_logs:
-            health_trends.append({
-                'date': log.timestamp.strftime('%Y-%m-%d'),
-                'systolic_bp': log.data.get('SystolicBP', 0),
-                'diastolic_bp': log.data.get('DiastolicBP', 0),
-                'blood_sugar': log.data.get('BS', 0),
-                'body_temp': log.data.get('BodyTemp', 0),
-                'heart_rate': log.data.get('HeartRate', 0)
-            })
-
-        # Get ML risk prediction if available
-        latest_test = TestResult.query.filter_by(user_id=request.user_id)\
-            .order_by(TestResult.test_date.desc()).first()
-        
-        risk_level = latest_test.risk_level if latest_test else 'low'
-        risk_factors = latest_test.details.get('risk_factors', []) if latest_test else []
+        # Trends and risk only change when the mother's data does; serve them from the snapshot cache
+        version = user.data_version or 0
+        snapshot = timeline_cache.get(user.id, version)
+        if snapshot is None:
+            # Health trends from the last 10 logs
+            health_trends = get_health_trends(request.user_id)
+
+            # Get ML risk prediction if available
+            latest_test = TestResult.query.filter_by(user_id=request.user_id)\
+                .order_by(TestResult.test_date.desc()).first()
+
+            snapshot = {
+                'health_trends': health_trends,
+                'risk_level': latest_test.risk_level if latest_test else 'low',
+                'risk_factors': (latest_test.details or {}).get('risk_factors', []) if latest_test else []
+            }
+            timeline_cache.put(user.id, version, snapshot)
 
         timeline_data = {
             'current_week': current_week,
-            'due_date': user.due_date.isoformat(),
-            'pregnancy_start': pregnancy_start.isoformat(),
-            'health_trends': health_trends,
-            'risk_level': risk_level,
-            'risk_factors': risk_factors,
+            'due_date': user.due_date,
+            'pregnancy_start': pregnancy_start,
+            **snapshot,
             'total_weeks': 40
         }
 
-        logger.info(f"Timeline data retrieved for user_id {request.user_id}, current week: {current_week}")
+        logger.info("Timeline data retrieved for user_id %s, current week: %s", request.user_id, current_week, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'timeline': timeline_data
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error retrieving timeline for user_id {request.user_id}: {str(e)}")
+        logger.error("Error retrieving timeline for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving timeline: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/update-gamification', methods=['POST'])
+@api.route('/update-gamification', methods=['POST'])
 @require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can update gamification.')
 def update_gamification():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized gamification update attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only mothers can update gamification.'
-            }), HTTPStatus.FORBIDDEN
-
         data = request.get_json()
         action = data.get('action')  # 'weekly_checkin', 'milestone_reached', etc.
         week_number = data.get('week_number')
@@ -1362,7 +2301,7 @@ def update_gamification():
         # Store gamification data in AsyncStorage equivalent (could be extended to database)
         # For now, we'll return success and let the frontend handle storage
         
-        logger.info(f"Gamification update for user_id {request.user_id}: {action} for week {week_number}")
+        logger.info("Gamification update for user_id %s: %s for week %s", request.user_id, action, week_number, extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'message': 'Gamification updated successfully',
@@ -1372,25 +2311,18 @@ def update_gamification():
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error updating gamification for user_id {request.user_id}: {str(e)}")
+        logger.error("Error updating gamification for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error updating gamification: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Admin endpoints for mother-nurse assignment management
-@app.route('/admin/mothers', methods=['GET', 'OPTIONS'])
+@api.route('/admin/mothers', methods=['GET', 'OPTIONS'])
 @require_auth
+@require_role('admin', message='Unauthorized access. Only admins can view all mothers.')
 def get_all_mothers_admin():
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized access attempt to get all mothers by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can view all mothers.'
-            }), HTTPStatus.FORBIDDEN
-
         # Get all mothers with their consent status and assignment info
         mothers = User.query.filter_by(role='mother').all()
         mother_list = []
@@ -1405,7 +2337,7 @@ def get_all_mothers_admin():
                     'id': nurse.id,
                     'full_name': nurse.full_name,
                     'email': nurse.email,
-                    'assigned_at': assignment.assigned_at.isoformat()
+                    'assigned_at': assignment.assigned_at
                 } if nurse else None
 
             mother_list.append({
@@ -1413,37 +2345,30 @@ def get_all_mothers_admin():
                 'full_name': mother.full_name,
                 'email': mother.email,
                 'role': mother.role,
-                'due_date': mother.due_date.isoformat() if mother.due_date else None,
+                'due_date': mother.due_date,
                 'share_consent': mother.share_consent,
-                'created_at': mother.created_at.isoformat(),
+                'created_at': mother.created_at,
                 'assigned_nurse': assigned_nurse
             })
 
-        logger.info(f"All mothers retrieved by admin user_id {request.user_id}, count: {len(mother_list)}")
+        logger.info("All mothers retrieved by admin user_id %s, count: %s", request.user_id, len(mother_list), extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'mothers': mother_list
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error retrieving mother list: {str(e)}")
+        logger.error("Error retrieving mother list: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving mother list: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/admin/nurses', methods=['GET', 'OPTIONS'])
+@api.route('/admin/nurses', methods=['GET', 'OPTIONS'])
 @require_auth
+@require_role('admin', message='Unauthorized access. Only admins can view all nurses.')
 def get_all_nurses_admin():
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized access attempt to get all nurses by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can view all nurses.'
-            }), HTTPStatus.FORBIDDEN
-
         # Get all nurses with their assignment info
         nurses = User.query.filter_by(role='nurse').all()
         nurse_list = []
@@ -1457,36 +2382,29 @@ def get_all_nurses_admin():
                 'full_name': nurse.full_name,
                 'email': nurse.email,
                 'role': nurse.role,
-                'created_at': nurse.created_at.isoformat(),
+                'created_at': nurse.created_at,
                 'assigned_mothers_count': assigned_count
             })
 
-        logger.info(f"All nurses retrieved by admin user_id {request.user_id}, count: {len(nurse_list)}")
+        logger.info("All nurses retrieved by admin user_id %s, count: %s", request.user_id, len(nurse_list), extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'nurses': nurse_list
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error retrieving nurse list: {str(e)}")
+        logger.error("Error retrieving nurse list: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving nurse list: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Nurse endpoints for viewing only assigned mothers
-@app.route('/nurse/assigned-mothers', methods=['GET'])
+@api.route('/nurse/assigned-mothers', methods=['GET'])
 @require_auth
+@require_role('nurse', message='Unauthorized access. Only nurses can view assigned mothers.')
 def get_nurse_assigned_mothers():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'nurse':
-            logger.warning(f"Unauthorized access attempt to get assigned mothers by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only nurses can view assigned mothers.'
-            }), HTTPStatus.FORBIDDEN
-
         # Get all mothers assigned to this nurse
         assignments = NurseMotherAssignment.query.filter_by(nurse_id=request.user_id).all()
         assigned_mothers = []
@@ -1494,61 +2412,42 @@ def get_nurse_assigned_mothers():
         for assignment in assignments:
             mother = User.query.get(assignment.mother_id)
             if mother and mother.share_consent:
-                # Get latest health log
-                latest_log = MotherHealthLog.query.filter_by(user_id=mother.id)\
-                    .order_by(MotherHealthLog.timestamp.desc()).first()
+                # Get latest health log (full JSON, including any extra fields)
+                latest_logs = latest_health_logs([MotherHealthLog.data], mother.id, 1)
+                latest_log = latest_logs[0] if latest_logs else None
                 
                 # Get health trends (last 10 logs)
-                health_logs = MotherHealthLog.query.filter_by(user_id=mother.id)\
-                    .order_by(MotherHealthLog.timestamp.desc()).limit(10).all()
-                
-                health_trends = []
-                for log in health_logs:
-                    health_trends.append({
-                        'date': log.timestamp.strftime('%Y-%m-%d'),
-                        'systolic_bp': log.data.get('SystolicBP', 0),
-                        'diastolic_bp': log.data.get('DiastolicBP', 0),
-                        'blood_sugar': log.data.get('BS', 0),
-                        'body_temp': log.data.get('BodyTemp', 0),
-                        'heart_rate': log.data.get('HeartRate', 0)
-                    })
+                health_trends = get_health_trends(mother.id)
 
                 assigned_mothers.append({
                     'id': mother.id,
                     'full_name': mother.full_name,
                     'email': mother.email,
-                    'due_date': mother.due_date.isoformat() if mother.due_date else None,
-                    'assigned_at': assignment.assigned_at.isoformat(),
+                    'due_date': mother.due_date,
+                    'assigned_at': assignment.assigned_at,
                     'latest_health_log': latest_log.data if latest_log else None,
                     'health_trends': health_trends
                 })
 
-        logger.info(f"Assigned mothers retrieved for nurse_id {request.user_id}, count: {len(assigned_mothers)}")
+        logger.info("Assigned mothers retrieved for nurse_id %s, count: %s", request.user_id, len(assigned_mothers), extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'assigned_mothers': assigned_mothers
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error retrieving assigned mothers: {str(e)}")
+        logger.error("Error retrieving assigned mothers: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving assigned mothers: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Admin assignment endpoints
-@app.route('/admin/assign-mother', methods=['POST'])
+@api.route('/admin/assign-mother', methods=['POST'])
 @require_auth
+@require_role('admin', message='Unauthorized access. Only admins can assign mothers to nurses.')
 def admin_assign_mother():
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized mother assignment attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can assign mothers to nurses.'
-            }), HTTPStatus.FORBIDDEN
-
         data = request.get_json()
         mother_id = data.get('mother_id')
         nurse_id = data.get('nurse_id')
@@ -1612,7 +2511,7 @@ def admin_assign_mother():
         db.session.add(new_assignment)
         db.session.commit()
 
-        logger.info(f"Mother {mother_id} assigned to nurse {nurse_id} by admin {request.user_id}")
+        logger.info("Mother %s assigned to nurse %s by admin %s", mother_id, nurse_id, request.user_id)
         return jsonify({
             'status': 'success',
             'message': 'Mother assigned successfully',
@@ -1621,37 +2520,30 @@ def admin_assign_mother():
                 'nurse_id': nurse_id,
                 'mother_name': mother.full_name,
                 'nurse_name': nurse.full_name,
-                'assigned_at': new_assignment.assigned_at.isoformat()
+                'assigned_at': new_assignment.assigned_at
             }
         }), HTTPStatus.OK
 
     except IntegrityError:
         db.session.rollback()
-        logger.error(f"Integrity error assigning mother {mother_id} to nurse {nurse_id}")
+        logger.error("Integrity error assigning mother %s to nurse %s", mother_id, nurse_id)
         return jsonify({
             'status': 'error',
             'message': 'Assignment failed due to constraint violation'
         }), HTTPStatus.CONFLICT
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error assigning mother {mother_id} to nurse {nurse_id}: {str(e)}")
+        logger.error("Error assigning mother %s to nurse %s: %s", mother_id, nurse_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error assigning mother: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/admin/remove-assignment', methods=['POST'])
+@api.route('/admin/remove-assignment', methods=['POST'])
 @require_auth
+@require_role('admin', message='Unauthorized access. Only admins can remove assignments.')
 def admin_remove_assignment():
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized assignment removal attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can remove assignments.'
-            }), HTTPStatus.FORBIDDEN
-
         data = request.get_json()
         mother_id = data.get('mother_id')
         nurse_id = data.get('nurse_id')
@@ -1682,7 +2574,9 @@ def admin_remove_assignment():
         db.session.delete(assignment)
         db.session.commit()
 
-        logger.info(f"Assignment removed: Mother {mother_id} ({mother.full_name if mother else 'Unknown'}) from Nurse {nurse_id} ({nurse.full_name if nurse else 'Unknown'}) by admin {request.user_id}")
+        logger.info("Assignment removed: Mother %s (%s) from Nurse %s (%s) by admin %s",
+                    mother_id, mother.full_name if mother else 'Unknown',
+                    nurse_id, nurse.full_name if nurse else 'Unknown', request.user_id)
         return jsonify({
             'status': 'success',
             'message': 'Assignment removed successfully',
@@ -1696,98 +2590,70 @@ def admin_remove_assignment():
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error removing assignment: {str(e)}")
+        logger.error("Error removing assignment: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error removing assignment: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Legacy nurse assignment endpoint (deprecated - nurses can no longer assign themselves)
-@app.route('/assign-mother', methods=['POST'])
+@api.route('/assign-mother', methods=['POST'])
 @require_auth
+@require_role('nurse', message='Unauthorized access. Only admins can assign mothers to nurses.')
 def assign_mother():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'nurse':
-            logger.warning(f"Unauthorized mother assignment attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can assign mothers to nurses.'
-            }), HTTPStatus.FORBIDDEN
-
         return jsonify({
             'status': 'error',
             'message': 'This endpoint is deprecated. Only admins can assign mothers to nurses. Please contact an administrator.'
         }), HTTPStatus.FORBIDDEN
 
     except Exception as e:
-        logger.error(f"Error in deprecated assign-mother endpoint: {str(e)}")
+        logger.error("Error in deprecated assign-mother endpoint: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Legacy nurse removal endpoint (deprecated - nurses can no longer remove assignments)
-@app.route('/remove-mother', methods=['POST'])
+@api.route('/remove-mother', methods=['POST'])
 @require_auth
+@require_role('nurse', message='Unauthorized access. Only admins can remove mother assignments.')
 def remove_mother():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'nurse':
-            logger.warning(f"Unauthorized mother removal attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can remove mother assignments.'
-            }), HTTPStatus.FORBIDDEN
-
         return jsonify({
             'status': 'error',
             'message': 'This endpoint is deprecated. Only admins can remove mother assignments. Please contact an administrator.'
         }), HTTPStatus.FORBIDDEN
 
     except Exception as e:
-        logger.error(f"Error in deprecated remove-mother endpoint: {str(e)}")
+        logger.error("Error in deprecated remove-mother endpoint: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Legacy endpoint - redirects to new nurse-specific endpoint
-@app.route('/get-assigned-mothers', methods=['GET'])
+@api.route('/get-assigned-mothers', methods=['GET'])
 @require_auth
+@require_role('nurse', message='Unauthorized access. Only nurses can view assigned mothers.')
 def get_assigned_mothers():
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'nurse':
-            logger.warning(f"Unauthorized access attempt to get assigned mothers by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only nurses can view assigned mothers.'
-            }), HTTPStatus.FORBIDDEN
-
         # Redirect to the new nurse-specific endpoint
         return get_nurse_assigned_mothers()
 
     except Exception as e:
-        logger.error(f"Error in legacy get-assigned-mothers endpoint: {str(e)}")
+        logger.error("Error in legacy get-assigned-mothers endpoint: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/admin/test-results', methods=['GET'])
+@api.route('/admin/test-results', methods=['GET'])
 @require_auth
+@require_role('admin', message='Unauthorized access. Only admins can view all test results.')
 def get_all_test_results_admin():
     """Get all test scores (quiz results) with nurse and mother information for admin dashboard"""
     try:
-        user = User.query.get(request.user_id)
-        if not user or (not user.is_admin and user.role != 'admin'):
-            logger.warning(f"Unauthorized access attempt to get all test results by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only admins can view all test results.'
-            }), HTTPStatus.FORBIDDEN
-
         # Get all test scores (quiz results)
         test_scores = TestScore.query.order_by(TestScore.test_date.desc()).limit(100).all()
         
@@ -1817,37 +2683,58 @@ def get_all_test_results_admin():
                 'user_email': test_user.email,
                 'score': score_record.score,
                 'max_score': score_record.max_score,
-                'test_date': score_record.test_date.isoformat(),
+                'test_date': score_record.test_date,
                 'performed_by': performed_by,
                 'user_role': test_user.role
             })
 
-        logger.info(f"All test scores retrieved by admin user_id {request.user_id}, count: {len(results_with_users)}")
+        logger.info("All test scores retrieved by admin user_id %s, count: %s", request.user_id, len(results_with_users), extra=SAMPLED)
         return jsonify({
             'status': 'success',
             'test_results': results_with_users
         }), HTTPStatus.OK
 
     except Exception as e:
-        logger.error(f"Error retrieving all test results: {str(e)}")
+        logger.error("Error retrieving all test results: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error retrieving test results: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/nurse/import-health-data', methods=['POST'])
+@api.route('/admin/profiles', methods=['GET'])
 @require_auth
+@require_role('admin', message='Unauthorized access. Only admins can view profiles.')
+def list_request_profiles():
+    request_profiler = current_app.extensions['request_profiler']
+    return jsonify({
+        'status': 'success',
+        'enabled': REQUEST_PROFILING,
+        'keep': request_profiler.keep,
+        'profiles': request_profiler.list()
+    }), HTTPStatus.OK
+
+@api.route('/admin/profiles/<profile_id>', methods=['GET'])
+@require_auth
+@require_role('admin', message='Unauthorized access. Only admins can download profiles.')
+def download_request_profile(profile_id):
+    kind = request.args.get('format', 'txt')
+    path = current_app.extensions['request_profiler'].path_for(profile_id, kind)
+    if not path:
+        return jsonify({
+            'status': 'error',
+            'message': 'Profile not found'
+        }), HTTPStatus.NOT_FOUND
+    if kind == 'prof':
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{profile_id}.prof')
+    return send_file(path, mimetype='text/plain')
+
+@api.route('/nurse/import-health-data', methods=['POST'])
+@require_auth
+@require_role('nurse', message='Unauthorized access. Only nurses can import health data.')
 def nurse_import_health_data():
     """Allow nurses to import health data for their assigned mothers"""
     try:
-        nurse = User.query.get(request.user_id)
-        if not nurse or nurse.role != 'nurse':
-            logger.warning(f"Unauthorized health data import attempt by user_id {request.user_id}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Unauthorized access. Only nurses can import health data.'
-            }), HTTPStatus.FORBIDDEN
-
         data = request.get_json()
         mother_id = data.get('mother_id')
         health_data = data.get('health_data')
@@ -1879,8 +2766,7 @@ def nurse_import_health_data():
             }), HTTPStatus.FORBIDDEN
 
         # Validate required health data fields
-        required_fields = ['Age', 'SystolicBP', 'DiastolicBP', 'BS', 'BodyTemp', 'HeartRate']
-        for field in required_fields:
+        for field in REQUIRED_HEALTH_FIELDS:
             if field not in health_data or not health_data[field]:
                 return jsonify({
                     'status': 'error',
@@ -1888,16 +2774,16 @@ def nurse_import_health_data():
                 }), HTTPStatus.BAD_REQUEST
 
         # Create new health log entry
-        health_log = MotherHealthLog(
+        health_log = MotherHealthLog.from_health_data(
             user_id=mother_id,
-            data=health_data,
+            health_data=health_data,
             consent_shared=True
         )
         
         db.session.add(health_log)
         db.session.commit()
 
-        logger.info(f"Health data imported by nurse {request.user_id} for mother {mother_id}")
+        logger.info("Health data imported by nurse %s for mother %s", request.user_id, mother_id)
         return jsonify({
             'status': 'success',
             'message': 'Health data imported successfully',
@@ -1906,23 +2792,163 @@ def nurse_import_health_data():
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error importing health data: {str(e)}")
+        logger.error("Error importing health data: %s", e)
         return jsonify({
             'status': 'error',
             'message': f'Error importing health data: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
-@app.route('/update-consent', methods=['POST'])
+BULK_IMPORT_MAX_ROWS = int(os.getenv('BULK_IMPORT_MAX_ROWS', 5000))
+
+def parse_bulk_health_records():
+    """Read bulk import records from a JSON array, NDJSON or CSV request body.
+
+    Every record is returned as a dict with mother_id, timestamp and vitals keys.
+    CSV rows carry mother_id and timestamp columns; every other column is a vital.
+    """
+    content_type = (request.mimetype or '').lower()
+    if content_type == 'text/csv':
+        reader = csv.DictReader(io.StringIO(request.get_data(as_text=True)))
+        return [{
+            'mother_id': row.get('mother_id'),
+            'timestamp': row.get('timestamp'),
+            'vitals': {
+                key: value for key, value in row.items()
+                if key not in ('mother_id', 'timestamp') and value not in (None, '')
+            }
+        } for row in reader]
+
+    if content_type in ('application/x-ndjson', 'application/jsonl'):
+        return [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+
+    data = request.get_json()
+    if isinstance(data, dict):
+        data = data.get('records')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of records or {"records": [...]}')
+    return data
+
+def validate_bulk_health_record(record):
+    """Return (mother_id, timestamp, vitals) for a record, or raise ValueError with the reason."""
+    if not isinstance(record, dict):
+        raise ValueError('Record must be an object')
+    try:
+        mother_id = int(record.get('mother_id'))
+    except (TypeError, ValueError):
+        raise ValueError('mother_id is required')
+
+    vitals = record.get('vitals')
+    if not isinstance(vitals, dict):
+        raise ValueError('vitals is required')
+    for field in REQUIRED_HEALTH_FIELDS:
+        if field not in vitals or not vitals[field]:
+            raise ValueError(f'Missing required field: {field}')
+
+    timestamp = record.get('timestamp')
+    if timestamp:
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid timestamp format. Use ISO format.')
+    else:
+        timestamp = datetime.utcnow()
+    return mother_id, timestamp, vitals
+
+@api.route('/nurse/import-health-data/bulk', methods=['POST'])
 @require_auth
-def update_consent():
+@require_role('nurse', message='Unauthorized access. Only nurses can import health data.')
+def nurse_bulk_import_health_data():
+    """Import many health readings for assigned mothers in one batched insert"""
     try:
-        user = User.query.get(request.user_id)
-        if not user or user.role != 'mother':
-            logger.warning(f"Unauthorized consent update attempt by user_id {request.user_id}")
+        try:
+            records = parse_bulk_health_records()
+        except (ValueError, csv.Error) as e:
             return jsonify({
                 'status': 'error',
-                'message': 'Unauthorized access. Only mothers can update consent.'
-            }), HTTPStatus.FORBIDDEN
+                'message': f'Invalid import payload: {str(e)}'
+            }), HTTPStatus.BAD_REQUEST
+
+        if not records:
+            return jsonify({
+                'status': 'error',
+                'message': 'No records provided'
+            }), HTTPStatus.BAD_REQUEST
+        if len(records) > BULK_IMPORT_MAX_ROWS:
+            return jsonify({
+                'status': 'error',
+                'message': f'Too many records. Maximum is {BULK_IMPORT_MAX_ROWS} per request.'
+            }), HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+        report = [None] * len(records)
+        valid = []
+        for index, record in enumerate(records):
+            try:
+                valid.append((index,) + validate_bulk_health_record(record))
+            except ValueError as e:
+                report[index] = {'index': index, 'status': 'rejected', 'reason': str(e)}
+
+        # Authorize the whole mother set with a single query
+        mother_ids = {mother_id for _, mother_id, _, _ in valid}
+        consent_by_mother = dict(
+            db.session.query(NurseMotherAssignment.mother_id, User.share_consent)
+            .join(User, User.id == NurseMotherAssignment.mother_id)
+            .filter(
+                NurseMotherAssignment.nurse_id == request.user_id,
+                NurseMotherAssignment.mother_id.in_(mother_ids)
+            ).all()
+        ) if mother_ids else {}
+
+        rows = []
+        row_indexes = []
+        for index, mother_id, timestamp, vitals in valid:
+            if mother_id not in consent_by_mother:
+                report[index] = {'index': index, 'status': 'rejected', 'reason': 'Mother is not assigned to this nurse'}
+            elif not consent_by_mother[mother_id]:
+                report[index] = {'index': index, 'status': 'rejected', 'reason': 'Mother has not given consent for data sharing'}
+            else:
+                rows.append({
+                    'user_id': mother_id,
+                    'timestamp': timestamp,
+                    'data': vitals,
+                    'consent_shared': True,
+                    **MotherHealthLog.vitals_from_data(vitals)
+                })
+                row_indexes.append(index)
+
+        if rows:
+            log_ids = db.session.scalars(
+                insert(MotherHealthLog).returning(MotherHealthLog.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            bump_data_version(db.session, {row['user_id'] for row in rows})
+            db.session.commit()
+            for index, log_id in zip(row_indexes, log_ids):
+                report[index] = {'index': index, 'status': 'accepted', 'log_id': log_id}
+
+        accepted = len(rows)
+        logger.info("Bulk health data import by nurse %s: %s accepted, %s rejected", request.user_id, accepted, len(records) - accepted)
+        return jsonify({
+            'status': 'success' if accepted else 'error',
+            'message': f'{accepted} of {len(records)} records imported',
+            'accepted': accepted,
+            'rejected': len(records) - accepted,
+            'results': report
+        }), HTTPStatus.CREATED if accepted else HTTPStatus.BAD_REQUEST
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error bulk importing health data: %s", e)
+        return jsonify({
+            'status': 'error',
+            'message': f'Error importing health data: {str(e)}'
+        }), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@api.route('/update-consent', methods=['POST'])
+@require_auth
+@require_role('mother', message='Unauthorized access. Only mothers can update consent.')
+def update_consent():
+    try:
+        user = g.principal.user
 
         data = request.get_json()
         consent = data.get('consent')
@@ -1937,7 +2963,7 @@ def update_consent():
         user.share_consent = bool(consent)
         db.session.commit()
 
-        logger.info(f"Consent updated for user_id {request.user_id}: {consent}")
+        logger.info("Consent updated for user_id %s: %s", request.user_id, consent)
         return jsonify({
             'status': 'success',
             'message': 'Consent updated successfully',
@@ -1946,14 +2972,14 @@ def update_consent():
 
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error updating consent for user_id {request.user_id}: {str(e)}")
+        logger.error("Error updating consent for user_id %s: %s", request.user_id, e)
         return jsonify({
             'status': 'error',
             'message': f'Error updating consent: {str(e)}'
         }), HTTPStatus.INTERNAL_SERVER_ERROR
 
 # Appointment scheduling endpoints
-@app.route('/schedule-appointment', methods=['POST'])
+@api.route('/schedule-appointment', methods=['POST'])
 @require_auth
 def schedule_appointment():
     try:
@@ -1962,11 +2988,12 @@ def schedule_appointment():
         nurse_id = data.get('nurse_id')
         date_time_str = data.get('date_time')
         notes = data.get('notes', '')
+        duration_minutes = data.get('duration_minutes', DEFAULT_APPOINTMENT_MINUTES)
 
         if not mother_id or not nurse_id or not date_time_str:
             return jsonify({'status': 'error', 'message': 'mother_id, nurse_id and date_time are required'}), HTTPStatus.BAD_REQUEST
 
-        user = User.query.get(request.user_id)
+        user = g.principal.user
         if not user:
             return jsonify({'status': 'error', 'message': 'Unauthorized'}), HTTPStatus.UNAUTHORIZED
 
@@ -1993,30 +3020,35 @@ def schedule_appointment():
         except Exception:
             return jsonify({'status': 'error', 'message': 'Invalid date_time format. Use ISO format.'}), HTTPStatus.BAD_REQUEST
 
-        conflict = Appointment.query.filter(
-            Appointment.date_time == appt_dt,
-            ((Appointment.nurse_id == nurse_id) | (Appointment.mother_id == mother_id)),
-            Appointment.status != 'cancelled'
-        ).first()
+        if not isinstance(duration_minutes, int) or not 5 <= duration_minutes <= MAX_APPOINTMENT_MINUTES:
+            return jsonify({'status': 'error', 'message': f'duration_minutes must be between 5 and {MAX_APPOINTMENT_MINUTES}'}), HTTPStatus.BAD_REQUEST
+        appt_end = appt_dt + timedelta(minutes=duration_minutes)
+
+        conflict = overlapping_appointments(appt_dt, appt_end, nurse_id=nurse_id, mother_id=mother_id).first()
         if conflict:
             return jsonify({'status': 'error', 'message': 'Selected time is not available'}), HTTPStatus.CONFLICT
 
-        appt = Appointment(mother_id=mother_id, nurse_id=nurse_id, date_time=appt_dt, status='pending', notes=notes)
+        appt = Appointment(mother_id=mother_id, nurse_id=nurse_id, date_time=appt_dt, duration_minutes=duration_minutes,
+                           end_time=appt_end, status='pending', notes=notes)
         db.session.add(appt)
         db.session.commit()
         return jsonify({'status': 'success', 'appointment': appt.to_dict()}), HTTPStatus.CREATED
 
+    except IntegrityError:
+        # Exclusion constraint caught a concurrent overlapping booking
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': 'Selected time is not available'}), HTTPStatus.CONFLICT
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error scheduling appointment: {str(e)}")
+        logger.error("Error scheduling appointment: %s", e)
         return jsonify({'status': 'error', 'message': f'Error scheduling appointment: {str(e)}'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-@app.route('/get-appointments', methods=['GET'])
+@api.route('/get-appointments', methods=['GET'])
 @require_auth
 def get_appointments():
     try:
-        user = User.query.get(request.user_id)
+        user = g.principal.user
         if not user:
             return jsonify({'status': 'error', 'message': 'Unauthorized'}), HTTPStatus.UNAUTHORIZED
 
@@ -2033,15 +3065,61 @@ def get_appointments():
         elif nurse_id:
             query = query.filter_by(nurse_id=int(nurse_id))
 
-        appts = query.order_by(Appointment.date_time.desc()).all()
-        return jsonify({'status': 'success', 'appointments': [a.to_dict() for a in appts]}), HTTPStatus.OK
+        appts, next_cursor = paginate_keyset(query, Appointment.date_time, Appointment.id)
+        return jsonify({'status': 'success', 'appointments': [a.to_dict() for a in appts], 'next_cursor': next_cursor}), HTTPStatus.OK
 
+    except InvalidCursor:
+        return invalid_cursor_response()
     except Exception as e:
-        logger.error(f"Error retrieving appointments: {str(e)}")
+        logger.error("Error retrieving appointments: %s", e)
         return jsonify({'status': 'error', 'message': f'Error retrieving appointments: {str(e)}'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-@app.route('/update-appointment', methods=['POST'])
+@api.route('/appointments/free-slots', methods=['GET'])
+@require_auth
+def get_free_slots():
+    try:
+        user = g.principal.user
+        if not user:
+            return jsonify({'status': 'error', 'message': 'Unauthorized'}), HTTPStatus.UNAUTHORIZED
+
+        nurse_id = user.id if user.role == 'nurse' else request.args.get('nurse_id', type=int)
+        if not nurse_id:
+            return jsonify({'status': 'error', 'message': 'nurse_id is required'}), HTTPStatus.BAD_REQUEST
+
+        try:
+            range_start = datetime.fromisoformat(request.args['start'])
+            range_end = datetime.fromisoformat(request.args['end'])
+            day_start = datetime.strptime(request.args.get('day_start', '09:00'), '%H:%M').time()
+            day_end = datetime.strptime(request.args.get('day_end', '17:00'), '%H:%M').time()
+        except (KeyError, ValueError):
+            return jsonify({'status': 'error', 'message': 'start and end are required in ISO format; day_start/day_end use HH:MM'}), HTTPStatus.BAD_REQUEST
+
+        slot_minutes = request.args.get('duration_minutes', DEFAULT_APPOINTMENT_MINUTES, type=int)
+        if not 5 <= slot_minutes <= MAX_APPOINTMENT_MINUTES:
+            return jsonify({'status': 'error', 'message': f'duration_minutes must be between 5 and {MAX_APPOINTMENT_MINUTES}'}), HTTPStatus.BAD_REQUEST
+        if range_end <= range_start or range_end - range_start > timedelta(days=MAX_FREE_SLOT_RANGE_DAYS):
+            return jsonify({'status': 'error', 'message': f'end must be after start and within {MAX_FREE_SLOT_RANGE_DAYS} days'}), HTTPStatus.BAD_REQUEST
+
+        nurse = User.query.get(nurse_id)
+        if not nurse or nurse.role != 'nurse':
+            return jsonify({'status': 'error', 'message': 'Invalid nurse id'}), HTTPStatus.BAD_REQUEST
+
+        # One query for every booking in range, then a linear sweep over working hours
+        busy = overlapping_appointments(
+            range_start, range_end, nurse_id=nurse_id,
+            query=db.session.query(Appointment.date_time, Appointment.end_time)
+        ).order_by(Appointment.date_time).all()
+        free_slots = compute_free_slots(busy, range_start, range_end, slot_minutes, day_start, day_end)
+
+        return jsonify({'status': 'success', 'nurse_id': nurse_id, 'duration_minutes': slot_minutes, 'free_slots': free_slots}), HTTPStatus.OK
+
+    except Exception as e:
+        logger.error("Error computing free slots: %s", e)
+        return jsonify({'status': 'error', 'message': f'Error computing free slots: {str(e)}'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@api.route('/update-appointment', methods=['POST'])
 @require_auth
 def update_appointment():
     try:
@@ -2057,35 +3135,123 @@ def update_appointment():
         if not appt:
             return jsonify({'status': 'error', 'message': 'Appointment not found'}), HTTPStatus.NOT_FOUND
 
-        user = User.query.get(request.user_id)
+        user = g.principal.user
         if user.role == 'mother' and appt.mother_id != user.id:
             return jsonify({'status': 'error', 'message': 'Not allowed'}), HTTPStatus.FORBIDDEN
         if user.role == 'nurse' and appt.nurse_id != user.id:
             return jsonify({'status': 'error', 'message': 'Not allowed'}), HTTPStatus.FORBIDDEN
 
+        if appt.status == 'cancelled' and status != 'cancelled':
+            # The slot was released when it was cancelled and may have been booked since
+            conflict = overlapping_appointments(
+                appt.date_time, appt.end_time, nurse_id=appt.nurse_id, mother_id=appt.mother_id
+            ).filter(Appointment.id != appt.id).first()
+            if conflict:
+                return jsonify({'status': 'error', 'message': 'Appointment overlaps another booking'}), HTTPStatus.CONFLICT
+
         appt.status = status
         if notes is not None:
             appt.notes = notes
         db.session.commit()
         return jsonify({'status': 'success', 'appointment': appt.to_dict()}), HTTPStatus.OK
 
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': 'Appointment overlaps another booking'}), HTTPStatus.CONFLICT
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Error updating appointment: {str(e)}")
+        logger.error("Error updating appointment: %s", e)
         return jsonify({'status': 'error', 'message': f'Error updating appointment: {str(e)}'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
+def create_app(config=None):
+    """Build the app for `config` (Config.from_env() by default)."""
+    config = config or Config.from_env()
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=config.database_url,
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SQLALCHEMY_ENGINE_OPTIONS=build_engine_options(config.database_url, config),
+        JWT_SECRET_KEY=config.jwt_secret_key,
+        GROQ_MODEL=config.groq_model,
+        IS_DEVELOPMENT=config.is_development,
+        DB_PGBOUNCER=config.pgbouncer,
+        SYMBIHELP_CONFIG=config
+    )
+    # orjson-backed JSON encoding; datetimes, dates and NumPy values are serialized natively
+    app.json = FastJSONProvider(app, os.getenv('JSON_PROVIDER', 'auto'))
+    # X-Request-ID on every request and response, stamped on every log record
+    structured_logging.init_app(app)
+    # Per-endpoint counts, latency histograms and stage timers, exposed on /metrics
+    request_metrics.init_app(app)
+    configure_cors(app, config.is_development)
+    app.register_blueprint(api)
+
+    groq_client = None
+    if config.llm_enabled and Groq is not None:
+        try:
+            groq_client = Groq(api_key=config.groq_api_key, base_url=config.groq_base_url)
+            logger.info("Groq client configured successfully")
+        except Exception as e:
+            logger.error("Failed to configure Groq client: %s", e)
+    else:
+        logger.warning("GROQ_API_KEY not set or groq not installed; AI responses will use fallback text")
+    app.extensions['groq'] = groq_client
+
+    db.init_app(app)
+    app.extensions['replica_engines'] = [
+        create_engine(url, **build_engine_options(url, config, instrumented=False))
+        for url in config.database_replica_urls
+    ]
+    if app.extensions['replica_engines'] and not recent_writers.shared:
+        logger.warning("Read replicas configured without READ_YOUR_WRITES_REDIS_URL: read-your-writes only "
+                       "covers writes made through the same worker; set it when running several workers")
+
+    # Statement counts and DB time per request, slow-query log and N+1 warnings
+    query_monitor = QueryMonitor(
+        slow_query_ms=float(os.getenv('SLOW_QUERY_MS', 200)),
+        n_plus_one_threshold=int(os.getenv('N_PLUS_ONE_THRESHOLD', 10)),
+        debug_headers=env_bool('QUERY_DEBUG_HEADERS', config.is_development)
+    )
+    query_monitor.init_app(app)
+
+    request_profiler = RequestProfiler(
+        app.wsgi_app,
+        os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'symbihelp-profiles')),
+        keep=int(os.getenv('PROFILE_KEEP', 50))
+    )
+    app.extensions['request_profiler'] = request_profiler
+    if REQUEST_PROFILING:
+        app.wsgi_app = request_profiler
+
+    tracer.init_app(app)
+
+    with app.app_context():
+        if config.is_sqlite:
+            event.listen(db.engine, 'connect', set_sqlite_pragmas)
+        event.listen(db.engine, 'checkout', pool_metrics.on_checkout)
+        event.listen(db.engine, 'checkin', pool_metrics.on_checkin)
+        for engine in [db.engine, *app.extensions['replica_engines']]:
+            query_monitor.instrument_engine(engine)
+
+    init_database(app)
+    logger.info("App created: %s database%s, LLM %s", config.database_backend,
+                ' (in memory)' if config.sqlite_in_memory else '', 'on' if groq_client else 'off')
+    return app
+
+# Servers import the app from wsgi.py so that importing this module needs no configuration
 if __name__ == '__main__':
+    app = create_app()
+    config = app.config['SYMBIHELP_CONFIG']
     port = int(os.getenv('PORT', 5000))
-    host = '0.0.0.0' if not IS_DEVELOPMENT else '127.0.0.1'
+    host = '0.0.0.0' if not config.is_development else '127.0.0.1'
     
     # Print startup information
     print(f"\n{'='*50}")
-    print(f"Starting server in {'DEVELOPMENT' if IS_DEVELOPMENT else 'PRODUCTION'} mode")
-    print(f"Environment: {ENV}")
-    print(f"Database URL: {'Set' if DATABASE_URL else 'Not set'}")
-    print(f"GROQ API Key: {'Set' if GROQ_API_KEY else 'Not set'}")
-    print(f"JWT Secret: {'Set' if JWT_SECRET_KEY else 'Not set'}")
+    print(f"Starting server in {'DEVELOPMENT' if config.is_development else 'PRODUCTION'} mode")
+    print(f"Environment: {config.env}")
+    print(f"Database: {config.database_backend}{' (in memory)' if config.sqlite_in_memory else ''}")
+    print(f"GROQ API Key: {'Set' if config.llm_enabled else 'Not set'}")
     print(f"Server running on: http://{host}:{port}")
     print("="*50 + "\n")
     
-    app.run(host=host, port=port, debug=IS_DEVELOPMENT)
\ No newline at end of file
+    app.run(host=host, port=port, debug=config.is_development)
\ No newline at end of file
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Migration script to add appointment durations and interval-overlap protection.
+This script:
+1. Adds duration_minutes and end_time columns to appointments
+2. Backfills end_time for existing appointments (default 30 minutes)
+3. Adds exclusion constraints so a nurse or a mother can never hold two
+   overlapping non-cancelled appointments (needs the btree_gist extension)
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+EXCLUSION_CONSTRAINTS = {
+    'appointments_nurse_no_overlap': 'nurse_id',
+    'appointments_mother_no_overlap': 'mother_id'
+}
+
+def run_migration():
+    """Run the appointment duration migration"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+
+            connection.execute(text("""
+                ALTER TABLE appointments
+                ADD COLUMN IF NOT EXISTS duration_minutes INTEGER DEFAULT 30 NOT NULL
+            """))
+            connection.execute(text("ALTER TABLE appointments ADD COLUMN IF NOT EXISTS end_time TIMESTAMP"))
+            result = connection.execute(text("""
+                UPDATE appointments
+                SET end_time = date_time + duration_minutes * INTERVAL '1 minute'
+                WHERE end_time IS NULL
+            """))
+            connection.execute(text("ALTER TABLE appointments ALTER COLUMN end_time SET NOT NULL"))
+            connection.commit()
+            print(f"✓ duration_minutes and end_time ready ({result.rowcount} appointments backfilled)")
+
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+            connection.commit()
+
+            for constraint_name, owner_column in EXCLUSION_CONSTRAINTS.items():
+                exists = connection.execute(text("""
+                    SELECT 1 FROM pg_constraint WHERE conname = :name
+                """), {'name': constraint_name}).fetchone()
+                if exists:
+                    print(f"✓ {constraint_name} already exists")
+                    continue
+
+                # Existing overlaps would make the constraint fail; list them instead
+                overlaps = connection.execute(text(f"""
+                    SELECT a.id, b.id, a.{owner_column}, a.date_time, b.date_time
+                    FROM appointments a
+                    JOIN appointments b
+                      ON a.{owner_column} = b.{owner_column} AND a.id < b.id
+                     AND a.date_time < b.end_time AND b.date_time < a.end_time
+                    WHERE a.status <> 'cancelled' AND b.status <> 'cancelled'
+                """)).fetchall()
+                if overlaps:
+                    print(f"⚠️  Skipping {constraint_name}: {len(overlaps)} overlapping pairs must be resolved first")
+                    for first_id, second_id, owner_id, first_start, second_start in overlaps:
+                        print(f"   {owner_column}={owner_id}: appointment {first_id} ({first_start}) overlaps {second_id} ({second_start})")
+                    continue
+
+                connection.execute(text(f"""
+                    ALTER TABLE appointments
+                    ADD CONSTRAINT {constraint_name}
+                    EXCLUDE USING gist ({owner_column} WITH =, tsrange(date_time, end_time) WITH &&)
+                    WHERE (status <> 'cancelled')
+                """))
+                connection.commit()
+                print(f"✓ {constraint_name} created")
+
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    print("Starting appointment duration migration...")
+    run_migration()
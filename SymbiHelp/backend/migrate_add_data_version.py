@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Migration script to add data_version to users.
+This script:
+1. Adds the data_version column (default 0) behind the ETags of the per-user
+   read endpoints; the app increments it on every write to the user's data
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+def run_migration():
+    """Run the data_version migration"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+
+            connection.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN IF NOT EXISTS data_version INTEGER DEFAULT 0 NOT NULL
+            """))
+            connection.commit()
+            print("✓ data_version column ready")
+
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    print("Starting data_version migration...")
+    run_migration()
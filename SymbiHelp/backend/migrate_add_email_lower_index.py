@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Migration script to make users.email unique case-insensitively.
+This script:
+1. Finds accounts whose emails differ only by case
+2. Keeps one account per address (the one already stored in lowercase, else the
+   oldest) and renames the others to local+duplicate-<id>@domain so nothing is
+   deleted; the report lists them for manual follow-up
+3. Lowercases every remaining email
+4. Builds the unique index on lower(email) CONCURRENTLY, without blocking logins
+
+Pass --explain to print the login query plan against a throwaway table of
+--explain-rows synthetic users (default 1,000,000); nothing is kept.
+"""
+
+import argparse
+import os
+import sys
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+INDEX_NAME = 'ix_users_email_lower'
+LOGIN_QUERY = "SELECT * FROM {table} WHERE lower(email) = :email LIMIT 1"
+
+def duplicate_rename(email, user_id):
+    local, _, domain = email.lower().partition('@')
+    return f"{local}+duplicate-{user_id}@{domain}" if domain else f"{local}+duplicate-{user_id}"
+
+def resolve_case_duplicates(connection):
+    """Rename all but one account per case-insensitive email; returns [(id, old, new)]"""
+    rows = connection.execute(text("""
+        SELECT id, email, lower(email) AS normalized
+        FROM users
+        WHERE lower(email) IN (
+            SELECT lower(email) FROM users GROUP BY lower(email) HAVING COUNT(*) > 1
+        )
+        ORDER BY lower(email), (email = lower(email)) DESC, id
+    """)).fetchall()
+
+    renamed = []
+    keeper = None
+    for user_id, email, normalized in rows:
+        if keeper == normalized:
+            new_email = duplicate_rename(email, user_id)
+            connection.execute(text("UPDATE users SET email = :new_email WHERE id = :user_id"),
+                               {'new_email': new_email, 'user_id': user_id})
+            renamed.append((user_id, email, new_email))
+        else:
+            keeper = normalized
+    return renamed
+
+def run_migration():
+    """Resolve case-duplicates and build the lower(email) unique index"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+
+            renamed = resolve_case_duplicates(connection)
+            result = connection.execute(text("UPDATE users SET email = lower(email) WHERE email <> lower(email)"))
+            connection.commit()
+            print(f"✓ Lowercased {result.rowcount} emails")
+            if renamed:
+                print(f"⚠️  Renamed {len(renamed)} case-duplicate accounts:")
+                for user_id, old_email, new_email in renamed:
+                    print(f"   user {user_id}: {old_email} -> {new_email}")
+            else:
+                print("✓ No case-duplicate emails found")
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            invalid = connection.execute(text("""
+                SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name AND NOT i.indisvalid
+            """), {'name': INDEX_NAME}).fetchone()
+            if invalid:
+                # Left behind by an interrupted earlier run
+                connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}"))
+            print(f"Creating {INDEX_NAME}...")
+            connection.execute(text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON users (lower(email))"
+            ))
+            connection.execute(text("ANALYZE users"))
+            print(f"✓ {INDEX_NAME} ready")
+
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+def explain_login(rows):
+    """EXPLAIN the login lookup on a temporary copy of the users schema with `rows` synthetic users"""
+    engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TEMP TABLE users_explain (LIKE users INCLUDING DEFAULTS) ON COMMIT DROP"))
+        print(f"Seeding {rows} synthetic users...")
+        connection.execute(text("""
+            INSERT INTO users_explain (id, email, password, full_name, role, token_version)
+            SELECT n, 'User' || n || '@Example.com', 'x', 'User ' || n, 'mother', 0
+            FROM generate_series(1, :rows) AS n
+        """), {'rows': rows})
+        connection.execute(text("CREATE UNIQUE INDEX ON users_explain (lower(email))"))
+        connection.execute(text("ANALYZE users_explain"))
+
+        email = f"user{rows // 2}@example.com"
+        plan = connection.execute(
+            text("EXPLAIN (ANALYZE, BUFFERS) " + LOGIN_QUERY.format(table='users_explain')),
+            {'email': email}
+        ).fetchall()
+        print(f"\nLogin lookup for {email}:")
+        for (line,) in plan:
+            print(f"  {line}")
+        connection.rollback()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Add the case-insensitive unique email index')
+    parser.add_argument('--explain', action='store_true', help='Only print the login query plan on synthetic data')
+    parser.add_argument('--explain-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.explain:
+        explain_login(args.explain_rows)
+    else:
+        print("Starting email index migration...")
+        run_migration()
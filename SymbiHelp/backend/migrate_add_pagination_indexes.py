@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the composite indexes used by keyset pagination.
+Each list endpoint pages with WHERE (time, id) < cursor ORDER BY time DESC, id DESC,
+so every index leads with the owner column and ends with (time, id).
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+INDEXES = [
+    ('ix_mother_health_logs_user_timestamp_id', 'mother_health_logs', 'user_id, timestamp, id'),
+    ('ix_test_results_user_date_id', 'test_results', 'user_id, test_date, id'),
+    ('ix_test_scores_user_date_id', 'test_scores', 'user_id, test_date, id'),
+    ('ix_appointments_mother_date_id', 'appointments', 'mother_id, date_time, id'),
+    ('ix_appointments_nurse_date_id', 'appointments', 'nurse_id, date_time, id'),
+    ('ix_users_created_at_id', 'users', 'created_at, id'),
+]
+
+def run_migration():
+    """Create the keyset pagination indexes if they are missing"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+
+            for index_name, table_name, columns in INDEXES:
+                print(f"Creating {index_name} on {table_name} ({columns})...")
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"
+                ))
+                print(f"✓ {index_name} ready")
+
+            # Commit the changes
+            connection.commit()
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    print("Starting pagination index migration...")
+    run_migration()
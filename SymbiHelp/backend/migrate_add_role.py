@@ -10,11 +10,11 @@ from dotenv import load_dotenv
 # Add the current directory to the path so we can import from main
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from main import app, db
+from main import create_app, db
 
 def migrate_add_role_column():
     """Add role column to users table and set default values"""
-    with app.app_context():
+    with create_app().app_context():
         try:
             # Check if role column already exists
             result = db.session.execute(text("""
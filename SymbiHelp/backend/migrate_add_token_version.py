@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Migration script to add token_version to users.
+This script:
+1. Adds the token_version column (default 0) used to revoke refresh tokens
+2. Creates the refresh_tokens table that makes each refresh token single-use
+
+Access tokens issued before this change keep working until they expire; they
+carry no role claims, so the API reads the caller's role from the database.
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+def run_migration():
+    """Run the token_version migration"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+
+            connection.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN IF NOT EXISTS token_version INTEGER DEFAULT 0 NOT NULL
+            """))
+            connection.commit()
+            print("✓ token_version column ready")
+
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS refresh_tokens (
+                    jti VARCHAR(32) PRIMARY KEY,
+                    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                    expires_at TIMESTAMP NOT NULL,
+                    used_at TIMESTAMP
+                )
+            """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens (user_id)"
+            ))
+            connection.commit()
+            print("✓ refresh_tokens table ready")
+
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    print("Starting token_version migration...")
+    run_migration()
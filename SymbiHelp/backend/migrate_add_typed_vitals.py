@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Migration script to add typed vitals columns to mother_health_logs.
+This script:
+1. Adds age, systolic_bp, diastolic_bp, blood_sugar, body_temp and heart_rate columns
+2. Backfills them from the JSON `data` column in batches
+
+The JSON column is kept as is, so extra fields are not lost.
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+BATCH_SIZE = int(os.getenv('BACKFILL_BATCH_SIZE', 10000))
+
+# JSON key -> typed column
+VITALS_COLUMNS = {
+    'Age': 'age',
+    'SystolicBP': 'systolic_bp',
+    'DiastolicBP': 'diastolic_bp',
+    'BS': 'blood_sugar',
+    'BodyTemp': 'body_temp',
+    'HeartRate': 'heart_rate'
+}
+
+def numeric_from_json(key):
+    """SQL expression that casts data->>key to a number, or NULL when it is not numeric"""
+    return (
+        f"CASE WHEN data->>'{key}' ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$' "
+        f"THEN (data->>'{key}')::double precision END"
+    )
+
+def run_migration():
+    """Run the migration to add and backfill typed vitals columns"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+
+            for column in VITALS_COLUMNS.values():
+                connection.execute(text(
+                    f"ALTER TABLE mother_health_logs ADD COLUMN IF NOT EXISTS {column} DOUBLE PRECISION"
+                ))
+            connection.commit()
+            print("✓ Typed vitals columns present")
+
+            bounds = connection.execute(text("SELECT MIN(id), MAX(id) FROM mother_health_logs")).fetchone()
+            if bounds[0] is None:
+                print("✓ No health logs to backfill")
+                return
+
+            assignments = ",\n                    ".join(
+                f"{column} = {numeric_from_json(key)}" for key, column in VITALS_COLUMNS.items()
+            )
+            null_check = " AND ".join(f"{column} IS NULL" for column in VITALS_COLUMNS.values())
+
+            # Backfill in id ranges so each transaction stays small
+            updated = 0
+            for start in range(bounds[0], bounds[1] + 1, BATCH_SIZE):
+                result = connection.execute(text(f"""
+                    UPDATE mother_health_logs SET
+                    {assignments}
+                    WHERE id >= :start AND id < :end AND {null_check}
+                """), {'start': start, 'end': start + BATCH_SIZE})
+                connection.commit()
+                updated += result.rowcount
+                print(f"  backfilled ids {start}-{min(start + BATCH_SIZE - 1, bounds[1])} ({updated} rows so far)")
+
+            print(f"✓ Backfilled typed vitals for {updated} health logs")
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    print("Starting typed vitals migration...")
+    run_migration()
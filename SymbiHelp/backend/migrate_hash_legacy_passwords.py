@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Migration script to bcrypt-hash every legacy plaintext password in users.
+This script:
+1. Reads users whose password is not a bcrypt hash, in id order, one batch at a time
+2. Hashes each batch across a process pool
+3. Writes the batch back and commits, skipping rows changed in the meantime
+
+It can be stopped and re-run at any time. Once it reports no plaintext rows
+left (check with --verify), set ALLOW_LEGACY_PLAINTEXT_PASSWORDS=false so
+/login stops accepting plaintext matches.
+
+    python3 migrate_hash_legacy_passwords.py --batch-size 500 --workers 4
+    python3 migrate_hash_legacy_passwords.py --verify
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+from password_hashing import hash_password
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+# Same test as password_hashing.is_bcrypt_hash, done in SQL
+LEGACY_FILTER = """
+    NOT (password LIKE '$2a$%' OR password LIKE '$2b$%' OR password LIKE '$2y$%')
+    OR length(password) < 60
+"""
+
+def connect():
+    # sslmode is a libpq option; SQLite (local runs) rejects it
+    if DATABASE_URL.startswith('postgresql'):
+        return create_engine(DATABASE_URL, connect_args={'sslmode': 'require'})
+    return create_engine(DATABASE_URL)
+
+def count_legacy(connection):
+    return connection.execute(text(f"SELECT COUNT(*) FROM users WHERE {LEGACY_FILTER}")).scalar()
+
+def hash_row(row, rounds):
+    user_id, plaintext = row
+    return user_id, plaintext, hash_password(plaintext, rounds)
+
+def run_migration(batch_size, workers, rounds):
+    """Hash legacy passwords batch by batch"""
+    try:
+        # Create database engine
+        engine = connect()
+
+        with engine.connect() as connection:
+            print("Connected to database successfully")
+            total = count_legacy(connection)
+            print(f"{total} legacy plaintext passwords to hash")
+            if not total:
+                return
+
+            migrated = skipped = 0
+            last_id = 0
+            start = time.monotonic()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                while True:
+                    rows = connection.execute(text(f"""
+                        SELECT id, password FROM users
+                        WHERE id > :last_id AND ({LEGACY_FILTER})
+                        ORDER BY id
+                        LIMIT :batch_size
+                    """), {'last_id': last_id, 'batch_size': batch_size}).fetchall()
+                    connection.rollback()  # Don't hold a transaction open while hashing
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+
+                    hashed = list(executor.map(hash_row, rows, [rounds] * len(rows),
+                                               chunksize=max(1, len(rows) // (workers * 4))))
+                    for user_id, plaintext, password_hash in hashed:
+                        # Only replace the value we hashed, in case the user changed it meanwhile
+                        result = connection.execute(text("""
+                            UPDATE users SET password = :password_hash
+                            WHERE id = :user_id AND password = :plaintext
+                        """), {'password_hash': password_hash, 'user_id': user_id, 'plaintext': plaintext})
+                        if result.rowcount:
+                            migrated += 1
+                        else:
+                            skipped += 1
+                    connection.commit()
+
+                    done = migrated + skipped
+                    elapsed = time.monotonic() - start
+                    rate = done / elapsed if elapsed else 0
+                    eta = (total - done) / rate if rate else 0
+                    print(f"  {done}/{total} ({done / total:.0%}) up to id {last_id}, "
+                          f"{rate:.0f} rows/s, ~{eta:.0f}s left")
+
+            print(f"✓ Hashed {migrated} passwords ({skipped} changed during the run and were left alone)")
+            remaining = count_legacy(connection)
+            if remaining:
+                print(f"⚠️  {remaining} plaintext passwords remain; run the script again")
+            else:
+                print("✓ No plaintext passwords remain; ALLOW_LEGACY_PLAINTEXT_PASSWORDS can be set to false")
+
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+def verify():
+    """Exit non-zero while any plaintext password remains"""
+    engine = connect()
+    with engine.connect() as connection:
+        remaining = count_legacy(connection)
+    if remaining:
+        print(f"⚠️  {remaining} plaintext passwords remain")
+        sys.exit(1)
+    print("✓ Every password is a bcrypt hash")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Hash legacy plaintext passwords')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--rounds', type=int, default=int(os.getenv('BCRYPT_ROUNDS', 12)))
+    parser.add_argument('--verify', action='store_true', help='Only report whether plaintext rows remain')
+    args = parser.parse_args()
+
+    if args.verify:
+        verify()
+    else:
+        print("Starting legacy password migration...")
+        run_migration(args.batch_size, args.workers, args.rounds)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Migration script to convert mother_health_logs into a monthly range-partitioned table.
+This script:
+1. Renames the current table to mother_health_logs_unpartitioned
+2. Creates mother_health_logs PARTITION BY RANGE (timestamp) with a default partition
+3. Creates one partition per month from the oldest row through the coming months
+4. Copies all rows across and drops the old table (pass --keep-old to keep it)
+
+Run it during a maintenance window: the whole conversion happens in one transaction.
+"""
+
+import os
+import sys
+from datetime import date
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+from health_log_partitions import (
+    DEFAULT_PARTITION,
+    PARENT_TABLE,
+    add_months,
+    create_month_partition,
+    ensure_future_partitions,
+    is_partitioned,
+    month_start
+)
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+OLD_TABLE = 'mother_health_logs_unpartitioned'
+MONTHS_AHEAD = int(os.getenv('HEALTH_LOG_PARTITION_MONTHS_AHEAD', 3))
+
+def run_migration(keep_old=False):
+    """Run the migration to partition mother_health_logs by month"""
+    try:
+        # Create database engine
+        engine = create_engine(DATABASE_URL, connect_args={'sslmode': os.getenv('DB_SSLMODE', 'require')})
+
+        with engine.begin() as connection:
+            print("Connected to database successfully")
+
+            if is_partitioned(connection):
+                print("✓ mother_health_logs is already partitioned")
+                return
+
+            print("Renaming current table...")
+            connection.execute(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {OLD_TABLE}"))
+            connection.execute(text(f"ALTER INDEX IF EXISTS mother_health_logs_pkey RENAME TO {OLD_TABLE}_pkey"))
+            connection.execute(text(
+                f"ALTER INDEX IF EXISTS ix_mother_health_logs_user_timestamp_id RENAME TO ix_{OLD_TABLE}_user_ts_id"
+            ))
+
+            print("Creating partitioned table...")
+            # The partition key must be part of the primary key; id stays unique via its sequence
+            connection.execute(text(f"""
+                CREATE TABLE {PARENT_TABLE} (
+                    id INTEGER NOT NULL DEFAULT nextval('mother_health_logs_id_seq'),
+                    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    data JSONB NOT NULL,
+                    consent_shared BOOLEAN DEFAULT FALSE,
+                    age DOUBLE PRECISION,
+                    systolic_bp DOUBLE PRECISION,
+                    diastolic_bp DOUBLE PRECISION,
+                    blood_sugar DOUBLE PRECISION,
+                    body_temp DOUBLE PRECISION,
+                    heart_rate DOUBLE PRECISION,
+                    PRIMARY KEY (id, timestamp)
+                ) PARTITION BY RANGE (timestamp)
+            """))
+            connection.execute(text(f"ALTER SEQUENCE mother_health_logs_id_seq OWNED BY {PARENT_TABLE}.id"))
+            connection.execute(text(f"""
+                CREATE INDEX ix_mother_health_logs_user_timestamp_id
+                ON {PARENT_TABLE} (user_id, timestamp, id)
+            """))
+            connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+            print("✓ Partitioned table created")
+
+            oldest = connection.execute(text(f"SELECT MIN(timestamp) FROM {OLD_TABLE}")).scalar()
+            month = month_start(oldest.date() if oldest else date.today())
+            current = month_start(date.today())
+            while month < current:
+                create_month_partition(connection, month)
+                month = add_months(month, 1)
+            created = ensure_future_partitions(connection, MONTHS_AHEAD)
+            print(f"✓ Monthly partitions created through {add_months(current, MONTHS_AHEAD)} ({len(created)} future)")
+
+            print("Copying rows...")
+            result = connection.execute(text(f"""
+                INSERT INTO {PARENT_TABLE}
+                    (id, user_id, timestamp, data, consent_shared,
+                     age, systolic_bp, diastolic_bp, blood_sugar, body_temp, heart_rate)
+                SELECT id, user_id, COALESCE(timestamp, CURRENT_TIMESTAMP), data::jsonb, consent_shared,
+                       age, systolic_bp, diastolic_bp, blood_sugar, body_temp, heart_rate
+                FROM {OLD_TABLE}
+            """))
+            print(f"✓ Copied {result.rowcount} rows")
+
+            if keep_old:
+                print(f"✓ Kept {OLD_TABLE}; drop it once the new table is verified")
+            else:
+                connection.execute(text(f"DROP TABLE {OLD_TABLE}"))
+                print(f"✓ Dropped {OLD_TABLE}")
+
+            print("\nMigration completed successfully!")
+
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    print("Starting health log partitioning migration...")
+    print("Run migrate_add_typed_vitals.py first so the typed vitals columns exist.")
+    run_migration(keep_old='--keep-old' in sys.argv)
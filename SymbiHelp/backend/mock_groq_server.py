@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Local Groq/OpenAI-compatible chat completions server for offline load tests.
+
+Point the backend at it and every LLM call (recommendations, /chat) is answered
+locally with controllable latency, streaming speed, errors and rate limits:
+
+    python3 mock_groq_server.py --port 9100 --latency lognormal:0.8,0.4 --seed 7
+    GROQ_BASE_URL=http://127.0.0.1:9100 python3 main.py
+
+Latency distributions (seconds):
+    fixed:S  uniform:LO,HI  normal:MEAN,STD  lognormal:MEDIAN,SIGMA  exponential:MEAN
+
+Failure injection, each drawn per request from the seeded generator:
+    --error-rate 0.02     answer 500 with a Groq-style error body
+    --timeout-rate 0.01   hold the request for --hang-seconds without answering
+    --rate-limit 50       allow 50 requests/second (token bucket), then answer 429
+
+Streaming requests (stream=true) get server-sent events at --tokens-per-second.
+GET /mock/stats returns counters since startup.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+CANNED_WORDS = (
+    "Keep attending your prenatal checkups, stay hydrated, eat balanced meals rich in iron and folate, "
+    "rest when you feel tired, and call your healthcare provider if you notice swelling, headaches, "
+    "blurred vision, bleeding or reduced baby movements."
+).split()
+
+def parse_distribution(spec):
+    """'lognormal:0.8,0.4' -> callable(rng) returning a non-negative delay in seconds"""
+    name, _, raw_args = spec.partition(':')
+    args = [float(value) for value in raw_args.split(',') if value]
+    samplers = {
+        'fixed': (1, lambda rng, s: s),
+        'uniform': (2, lambda rng, lo, hi: rng.uniform(lo, hi)),
+        'normal': (2, lambda rng, mean, std: rng.gauss(mean, std)),
+        'lognormal': (2, lambda rng, median, sigma: rng.lognormvariate(math.log(median), sigma)),
+        'exponential': (1, lambda rng, mean: rng.expovariate(1 / mean)),
+    }
+    if name not in samplers or len(args) != samplers[name][0]:
+        raise argparse.ArgumentTypeError(f"Invalid latency distribution: {spec}")
+    _, sampler = samplers[name]
+    return lambda rng: max(0.0, sampler(rng, *args))
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """True if a request may proceed; otherwise seconds until the next token"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return (1 - self.tokens) / self.rate
+
+class MockGroq:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.latency = args.latency
+        self.bucket = TokenBucket(args.rate_limit) if args.rate_limit else None
+        self.stats = {'requests': 0, 'completed': 0, 'streamed': 0, 'errors': 0, 'timeouts': 0,
+                      'rate_limited': 0, 'in_flight': 0, 'max_in_flight': 0}
+
+    def plan(self):
+        """Draw everything random for one request up front, so a seed replays the same sequence"""
+        roll = self.rng.random()
+        if roll < self.args.error_rate:
+            outcome = 'error'
+        elif roll < self.args.error_rate + self.args.timeout_rate:
+            outcome = 'timeout'
+        else:
+            outcome = 'ok'
+        tokens = self.rng.randint(self.args.min_tokens, self.args.max_tokens)
+        return outcome, self.latency(self.rng), tokens
+
+    def completion_text(self, tokens):
+        return ' '.join(CANNED_WORDS[i % len(CANNED_WORDS)] for i in range(tokens))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                await send({'type': f"{message['type']}.complete"})
+                if message['type'] == 'lifespan.shutdown':
+                    return
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        path = scope['path'].rstrip('/')
+        if scope['method'] == 'GET' and path == '/mock/stats':
+            return await self.send_json(send, 200, self.stats)
+        if scope['method'] == 'GET' and path.endswith('/models'):
+            return await self.send_json(send, 200, {'object': 'list', 'data': [
+                {'id': self.args.model, 'object': 'model', 'owned_by': 'mock'}]})
+        if scope['method'] != 'POST' or not path.endswith('/chat/completions'):
+            return await self.send_error(send, 404, 'Unknown route', 'invalid_request_error')
+
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return await self.send_error(send, 400, 'Request body is not valid JSON', 'invalid_request_error')
+
+        self.stats['requests'] += 1
+        if self.bucket is not None:
+            allowed = self.bucket.take()
+            if allowed is not True:
+                self.stats['rate_limited'] += 1
+                return await self.send_error(send, 429, 'Rate limit reached for requests', 'rate_limit_exceeded',
+                                             headers=[(b'retry-after', f'{math.ceil(allowed)}'.encode())])
+
+        outcome, delay, tokens = self.plan()
+        self.stats['in_flight'] += 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+        try:
+            if outcome == 'timeout':
+                self.stats['timeouts'] += 1
+                await asyncio.sleep(self.args.hang_seconds)
+                return await self.send_error(send, 504, 'Upstream timed out', 'timeout')
+            await asyncio.sleep(delay)
+            if outcome == 'error':
+                self.stats['errors'] += 1
+                return await self.send_error(send, 500, 'Internal server error', 'internal_server_error')
+            if payload.get('stream'):
+                self.stats['streamed'] += 1
+                return await self.stream(send, payload, tokens)
+            self.stats['completed'] += 1
+            return await self.send_json(send, 200, self.completion(payload, tokens))
+        finally:
+            self.stats['in_flight'] -= 1
+
+    def completion(self, payload, tokens):
+        prompt_tokens = sum(len(str(m.get('content', '')).split()) for m in payload.get('messages', []))
+        return {
+            'id': f'chatcmpl-{uuid.uuid4().hex[:24]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', self.args.model),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': self.completion_text(tokens)},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': tokens,
+                      'total_tokens': prompt_tokens + tokens}
+        }
+
+    async def stream(self, send, payload, tokens):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache')]})
+        completion_id = f'chatcmpl-{uuid.uuid4().hex[:24]}'
+        interval = 1 / self.args.tokens_per_second if self.args.tokens_per_second else 0
+        for i in range(tokens):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': payload.get('model', self.args.model),
+                'choices': [{'index': 0, 'delta': {'content': ('' if i == 0 else ' ') + CANNED_WORDS[i % len(CANNED_WORDS)]},
+                             'finish_reason': None}]
+            }
+            await send({'type': 'http.response.body', 'body': f"data: {json.dumps(chunk)}\n\n".encode(), 'more_body': True})
+            if interval:
+                await asyncio.sleep(interval)
+        done = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                'model': payload.get('model', self.args.model),
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+        await send({'type': 'http.response.body', 'body': f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode()})
+
+    async def send_json(self, send, status, data, headers=()):
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'), *headers]})
+        await send({'type': 'http.response.body', 'body': json.dumps(data).encode()})
+
+    async def send_error(self, send, status, message, error_type, headers=()):
+        await self.send_json(send, status, {'error': {'message': message, 'type': error_type, 'code': error_type}},
+                             headers)
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Groq chat completions server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', type=parse_distribution, default=parse_distribution('fixed:1.0'),
+                        help='Time to first byte, e.g. fixed:1.0 or lognormal:0.8,0.4')
+    parser.add_argument('--tokens-per-second', type=float, default=50, help='Streaming speed (0 = no delay)')
+    parser.add_argument('--min-tokens', type=int, default=60)
+    parser.add_argument('--max-tokens', type=int, default=180)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--hang-seconds', type=float, default=120)
+    parser.add_argument('--rate-limit', type=float, default=0, help='Requests per second before 429 (0 = off)')
+    parser.add_argument('--model', default='llama-3.1-70b-versatile')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    print(f"Mock Groq listening on http://{args.host}:{args.port} (set GROQ_BASE_URL to this)")
+    uvicorn.run(MockGroq(args), host=args.host, port=args.port, log_level='warning')
+
+if __name__ == '__main__':
+    main()
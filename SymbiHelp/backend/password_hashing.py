@@ -0,0 +1,102 @@
+"""
+Bounded process pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (100-300 ms of CPU per call). Running it inside the
+request worker lets a burst of logins starve every other endpoint, so /login and
+/register hand it to a small pool of worker processes instead. At most
+`max_pending` calls may be queued or running; beyond that a call raises
+PasswordHasherBusy straight away so the API can answer 503 instead of queueing
+without bound.
+
+Pool workers are started with forkserver (spawn where it is unavailable), not
+fork: the web worker already runs logging and tracing threads whose locks a
+forked child could inherit while held.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+DEFAULT_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is saturated, did not answer in time or lost a worker."""
+
+def is_bcrypt_hash(value):
+    return isinstance(value, str) and value.startswith(BCRYPT_PREFIXES) and len(value) >= 60
+
+def hash_password(password, rounds=12):
+    """bcrypt hash of `password` as a str (runs in the worker process)"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+def check_password(password, hashed):
+    """True when `password` matches the bcrypt `hashed` value (runs in the worker process)"""
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+class PasswordHasher:
+    """Process pool front-end with a hard cap on queued + running calls.
+
+    The executor is created on first use in each process, so it is safe to
+    import before gunicorn forks its workers.
+    """
+
+    def __init__(self, workers=2, max_pending=16, timeout=5.0, rounds=12, start_method=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.rounds = rounds
+        self.start_method = start_method or DEFAULT_START_METHOD
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(self.start_method)
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _reset_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy(f'{self.max_pending} password operations already pending')
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            self._slots.release()
+            self._reset_executor(executor)
+            raise PasswordHasherBusy('Password worker pool is restarting') from e
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy(f'Password operation took longer than {self.timeout}s')
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM killed); start a fresh pool on the next call
+            self._reset_executor(executor)
+            raise PasswordHasherBusy('Password worker pool is restarting') from e
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.rounds)
+
+    def check(self, password, hashed):
+        return self._run(check_password, password, hashed)
+
@@ -0,0 +1,92 @@
+"""
+Per-request SQL statement accounting built on SQLAlchemy engine events.
+
+For every request it counts statements and database time, logs statements
+slower than SLOW_QUERY_MS with the shape of their bound parameters (types
+only, never values), and warns when one statement template runs more than
+N_PLUS_ONE_THRESHOLD times in a single request, which is the signature of a
+query issued inside a loop.
+
+With debug headers on (the default in development) every response carries
+    X-Query-Count      statements executed
+    X-Query-Time-Ms    time spent executing them
+    X-Query-Max-Repeat most executions of a single statement template
+"""
+
+import logging
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+
+import request_metrics
+from tracing import record_span
+
+logger = logging.getLogger(__name__)
+
+class QueryMonitor:
+    def __init__(self, slow_query_ms=200, n_plus_one_threshold=10, debug_headers=False):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.debug_headers = debug_headers
+
+    def instrument_engine(self, engine):
+        from sqlalchemy import event
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def init_app(self, app):
+        app.after_request(self.finish_request)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        if elapsed >= self.slow_query_seconds:
+            logger.warning("Slow query (%.1f ms) in %s: %s | params: %s",
+                           elapsed * 1000, request.endpoint if has_request_context() else 'background',
+                           ' '.join(statement.split()), parameter_shape(parameters, executemany))
+
+        if not has_request_context():
+            return
+        request_metrics.add_stage_time('db', elapsed)
+        end_ns = time.time_ns()
+        record_span('db.query', end_ns - int(elapsed * 1e9), end_ns, statement=statement[:300])
+        stats = g.get('_query_stats')
+        if stats is None:
+            stats = g._query_stats = {'count': 0, 'seconds': 0.0, 'templates': Counter()}
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        # Statements arrive with placeholders, so the text is already the template
+        stats['templates'][statement] += 1
+
+    def finish_request(self, response):
+        stats = g.pop('_query_stats', None)
+        if stats is None:
+            return response
+
+        repeated = [(template, n) for template, n in stats['templates'].items() if n > self.n_plus_one_threshold]
+        for template, n in repeated:
+            logger.warning("Possible N+1 in %s %s: statement ran %d times: %s",
+                           request.method, request.endpoint, n, ' '.join(template.split())[:300])
+
+        if self.debug_headers:
+            response.headers['X-Query-Count'] = str(stats['count'])
+            response.headers['X-Query-Time-Ms'] = f"{stats['seconds'] * 1000:.2f}"
+            response.headers['X-Query-Max-Repeat'] = str(max(stats['templates'].values()))
+        return response
+
+def parameter_shape(parameters, executemany=False):
+    """Types of the bound parameters, e.g. {'email': 'str', 'id': 'int'} or '250 x (int, str)'"""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + '}'
+    if isinstance(parameters, (list, tuple)):
+        return '(' + ', '.join(type(value).__name__ for value in parameters) + ')'
+    return type(parameters).__name__
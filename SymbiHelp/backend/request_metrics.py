@@ -0,0 +1,143 @@
+"""
+Prometheus request metrics for the Flask app.
+
+Records, per endpoint:
+    symbihelp_http_requests_total{method,endpoint,status}
+    symbihelp_http_request_duration_seconds{method,endpoint}       (histogram)
+    symbihelp_http_requests_in_flight{method,endpoint}              (gauge)
+    symbihelp_request_stage_seconds{endpoint,stage}                  (histogram)
+
+Stages are time spent inside a request on the database ('db', fed by
+query_monitor.py), on the risk model ('inference') and waiting for Groq
+('groq'); each is summed per request and observed once when the request ends.
+
+Under gunicorn or uvicorn with several workers, set PROMETHEUS_MULTIPROC_DIR
+to an empty writable directory before the workers start (gunicorn.conf.py does
+this) so /metrics aggregates every worker instead of the one that answered.
+
+/metrics is admin-only. For a Prometheus scraper without a token, gunicorn
+can also serve the same metrics on an internal address (METRICS_BIND, see
+gunicorn.conf.py).
+
+prometheus_client is optional; without it requests are not measured and
+/metrics answers 503.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+
+from tracing import span
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # Optional dependency; metrics are disabled without it
+    prometheus_client = None
+
+STAGES = ('db', 'inference', 'groq')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+if prometheus_client is not None:
+    REQUESTS = Counter(
+        'symbihelp_http_requests_total', 'HTTP requests by endpoint and status',
+        ['method', 'endpoint', 'status']
+    )
+    LATENCY = Histogram(
+        'symbihelp_http_request_duration_seconds', 'Time from first byte in to response ready',
+        ['method', 'endpoint'], buckets=LATENCY_BUCKETS
+    )
+    IN_FLIGHT = Gauge(
+        'symbihelp_http_requests_in_flight', 'Requests currently being handled',
+        ['method', 'endpoint'], multiprocess_mode='livesum'
+    )
+    STAGE_SECONDS = Histogram(
+        'symbihelp_request_stage_seconds', 'Per-request time spent in a stage (db, inference, groq)',
+        ['endpoint', 'stage'], buckets=STAGE_BUCKETS
+    )
+
+def multiprocess_dir():
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir')
+
+def endpoint_label():
+    # The matched rule keeps label cardinality bounded; unknown paths share one label
+    return request.endpoint or 'unmatched'
+
+def add_stage_time(stage, seconds):
+    """Add `seconds` to the current request's total for `stage` (no-op outside a request)"""
+    if prometheus_client is None or not has_request_context():
+        return
+    stages = g.get('_metrics_stages')
+    if stages is None:
+        stages = g._metrics_stages = {}
+    stages[stage] = stages.get(stage, 0.0) + seconds
+
+@contextmanager
+def stage_timer(stage):
+    """Time the block towards `stage` and trace it as a span of the same name"""
+    start = time.perf_counter()
+    try:
+        with span(stage):
+            yield
+    finally:
+        add_stage_time(stage, time.perf_counter() - start)
+
+def start_request():
+    if prometheus_client is None:
+        return
+    labels = (request.method, endpoint_label())
+    IN_FLIGHT.labels(*labels).inc()
+    g._metrics_request = (time.perf_counter(), labels)
+
+def record_status(response):
+    if '_metrics_request' in g:
+        g._metrics_status = response.status_code
+    return response
+
+def finish_request(error=None):
+    started = g.pop('_metrics_request', None)
+    if started is None:
+        return
+    start, (method, endpoint) = started
+    status = g.pop('_metrics_status', 500 if error is not None else 200)
+    IN_FLIGHT.labels(method, endpoint).dec()
+    LATENCY.labels(method, endpoint).observe(time.perf_counter() - start)
+    REQUESTS.labels(method, endpoint, str(status)).inc()
+    for stage, seconds in g.pop('_metrics_stages', {}).items():
+        STAGE_SECONDS.labels(endpoint, stage).observe(seconds)
+
+def init_app(app):
+    """Register the request hooks; call before any other before_request handler"""
+    app.before_request(start_request)
+    app.after_request(record_status)
+    app.teardown_request(finish_request)
+
+def collector_registry():
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return prometheus_client.REGISTRY
+
+def render_latest():
+    """(body, content_type) in the Prometheus text format, or None when metrics are disabled"""
+    if prometheus_client is None:
+        return None
+    return prometheus_client.generate_latest(collector_registry()), prometheus_client.CONTENT_TYPE_LATEST
+
+def start_scrape_server(bind):
+    """Serve the metrics without authentication on `bind` ('host:port'); keep it on an internal interface"""
+    if prometheus_client is None:
+        return False
+    host, _, port = bind.rpartition(':')
+    prometheus_client.start_http_server(int(port), addr=host or '127.0.0.1', registry=collector_registry())
+    return True
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges from the multiprocess store (gunicorn child_exit)"""
+    if prometheus_client is not None and multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
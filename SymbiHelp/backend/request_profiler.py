@@ -0,0 +1,140 @@
+"""
+On-demand cProfile capture of single requests, kept in a bounded on-disk ring.
+
+A request opts in with an `X-Profile: 1` header or a `profile=1` query flag.
+The app decides whether the caller may profile (see main.py, admins only) by
+setting environ[AUTHORIZED_KEY]; unauthorized captures are thrown away.
+Requests without the flag pass straight through with no profiler attached.
+
+Each capture is stored as three files sharing one id:
+    <id>.prof  pstats dump (open with snakeviz or `python -m pstats`)
+    <id>.txt   call tree sorted by cumulative time, plus callers of the hottest functions
+    <id>.json  request metadata used by the listing endpoint
+
+Only the newest `keep` captures are retained. The directory may be shared by
+every worker of a deployment.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+
+AUTHORIZED_KEY = 'symbihelp.profile.authorized'
+USER_ID_KEY = 'symbihelp.profile.user_id'
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{12}-[A-Za-z0-9_.-]+-[0-9a-f]{8}$')
+
+def profile_requested(environ):
+    if environ.get('HTTP_X_PROFILE', '').lower() in ('1', 'true', 'yes'):
+        return True
+    query = environ.get('QUERY_STRING', '')
+    return 'profile=' in query and re.search(r'(^|&)profile=(1|true|yes)(&|$)', query) is not None
+
+class RequestProfiler:
+    """WSGI middleware that profiles opted-in requests and stores the results"""
+
+    def __init__(self, wsgi_app, directory, keep=50, report_lines=60):
+        self.wsgi_app = wsgi_app
+        self.directory = os.path.abspath(directory)
+        self.keep = keep
+        self.report_lines = report_lines
+
+    def __call__(self, environ, start_response):
+        if not profile_requested(environ):
+            return self.wsgi_app(environ, start_response)
+
+        status = {}
+
+        def capture_status(status_line, headers, exc_info=None):
+            status['code'] = int(status_line.split(' ', 1)[0])
+            return start_response(status_line, headers, exc_info)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            # Materialize the body inside the profile so lazy responses are measured too
+            result = self.wsgi_app(environ, capture_status)
+            try:
+                body = b''.join(result)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        if environ.get(AUTHORIZED_KEY):
+            self.save(profiler, environ, status.get('code'), elapsed)
+        return [body]
+
+    def save(self, profiler, environ, status, elapsed):
+        os.makedirs(self.directory, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        endpoint = re.sub(r'[^A-Za-z0-9_.-]+', '_', environ.get('PATH_INFO', '/').strip('/')) or 'root'
+        profile_id = f"{now:%Y%m%dT%H%M%S%f}-{environ['REQUEST_METHOD']}_{endpoint[:60]}-{secrets.token_hex(4)}"
+        base = os.path.join(self.directory, profile_id)
+
+        profiler.dump_stats(f'{base}.prof')
+        with open(f'{base}.txt', 'w') as f:
+            f.write(self.report(profiler, environ, status, elapsed))
+        with open(f'{base}.json', 'w') as f:
+            json.dump({
+                'id': profile_id,
+                'method': environ['REQUEST_METHOD'],
+                'path': environ.get('PATH_INFO', '/'),
+                'query_string': environ.get('QUERY_STRING', ''),
+                'status': status,
+                'duration_ms': round(elapsed * 1000, 3),
+                'created_at': now.isoformat(),
+                'user_id': environ.get(USER_ID_KEY)
+            }, f)
+        self.prune()
+        return profile_id
+
+    def report(self, profiler, environ, status, elapsed):
+        out = io.StringIO()
+        out.write(f"{environ['REQUEST_METHOD']} {environ.get('PATH_INFO', '/')} -> {status} "
+                  f"in {elapsed * 1000:.1f} ms\n\n")
+        stats = pstats.Stats(profiler, stream=out).strip_dirs().sort_stats('cumulative')
+        stats.print_stats(self.report_lines)
+        out.write("\nCallers of the 15 functions with the most internal time:\n")
+        stats.sort_stats('tottime').print_callers(15)
+        return out.getvalue()
+
+    def prune(self):
+        """Delete the oldest captures beyond `keep`"""
+        for entry in self.list()[self.keep:]:
+            for suffix in ('.json', '.prof', '.txt'):
+                try:
+                    os.remove(os.path.join(self.directory, entry['id'] + suffix))
+                except FileNotFoundError:
+                    pass  # Another worker pruned it first
+
+    def list(self):
+        """Stored captures, newest first (ids start with a microsecond timestamp)"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Pruned or half-written by another worker
+        return sorted(entries, key=lambda entry: entry['id'], reverse=True)
+
+    def path_for(self, profile_id, kind):
+        """Absolute path of a stored capture file, or None for unknown ids"""
+        if kind not in ('prof', 'txt') or not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f'{profile_id}.{kind}')
+        return path if os.path.isfile(path) else None
@@ -9,8 +9,19 @@ This script will:
 5. Create nurse_mother_assignments table
 6. Create test_results table
 7. Create test_scores table
+8. Add keyset pagination indexes (migrate_add_pagination_indexes.py)
+9. Add typed vitals columns to mother_health_logs (migrate_add_typed_vitals.py)
+10. Partition mother_health_logs by month, after the typed vitals (migrate_partition_health_logs.py)
+11. Add appointment durations and overlap constraints (migrate_add_appointment_durations.py)
+12. Add token_version to users and the refresh_tokens table (migrate_add_token_version.py)
+13. Lowercase emails and add the lower(email) unique index (migrate_add_email_lower_index.py)
+14. Add data_version to users (migrate_add_data_version.py)
+
+Steps 8 onwards live in their own migrate_*.py scripts and run after the
+steps above, in dependency order.
 """
 
+import importlib
 import os
 import sys
 from pathlib import Path
@@ -50,6 +61,17 @@ engine = create_engine(
     connect_args=db_config['connect_args']
 )
 
+# Migrations kept in their own scripts: (module, description), in dependency order
+SCRIPT_MIGRATIONS = [
+    ('migrate_add_pagination_indexes', 'Adding keyset pagination indexes'),
+    ('migrate_add_typed_vitals', 'Adding typed vitals columns'),
+    ('migrate_partition_health_logs', 'Partitioning mother_health_logs by month'),
+    ('migrate_add_appointment_durations', 'Adding appointment durations and overlap constraints'),
+    ('migrate_add_token_version', 'Adding token_version and refresh_tokens'),
+    ('migrate_add_email_lower_index', 'Adding the lower(email) unique index'),
+    ('migrate_add_data_version', 'Adding data_version'),
+]
+
 def run_migrations():
     """Run all database migrations in the correct order"""
     try:
@@ -231,8 +253,19 @@ def run_migrations():
         print(f"\n❌ Error during migration: {str(e)}")
         sys.exit(1)
 
+def run_script_migrations():
+    """Run the migrate_*.py scripts against the same database as the steps above"""
+    # The scripts read these when imported
+    os.environ['DATABASE_URL'] = DATABASE_URL
+    os.environ['DB_SSLMODE'] = db_config['connect_args']['sslmode']
+    for step, (module_name, description) in enumerate(SCRIPT_MIGRATIONS, start=8):
+        print(f"\n{step}. {description} ({module_name}.py)...")
+        # Each script exits non-zero on failure, which stops the remaining steps
+        importlib.import_module(module_name).run_migration()
+
 if __name__ == "__main__":
     print("🚀 Starting comprehensive database migration...")
     print("This will ensure all required columns and tables exist.")
     print("=" * 60)
     run_migrations()
+    run_script_migrations()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Seed a database with synthetic SymbiHelp data for benchmarking.
+
+Generates:
+- mothers, nurses and admins
+- nurse-mother assignments
+- months of MotherHealthLog vitals per mother
+- TestResult and TestScore history
+- appointments
+
+Vitals are drawn from "Maternal Health Risk Data Set.csv". Each mother starts
+from a real row of her risk class and drifts around it with noise scaled to
+that class's spread, clamped to the range seen in the dataset.
+
+Every mother's rows come from a generator seeded with (--seed, mother index),
+so a given --seed and --end-date produce the same data whatever --workers is.
+Only the serial ids can differ between runs. Users are inserted first; child
+rows are then generated and written by a process pool, --chunk-size mothers
+per task. PostgreSQL is loaded with COPY and other databases with executemany.
+
+All synthetic users share one password (bcrypt-hashed once) and an email
+domain, so load tests can log in as any of them and --reset can remove them:
+
+    python3 seed_synthetic_data.py --mothers 50000 --months 12 --workers 8
+    python3 seed_synthetic_data.py --mothers 2000 --seed 7 --reset
+    DATABASE_URL=sqlite:///bench.db python3 seed_synthetic_data.py --mothers 500
+
+Run create_tables.py (or start the app once) beforehand so the tables exist.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+from password_hashing import hash_password
+
+# Load environment variables
+load_dotenv()
+
+# Database configuration
+DATABASE_URL = os.getenv('DATABASE_URL')
+if not DATABASE_URL:
+    print("Error: DATABASE_URL environment variable not set")
+    sys.exit(1)
+
+# Replace postgres:// with postgresql:// for newer SQLAlchemy versions
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+DATASET_PATH = Path(__file__).parent / 'Maternal Health Risk Data Set.csv'
+VITALS = ['Age', 'SystolicBP', 'DiastolicBP', 'BS', 'BodyTemp', 'HeartRate']
+VITALS_COLUMNS = ['age', 'systolic_bp', 'diastolic_bp', 'blood_sugar', 'body_temp', 'heart_rate']
+# Day-to-day variation as a fraction of the class's standard deviation; age does not vary
+NOISE_SCALE = [0.0, 0.25, 0.25, 0.3, 0.15, 0.3]
+RISK_LEVELS = {'low risk': 'Low Risk', 'mid risk': 'High/Mid Risk', 'high risk': 'High/Mid Risk'}
+QUIZ_TOPICS = ['Ball Birthing', 'Shiatsu', 'Yoga Techniques', 'Lamaze Breathing']
+FIRST_NAMES = ['Amara', 'Priya', 'Grace', 'Fatima', 'Sofia', 'Mei', 'Aisha', 'Elena', 'Zara', 'Nadia',
+               'Lucia', 'Hana', 'Ruth', 'Leila', 'Chloe', 'Ama', 'Ines', 'Yara', 'Maya', 'Noor']
+LAST_NAMES = ['Okafor', 'Sharma', 'Mensah', 'Khan', 'Garcia', 'Chen', 'Bello', 'Rossi', 'Haddad', 'Silva',
+              'Nguyen', 'Kowalski', 'Adeyemi', 'Tanaka', 'Ali', 'Osei', 'Lopez', 'Novak', 'Das', 'Moreau']
+
+TABLE_COLUMNS = {
+    'users': ['email', 'password', 'full_name', 'role', 'due_date', 'birthdate', 'created_at', 'is_admin',
+              'share_consent', 'token_version', 'data_version'],
+    'nurse_mother_assignments': ['nurse_id', 'mother_id', 'assigned_at'],
+    'mother_health_logs': ['user_id', 'timestamp', 'data', 'consent_shared', *VITALS_COLUMNS],
+    'test_results': ['user_id', 'score', 'test_date', 'risk_level', 'details'],
+    'test_scores': ['user_id', 'score', 'max_score', 'test_date', 'topics'],
+    'appointments': ['mother_id', 'nurse_id', 'date_time', 'duration_minutes', 'end_time', 'status', 'notes'],
+}
+CHILD_TABLES = ['nurse_mother_assignments', 'mother_health_logs', 'test_results', 'test_scores', 'appointments']
+
+def make_engine():
+    connect_args = {}
+    if not DATABASE_URL.startswith('sqlite'):
+        connect_args['sslmode'] = os.getenv('DB_SSLMODE', 'require')
+    return create_engine(DATABASE_URL, connect_args=connect_args)
+
+def load_distributions():
+    """Dataset rows, per-vital std, min and max for each risk class, plus class weights"""
+    classes = {}
+    with open(DATASET_PATH, encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            classes.setdefault(row['RiskLevel'], []).append([float(row[v]) for v in VITALS])
+    distributions = {}
+    for label, rows in sorted(classes.items()):
+        columns = list(zip(*rows))
+        stds = []
+        for values in columns:
+            mean = sum(values) / len(values)
+            stds.append((sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5)
+        distributions[label] = {
+            'rows': rows,
+            'std': stds,
+            'min': [min(values) for values in columns],
+            'max': [max(values) for values in columns],
+            'weight': len(rows)
+        }
+    return distributions
+
+def mother_profile(args, index):
+    """(profile, rng) for one mother; both depend only on (seed, index)"""
+    m = random.Random(f'{args.seed}:mother:{index}')
+    distributions = args.distributions
+    labels = list(distributions)
+    label = m.choices(labels, [distributions[label]['weight'] for label in labels])[0]
+    baseline = m.choice(distributions[label]['rows'])
+
+    window_days = args.months * 30
+    # Most mothers were present for the whole window; the rest joined part-way through
+    offset = 0 if m.random() < 0.6 else m.randint(0, max(0, window_days - 14))
+    window_start = datetime.combine(args.end_date - timedelta(days=window_days), datetime.min.time())
+    joined = window_start + timedelta(days=offset, hours=m.randint(7, 20), minutes=m.randint(0, 59))
+
+    profile = {
+        'label': label,
+        'baseline': baseline,
+        'joined': joined,
+        'due_date': (joined + timedelta(days=m.randint(60, 280))).date(),
+        'birthdate': date(joined.year - int(baseline[0]), m.randint(1, 12), m.randint(1, 28)),
+        'share_consent': m.random() < args.consent_rate,
+        'assigned': m.random() < args.assigned_rate
+    }
+    return profile, m
+
+def build_users(args):
+    """Row dicts for every synthetic user, in a fixed order"""
+    rng = random.Random(f'{args.seed}:users')
+    end = args.end_date
+    rows = []
+
+    def add(role, index, created_at, due_date=None, birthdate=None, share_consent=False):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        rows.append({
+            'email': f"{role}{index:07d}@{args.email_domain}",
+            'password': args.password_hash,
+            'full_name': name,
+            'role': role,
+            'due_date': due_date,
+            'birthdate': birthdate,
+            'created_at': created_at,
+            'is_admin': role == 'admin',
+            'share_consent': share_consent,
+            'token_version': 0,
+            'data_version': 0
+        })
+
+    window_start = datetime.combine(end - timedelta(days=args.months * 30), datetime.min.time())
+    for index in range(args.admins):
+        add('admin', index, window_start - timedelta(days=rng.randint(30, 365)))
+    for index in range(args.nurses):
+        add('nurse', index, window_start - timedelta(days=rng.randint(1, 365)))
+
+    for index in range(args.mothers):
+        profile, _ = mother_profile(args, index)
+        add('mother', index, profile['joined'], due_date=profile['due_date'], birthdate=profile['birthdate'],
+            share_consent=profile['share_consent'])
+    return rows
+
+# Appointments use 30-minute slots, 08:00-18:00, five days a week
+SLOTS_PER_DAY = 20
+SLOTS_PER_WEEK = SLOTS_PER_DAY * 5
+
+def generate_mother(args, index, mother_id, nurse_ids):
+    """Child rows for one mother, keyed by table name; depends only on (seed, index)"""
+    profile, m = mother_profile(args, index)
+    stats = args.distributions[profile['label']]
+    baseline, joined, share_consent = profile['baseline'], profile['joined'], profile['share_consent']
+
+    rows = {table: [] for table in CHILD_TABLES}
+    nurse_id = None
+    if nurse_ids and profile['assigned']:
+        # Round-robin, so `index // len(nurse_ids)` is this mother's unique rank among the nurse's mothers
+        nurse_id = nurse_ids[index % len(nurse_ids)]
+        rows['nurse_mother_assignments'].append({
+            'nurse_id': nurse_id, 'mother_id': mother_id,
+            'assigned_at': joined + timedelta(days=m.randint(0, 7))
+        })
+
+    # Vitals: baseline plus a slow random walk and daily noise, clamped to the dataset's range
+    drift = [0.0] * len(VITALS)
+    end = datetime.combine(args.end_date, datetime.min.time())
+    day = joined
+    log_probability = min(1.0, args.logs_per_week / 7)
+    last_vitals = baseline
+    while day < end:
+        if m.random() < log_probability:
+            vitals = []
+            for i, value in enumerate(baseline):
+                drift[i] = drift[i] * 0.95 + m.gauss(0, stats['std'][i] * NOISE_SCALE[i] * 0.3)
+                noisy = value + drift[i] + m.gauss(0, stats['std'][i] * NOISE_SCALE[i])
+                vitals.append(round(min(stats['max'][i], max(stats['min'][i], noisy)), 1))
+            vitals[0] = baseline[0]
+            last_vitals = vitals
+            data = dict(zip(VITALS, vitals))
+            rows['mother_health_logs'].append({
+                'user_id': mother_id,
+                'timestamp': day.replace(hour=m.randint(6, 22), minute=m.randint(0, 59), second=m.randint(0, 59)),
+                'data': json.dumps(data),
+                'consent_shared': share_consent,
+                **dict(zip(VITALS_COLUMNS, vitals))
+            })
+        day += timedelta(days=1)
+
+    risk_level = RISK_LEVELS.get(profile['label'], 'High/Mid Risk')
+    span_days = max(1, (end - joined).days)
+    for _ in range(args.test_results):
+        taken = joined + timedelta(days=m.uniform(0, span_days))
+        base_score = 20 if risk_level == 'Low Risk' else 75
+        rows['test_results'].append({
+            'user_id': mother_id,
+            'score': round(min(100.0, max(0.0, m.gauss(base_score, 12))), 2),
+            'test_date': taken,
+            'risk_level': risk_level,
+            'details': json.dumps(dict(zip(
+                ['age', 'systolic_bp', 'diastolic_bp', 'blood_sugar', 'body_temp', 'heart_rate'], last_vitals)))
+        })
+
+    for _ in range(args.test_scores):
+        topic_scores = [m.randint(0, 4) for _ in QUIZ_TOPICS]
+        score = min(15, sum(topic_scores))
+        rows['test_scores'].append({
+            'user_id': mother_id,
+            'score': score,
+            'max_score': 15,
+            'test_date': joined + timedelta(days=m.uniform(0, span_days)),
+            'topics': json.dumps(dict(zip(QUIZ_TOPICS, topic_scores)))
+        })
+
+    if nurse_id is not None:
+        # Slot number (n-th appointment, rank) is unique per nurse and per mother, so the
+        # no-overlap exclusion constraints always hold
+        rank = index // len(nurse_ids)
+        ranks_per_nurse = -(-args.mothers // len(nurse_ids))
+        first_day = args.end_date - timedelta(days=14)
+        for n in range(args.appointments):
+            slot = n * ranks_per_nurse + rank
+            week, within_week = divmod(slot, SLOTS_PER_WEEK)
+            day, slot_of_day = divmod(within_week, SLOTS_PER_DAY)
+            starts_at = datetime.combine(first_day + timedelta(days=7 * week + day), datetime.min.time()) \
+                + timedelta(hours=8, minutes=30 * slot_of_day)
+            status = 'confirmed' if starts_at.date() < args.end_date else m.choice(['pending', 'confirmed'])
+            rows['appointments'].append({
+                'mother_id': mother_id,
+                'nurse_id': nurse_id,
+                'date_time': starts_at,
+                'duration_minutes': 30,
+                'end_time': starts_at + timedelta(minutes=30),
+                'status': status,
+                'notes': None
+            })
+    return rows
+
+def copy_rows(connection, table, rows):
+    """Bulk load `rows` with COPY on PostgreSQL, executemany elsewhere"""
+    if not rows:
+        return
+    columns = TABLE_COLUMNS[table]
+    raw = connection.connection.dbapi_connection
+    if connection.dialect.name == 'postgresql' and hasattr(raw.cursor(), 'copy_expert'):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(row[column] for column in columns)
+        buffer.seek(0)
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return
+    placeholders = ', '.join(f':{column}' for column in columns)
+    connection.execute(text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"), rows)
+
+worker_engine = None
+
+def init_worker():
+    global worker_engine
+    worker_engine = make_engine()
+
+def seed_chunk(args, mothers):
+    """Generate and insert child rows for [(index, mother_id), ...]"""
+    rows = {table: [] for table in CHILD_TABLES}
+    for index, mother_id in mothers:
+        for table, table_rows in generate_mother(args, index, mother_id, args.nurse_ids).items():
+            rows[table].extend(table_rows)
+    with worker_engine.begin() as connection:
+        for table in CHILD_TABLES:
+            copy_rows(connection, table, rows[table])
+    return {table: len(table_rows) for table, table_rows in rows.items()}
+
+def reset(connection, email_domain):
+    """Delete every user in `email_domain` and all rows that reference them"""
+    synthetic = "SELECT id FROM users WHERE email LIKE :pattern"
+    params = {'pattern': f'%@{email_domain}'}
+    for table, columns in [('appointments', ['mother_id', 'nurse_id']),
+                           ('nurse_mother_assignments', ['mother_id', 'nurse_id']),
+                           ('mother_health_logs', ['user_id']),
+                           ('test_results', ['user_id']),
+                           ('test_scores', ['user_id'])]:
+        condition = ' OR '.join(f"{column} IN ({synthetic})" for column in columns)
+        result = connection.execute(text(f"DELETE FROM {table} WHERE {condition}"), params)
+        print(f"  removed {result.rowcount} rows from {table}")
+    result = connection.execute(text("DELETE FROM users WHERE email LIKE :pattern"), params)
+    print(f"  removed {result.rowcount} synthetic users")
+
+def run_seed(args):
+    try:
+        engine = make_engine()
+        args.distributions = load_distributions()
+        start = time.monotonic()
+
+        with engine.begin() as connection:
+            print("Connected to database successfully")
+            existing = connection.execute(text("SELECT COUNT(*) FROM users WHERE email LIKE :pattern"),
+                                          {'pattern': f'%@{args.email_domain}'}).scalar()
+            if existing and not args.reset:
+                print(f"Error: {existing} users with @{args.email_domain} already exist; pass --reset to replace them")
+                sys.exit(1)
+            if existing:
+                print(f"Removing the previous synthetic data set (@{args.email_domain})...")
+                reset(connection, args.email_domain)
+
+        print(f"Hashing the shared password once (bcrypt, {args.rounds} rounds)...")
+        args.password_hash = hash_password(args.password, args.rounds)
+
+        users = build_users(args)
+        with engine.begin() as connection:
+            copy_rows(connection, 'users', users)
+            ids = dict(connection.execute(text("SELECT email, id FROM users WHERE email LIKE :pattern"),
+                                          {'pattern': f'%@{args.email_domain}'}).fetchall())
+        print(f"✓ Inserted {len(users)} users ({args.mothers} mothers, {args.nurses} nurses, {args.admins} admins)")
+
+        args.nurse_ids = [ids[f"nurse{index:07d}@{args.email_domain}"] for index in range(args.nurses)]
+        mothers = [(index, ids[f"mother{index:07d}@{args.email_domain}"]) for index in range(args.mothers)]
+        chunks = [mothers[i:i + args.chunk_size] for i in range(0, len(mothers), args.chunk_size)]
+
+        workers = args.workers
+        if DATABASE_URL.startswith('sqlite') and workers > 1:
+            print("SQLite allows one writer at a time; using a single worker")
+            workers = 1
+
+        totals = {table: 0 for table in CHILD_TABLES}
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+            for counts in executor.map(seed_chunk, [args] * len(chunks), chunks):
+                done += 1
+                for table, count in counts.items():
+                    totals[table] += count
+                elapsed = time.monotonic() - start
+                rows_written = sum(totals.values())
+                print(f"  {done}/{len(chunks)} chunks, {rows_written} rows, {rows_written / elapsed:.0f} rows/s")
+
+        if engine.dialect.name == 'postgresql':
+            with engine.connect() as connection:
+                connection.execution_options(isolation_level='AUTOCOMMIT').execute(
+                    text(f"ANALYZE {', '.join(['users', *CHILD_TABLES])}"))
+
+        for table, count in totals.items():
+            print(f"✓ {table}: {count} rows")
+        print(f"\nSeeding completed in {time.monotonic() - start:.1f}s. "
+              f"Log in as mother0000000@{args.email_domain} (or any nurse/admin) with the --password value.")
+
+    except Exception as e:
+        print(f"Error during seeding: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Seed synthetic SymbiHelp data')
+    parser.add_argument('--mothers', type=int, default=10000)
+    parser.add_argument('--nurses', type=int, help='Defaults to one nurse per 50 mothers')
+    parser.add_argument('--admins', type=int, default=3)
+    parser.add_argument('--months', type=int, default=6, help='Length of the health log history')
+    parser.add_argument('--logs-per-week', type=float, default=3)
+    parser.add_argument('--test-results', type=int, default=6, help='Risk predictions per mother')
+    parser.add_argument('--test-scores', type=int, default=4, help='Quiz scores per mother')
+    parser.add_argument('--appointments', type=int, default=4, help='Per assigned mother')
+    parser.add_argument('--consent-rate', type=float, default=0.7)
+    parser.add_argument('--assigned-rate', type=float, default=0.8)
+    parser.add_argument('--end-date', type=date.fromisoformat, default=date.today(),
+                        help='Last day of history (YYYY-MM-DD); fix it for identical re-runs')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--chunk-size', type=int, default=250, help='Mothers per worker task')
+    parser.add_argument('--password', default='synthetic-password')
+    parser.add_argument('--rounds', type=int, default=int(os.getenv('BCRYPT_ROUNDS', 12)))
+    parser.add_argument('--email-domain', default='synthetic.symbihelp.local')
+    parser.add_argument('--reset', action='store_true', help='Replace a previous synthetic data set')
+    args = parser.parse_args()
+    if args.nurses is None:
+        args.nurses = max(1, args.mothers // 50)
+
+    print(f"Seeding synthetic data (seed {args.seed}, history ending {args.end_date})...")
+    run_seed(args)
@@ -0,0 +1,207 @@
+"""
+Non-blocking, structured application logging.
+
+Request threads never write to the console themselves: the root logger has a single
+QueueHandler that snapshots each record (request id, trace id, route, user)
+and puts it on a bounded in-memory queue. A QueueListener thread formats the
+records and writes them out, one JSON object per line by default:
+
+    {"ts": "2026-10-19T08:15:02.113Z", "level": "INFO", "logger": "main",
+     "message": "Health log created for user_id 42", "request_id": "9f2c...",
+     "trace_id": "4bf9...", "method": "POST", "route": "/update-health-log", ...}
+
+Keyword fields passed with `extra=` become top-level keys. Log with lazy
+%-style arguments (logger.info("... %s", value)) so records dropped by level
+or sampling are never formatted.
+
+Every request gets an id from a valid incoming X-Request-ID header or a new
+one, returned in the X-Request-ID response header.
+
+High-volume success logs pass extra=SAMPLED. They are kept for
+LOG_SUCCESS_SAMPLE_RATE of requests, chosen by request id so a kept request
+keeps all of its lines. Warnings and errors are never sampled. When the queue
+is full (LOG_QUEUE_SIZE) new records are dropped and counted rather than
+blocking the request; a warning with the count follows once there is room.
+
+    LOG_LEVEL=INFO  LOG_FORMAT=json|text  LOG_SUCCESS_SAMPLE_RATE=1.0  LOG_QUEUE_SIZE=10000
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+SAMPLED = {'sampled': True}
+
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'taskName', 'sampled', 'request_id', 'trace_id', 'method', 'route', 'user_id'
+}
+
+def redact_email(email):
+    """'jane.doe@example.com' -> 'j***@example.com' for log lines"""
+    if not isinstance(email, str) or '@' not in email:
+        return '***'
+    local, _, domain = email.rpartition('@')
+    return f"{local[:1]}***@{domain}"
+
+class RequestContextFilter(logging.Filter):
+    """Copy request details onto the record while still on the request's thread"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.trace_id = g.get('trace_id')
+            record.method = request.method
+            record.route = request.url_rule.rule if request.url_rule else request.path
+            record.user_id = getattr(request, 'user_id', None)
+        else:
+            record.request_id = record.trace_id = record.method = record.route = record.user_id = None
+        return True
+
+class SuccessSampler(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.threshold = int(max(0.0, min(1.0, rate)) * 10000)
+
+    def filter(self, record):
+        if self.threshold >= 10000 or record.levelno >= logging.WARNING or not getattr(record, 'sampled', False):
+            return True
+        key = record.request_id or f'{record.thread}:{record.created}'
+        return zlib.crc32(key.encode('utf-8')) % 10000 < self.threshold
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds')
+                  .replace('+00:00', 'Z'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key in ('request_id', 'trace_id', 'method', 'route', 'user_id'):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        entry['pid'] = record.process
+        entry['thread'] = record.threadName
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str)
+
+class NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self._dropped_lock = threading.Lock()
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolve the message and traceback here; the record's args may change after this thread moves on
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        if self.dropped:
+            with self._dropped_lock:
+                dropped, self.dropped = self.dropped, 0
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': f'Log queue full: dropped {dropped} records', 'request_id': None, 'trace_id': None,
+                    'method': None, 'route': None, 'user_id': None
+                }))
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += dropped
+
+class LogPipeline:
+    def __init__(self, level='INFO', fmt='json', sample_rate=1.0, queue_size=10000, stream=None):
+        self.queue_size = queue_size
+        self.output = logging.StreamHandler(stream or sys.stderr)
+        self.output.setFormatter(JSONFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+        self.handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+        self.handler.addFilter(RequestContextFilter())
+        self.handler.addFilter(SuccessSampler(sample_rate))
+        self.level = level
+        self.listener = None
+
+    def start(self):
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_after_fork(self):
+        # The parent's listener thread does not exist in a forked child, and its queue lock may be held
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.handler._dropped_lock = threading.Lock()
+        self.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()  # Drains whatever is still queued
+            self.listener = None
+
+_pipeline = None
+
+def configure_logging(level=None, fmt=None, sample_rate=None, queue_size=None):
+    """Route the root logger through the queue; settings default to the LOG_* variables"""
+    global _pipeline
+    if _pipeline is not None:
+        return _pipeline
+    _pipeline = LogPipeline(
+        level=(level or os.getenv('LOG_LEVEL', 'INFO')).upper(),
+        fmt=fmt or os.getenv('LOG_FORMAT', 'json'),
+        sample_rate=sample_rate if sample_rate is not None else float(os.getenv('LOG_SUCCESS_SAMPLE_RATE', 1.0)),
+        queue_size=queue_size or int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    )
+    root = logging.getLogger()
+    root.handlers = [_pipeline.handler]
+    root.setLevel(_pipeline.level)
+    _pipeline.start()
+    os.register_at_fork(after_in_child=_pipeline.restart_after_fork)
+    atexit.register(_pipeline.stop)
+    return _pipeline
+
+def assign_request_id():
+    incoming = request.headers.get('X-Request-ID', '')
+    g.request_id = incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+
+def add_request_id_header(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers['X-Request-ID'] = request_id
+    return response
+
+def init_app(app):
+    """Register the request id hooks; call first so every other hook's logs carry the id"""
+    app.before_request(assign_request_id)
+    app.after_request(add_request_id_header)
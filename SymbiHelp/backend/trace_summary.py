@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Summarize span files written by tracing.py: where each endpoint's time goes.
+
+For every trace the critical path is walked from the root span: starting at
+the parent's end, take the child that finished last, then the child that
+finished before that one started, and so on; time not covered by a child on
+the path is the parent's own ('self') time. The per-endpoint table averages
+how much of the request each span name accounts for on that path.
+
+    python3 trace_summary.py /tmp/symbihelp-traces
+    python3 trace_summary.py spans-*.ndjson --endpoint "POST /predict" --top 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+from collections import defaultdict
+
+def span_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, 'spans-*.ndjson*')))
+        else:
+            yield path
+
+def load_traces(paths):
+    traces = defaultdict(list)
+    for path in span_files(paths):
+        with open(path) as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue  # Truncated last line of a file still being written
+                if span.get('endTimeUnixNano') is not None:
+                    traces[span['traceId']].append(span)
+    return traces
+
+def critical_path(span, children, path):
+    """Append (name, nanoseconds) segments of `span`'s critical path to `path`"""
+    cursor = span['endTimeUnixNano']
+    own = 0
+    for child in sorted(children.get(span['spanId'], ()), key=lambda s: s['endTimeUnixNano'], reverse=True):
+        if child['endTimeUnixNano'] > cursor:
+            continue  # Overlaps a later child already on the path
+        own += cursor - child['endTimeUnixNano']
+        critical_path(child, children, path)
+        cursor = max(child['startTimeUnixNano'], span['startTimeUnixNano'])
+    own += cursor - span['startTimeUnixNano']
+    path.append((span['name'] + ' (self)' if children.get(span['spanId']) else span['name'], own))
+    return path
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+def summarize(traces):
+    """{endpoint: {'durations': [ms], 'path': {span name: [ms per request]}}}"""
+    endpoints = defaultdict(lambda: {'durations': [], 'path': defaultdict(list)})
+    for spans in traces.values():
+        ids = {span['spanId'] for span in spans}
+        roots = [span for span in spans if span.get('parentSpanId') not in ids]
+        if len(roots) != 1:
+            continue  # Root not exported yet, or spans from several services mixed together
+        root = roots[0]
+        children = defaultdict(list)
+        for span in spans:
+            if span is not root:
+                children[span['parentSpanId']].append(span)
+
+        summary = endpoints[root['name']]
+        summary['durations'].append((root['endTimeUnixNano'] - root['startTimeUnixNano']) / 1e6)
+        totals = defaultdict(int)
+        for name, ns in critical_path(root, children, []):
+            totals[name] += ns
+        for name, ns in totals.items():
+            summary['path'][name].append(ns / 1e6)
+    return endpoints
+
+def main():
+    parser = argparse.ArgumentParser(description='Critical-path summary of traced requests')
+    parser.add_argument('paths', nargs='+', help='Span files or TRACE_DIR directories')
+    parser.add_argument('--endpoint', help="Only this root span, e.g. 'POST /predict'")
+    parser.add_argument('--top', type=int, default=6, help='Span names to show per endpoint')
+    args = parser.parse_args()
+
+    endpoints = summarize(load_traces(args.paths))
+    if not endpoints:
+        print("No complete traces found")
+        return
+
+    for endpoint, summary in sorted(endpoints.items(), key=lambda item: -sum(item[1]['durations'])):
+        if args.endpoint and endpoint != args.endpoint:
+            continue
+        durations = summary['durations']
+        n = len(durations)
+        print(f"\n{endpoint}  n={n}  p50={percentile(durations, 50):.1f} ms  "
+              f"p95={percentile(durations, 95):.1f} ms  mean={statistics.mean(durations):.1f} ms")
+        mean_total = statistics.mean(durations)
+        # Average over every request, counting 0 where a span was absent from the path
+        shares = sorted(((sum(values) / n, name) for name, values in summary['path'].items()), reverse=True)
+        for mean_ms, name in shares[:args.top]:
+            share = mean_ms / mean_total * 100 if mean_total else 0
+            print(f"    {name:<40}{mean_ms:>10.2f} ms {share:>6.1f}%")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Lightweight in-process tracing: nested spans per request, exported as NDJSON.
+
+Each request gets a root span ('METHOD /rule') and a trace id, returned in the
+X-Trace-Id response header (a W3C `traceparent` request header is honoured).
+Code inside the request opens child spans with the module-level helpers
+
+    with span('inference', model='logistic_regression'):
+        ...
+
+or records an already-timed operation with record_span(). The current span is
+a contextvar, so nesting follows the code and survives the thread hops in
+asgi.py, which runs every step of a request in one copied context.
+
+Every request gets a trace id, but only `sample_rate` of them (1% by default)
+record spans. Finished spans go onto a bounded in-memory queue; a listener
+thread serializes them, one JSON object per line with OTLP field names, to
+<directory>/spans-<pid>.ndjson, so request threads never touch the file. When
+the queue is full (`queue_size`) spans are dropped and counted rather than
+blocking the request. Files rotate at `max_bytes` with `backups` kept per
+process. Summarize them with trace_summary.py.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from flask import g, request
+
+TRACEPARENT_PATTERN = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+current_span = contextvars.ContextVar('current_span', default=None)
+
+logger = logging.getLogger(__name__)
+
+class Span:
+    __slots__ = ('tracer', 'trace_id', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'status')
+
+    def __init__(self, tracer, trace_id, parent_id, name, attributes=None, start_ns=None):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = f'{random.getrandbits(64):016x}'
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.status = 'OK'
+
+    def to_dict(self, service):
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'attributes': self.attributes,
+            'status': self.status,
+            'service': service,
+        }
+
+class SpanListener(QueueListener):
+    """Serializes finished spans on the listener thread instead of the request's"""
+
+    def __init__(self, span_queue, handler, service):
+        super().__init__(span_queue, handler)
+        self.service = service
+
+    def prepare(self, finished):
+        return logging.makeLogRecord({
+            'msg': json.dumps(finished.to_dict(self.service), default=str),
+            'levelno': logging.INFO, 'levelname': 'INFO'
+        })
+
+class Tracer:
+    def __init__(self, directory, sample_rate=0.01, service='symbihelp-api', max_bytes=50 * 1024 * 1024,
+                 backups=5, queue_size=10000, enabled=True):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.service = service
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._queue = None
+        self._listener = None
+        self._listener_pid = None
+        self._lock = threading.Lock()
+        if enabled:
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+            atexit.register(self.stop)
+
+    def start_exporter(self):
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            # One file per process: RotatingFileHandler is not safe across processes
+            os.makedirs(self.directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                os.path.join(self.directory, f'spans-{os.getpid()}.ndjson'),
+                maxBytes=self.max_bytes, backupCount=self.backups
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._queue = queue.Queue(self.queue_size)
+            self._listener = SpanListener(self._queue, handler, self.service)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def _reset_after_fork(self):
+        # The parent's listener thread does not exist in a forked child, and its locks may be held;
+        # the child starts its own listener and file on its first span
+        self._lock = threading.Lock()
+        self._queue = self._listener = self._listener_pid = None
+        self.dropped = 0
+
+    def stop(self):
+        if self._listener is not None and self._listener_pid == os.getpid():
+            try:
+                self._listener.stop()  # Drains whatever is still queued
+            except queue.Full:
+                pass  # No room for the stop marker; the daemon listener thread ends with the process
+            self._listener = None
+            self._listener_pid = None
+
+    def export(self, finished):
+        if self._listener_pid != os.getpid():
+            self.start_exporter()
+        try:
+            self._queue.put_nowait(finished)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        if self.dropped:
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            logger.warning("Span queue full: dropped %d spans", dropped)
+
+    def init_app(self, app):
+        app.before_request(self.start_request)
+        app.after_request(self.add_trace_header)
+        app.teardown_request(self.finish_request)
+
+    def start_request(self):
+        if not self.enabled:
+            return
+        trace_id, parent_id = None, None
+        match = TRACEPARENT_PATTERN.match(request.headers.get('traceparent', ''))
+        if match:
+            trace_id, parent_id = match.groups()
+        g.trace_id = trace_id or f'{random.getrandbits(128):032x}'
+        if random.random() >= self.sample_rate:
+            return
+        rule = request.url_rule.rule if request.url_rule else 'unmatched'
+        root = Span(self, g.trace_id, parent_id, f'{request.method} {rule}',
+                    {'http.method': request.method, 'http.route': rule, 'http.target': request.path})
+        g._trace_root = (root, current_span.set(root))
+
+    def add_trace_header(self, response):
+        trace_id = g.get('trace_id')
+        if trace_id:
+            response.headers['X-Trace-Id'] = trace_id
+            started = g.get('_trace_root')
+            if started:
+                started[0].attributes['http.status_code'] = response.status_code
+        return response
+
+    def finish_request(self, error=None):
+        started = g.pop('_trace_root', None)
+        if started is None:
+            return
+        root, token = started
+        if error is not None:
+            root.status = 'ERROR'
+            root.attributes['error'] = repr(error)
+        root.end_ns = time.time_ns()
+        # Worker threads are reused across requests, so the contextvar must not outlive this one
+        current_span.reset(token)
+        self.export(root)
+
+@contextmanager
+def span(name, **attributes):
+    """Time the block as a child of the current span (a no-op outside a sampled request)"""
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.tracer, parent.trace_id, parent.span_id, name, attributes)
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.status = 'ERROR'
+        child.attributes['error'] = repr(e)
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        current_span.reset(token)
+        parent.tracer.export(child)
+
+def record_span(name, start_ns, end_ns, **attributes):
+    """Export a finished child of the current span for an operation timed elsewhere"""
+    parent = current_span.get()
+    if parent is None:
+        return
+    child = Span(parent.tracer, parent.trace_id, parent.span_id, name, attributes, start_ns=start_ns)
+    child.end_ns = end_ns
+    parent.tracer.export(child)
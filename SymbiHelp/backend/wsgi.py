@@ -0,0 +1,11 @@
+"""
+WSGI entry point: builds the app from the environment (see config.py).
+
+    gunicorn wsgi:app
+
+asgi.py serves the same app instance under uvicorn.
+"""
+
+from main import create_app
+
+app = create_app()
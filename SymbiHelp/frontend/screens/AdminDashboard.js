@@ -3,8 +3,8 @@ import { View, Text, StyleSheet, SafeAreaView, ActivityIndicator, StatusBar, Scr
 import { Ionicons } from '@expo/vector-icons';
 import { useTheme } from '../utils/ThemeContext';
 import { PieChart } from 'react-native-chart-kit';
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import { API_URL } from '../utils/config';
+import { authFetch } from '../utils/authFetch';
 import { useAuth } from '../utils/AuthContext';
 import { LinearGradient } from 'expo-linear-gradient';
 
@@ -29,10 +29,9 @@ const AdminDashboard = () => {
     try {
       setError(null);
 
-      const response = await fetch(`${API_URL}/admin/stats?period=${timePeriod}`, {
+      const response = await authFetch(`${API_URL}/admin/stats?period=${timePeriod}`, {
         method: 'GET',
         headers: {
-          'Authorization': `Bearer ${userInfo.token}`,
           'Content-Type': 'application/json'
         }
       });
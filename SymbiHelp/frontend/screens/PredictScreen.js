@@ -12,8 +12,8 @@ import {
 } from 'react-native';
 import { Ionicons } from '@expo/vector-icons';
 import Svg, { Circle, Path } from 'react-native-svg';
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import { API_URL } from '../utils/config';
+import { authFetch } from '../utils/authFetch';
 
 // Theme colors
 const themeColors = {
@@ -143,28 +143,11 @@ export default function PredictScreen({ navigation }) {
 
     setLoading(true);
     try {
-      // Get the user info from AsyncStorage
-      const userInfoString = await AsyncStorage.getItem('userInfo');
-      if (!userInfoString) {
-        Alert.alert('Error', 'You need to be logged in to use this feature');
-        setLoading(false);
-        return;
-      }
-      
-      const userInfo = JSON.parse(userInfoString);
-      const token = userInfo.token;
-      
-      if (!token) {
-        Alert.alert('Error', 'Authentication token is missing. Please log in again.');
-        setLoading(false);
-        return;
-      }
-      
-      const response = await fetch(`${API_URL}/predict`, {
+      // authFetch adds the stored token and refreshes it once if it has expired
+      const response = await authFetch(`${API_URL}/predict`, {
         method: 'POST',
         headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${token}`
+          'Content-Type': 'application/json'
         },
         body: JSON.stringify({
           ...formData,
@@ -210,6 +193,10 @@ export default function PredictScreen({ navigation }) {
       }
     } catch (error) {
       console.error('Prediction error:', error);
+      if (error.message === 'No authentication token found') {
+        Alert.alert('Error', 'You need to be logged in to use this feature');
+        return;
+      }
       Alert.alert('Error', 'Failed to connect to prediction service. Please try again later.');
     } finally {
       setLoading(false);
@@ -10,7 +10,6 @@ import {
   SafeAreaView
 } from 'react-native';
 import { Ionicons } from '@expo/vector-icons';
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import { useAuth } from '../utils/AuthContext';
 import { API_URL } from '../utils/config';
 
@@ -31,28 +30,26 @@ export default function ProfileScreen({ navigation }) {
   const [userInfo, setUserInfo] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
-  const { signOut } = useAuth();
+  // The session from AuthContext stays current across token refreshes; AsyncStorage may lag behind it
+  const { userInfo: session, signOut } = useAuth();
 
   useEffect(() => {
     loadUserProfile();
-  }, []);
+  }, [session]);
 
   const loadUserProfile = async () => {
     try {
       setLoading(true);
-      const userInfoString = await AsyncStorage.getItem('userInfo');
-      
-      if (!userInfoString) {
+      if (!session) {
         setError('User information not found. Please log in again.');
         setLoading(false);
         return;
       }
       
-      const userData = JSON.parse(userInfoString);
-      setUserInfo(userData);
+      setUserInfo(session);
       
-      // Optionally fetch additional profile data from the server
-      // await fetchUserProfileFromServer(userData.token);
+      // Optionally fetch additional profile data from the server (use authFetch)
+      // await fetchUserProfileFromServer();
       
     } catch (error) {
       console.error('Error loading profile:', error);
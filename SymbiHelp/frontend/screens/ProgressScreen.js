@@ -9,7 +9,9 @@ import { useAuth } from '../utils/AuthContext';
 
 const ProgressScreen = ({ navigation }) => {
   const [history, setHistory] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const { theme, isDarkMode } = useTheme();
   const { userInfo } = useAuth();
@@ -26,9 +28,10 @@ const ProgressScreen = ({ navigation }) => {
     try {
       setError(null);
       console.log('[ProgressScreen] Calling getHistory...');
-      const loadedHistory = await getHistory();
+      const { history: loadedHistory, nextCursor: cursor } = await getHistory();
       console.log('[ProgressScreen] getHistory returned:', loadedHistory);
-      setHistory(loadedHistory.sort((a, b) => new Date(b.date) - new Date(a.date)));
+      setHistory(loadedHistory);
+      setNextCursor(cursor);
       console.log('[ProgressScreen] History state updated.');
     } catch (error) {
       console.error("[ProgressScreen] Error in loadHistory:", error);
@@ -44,6 +47,23 @@ const ProgressScreen = ({ navigation }) => {
     }
   }, [userInfo, navigation]);
 
+  // The backend returns newest first, so later pages append in order
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const { history: olderHistory, nextCursor: cursor } = await getHistory(nextCursor);
+      setHistory(current => [...current, ...olderHistory]);
+      setNextCursor(cursor);
+    } catch (error) {
+      console.error("[ProgressScreen] Error in loadMore:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [nextCursor, loadingMore]);
+
   useFocusEffect(
     useCallback(() => {
       console.log('[ProgressScreen] Screen focused. Running loadHistory.');
@@ -150,6 +170,9 @@ const ProgressScreen = ({ navigation }) => {
         keyExtractor={(item, index) => `${item.date}-${index}`}
         renderItem={renderHistoryItem}
         ListHeaderComponent={renderHeader}
+        onEndReached={loadMore}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={loadingMore ? <ActivityIndicator style={styles.footerLoader} color={theme.primary} /> : null}
         ListEmptyComponent={() => (
           <View style={styles.emptyContainer}>
             <Ionicons name="cloud-offline-outline" size={60} color={theme.secondaryText} />
@@ -181,6 +204,9 @@ const styles = StyleSheet.create({
     marginTop: 10,
     fontSize: 16,
   },
+  footerLoader: {
+    paddingVertical: 16,
+  },
   listContentContainer: {
     flexGrow: 1,
   },
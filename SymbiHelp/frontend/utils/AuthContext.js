@@ -1,6 +1,11 @@
-import React, { createContext, useState, useContext, useEffect } from 'react';
+import React, { createContext, useState, useContext, useEffect, useRef } from 'react';
+import { AppState } from 'react-native';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import { API_URL } from './config';
+import { refreshSessionOnce, setRefreshHandler } from './authFetch';
+
+// Refresh the access token this long before it expires
+const REFRESH_MARGIN_MS = 60 * 1000;
 
 // Create the auth context
 const AuthContext = createContext();
@@ -9,12 +14,89 @@ const AuthContext = createContext();
 export const AuthProvider = ({ children }) => {
   const [userInfo, setUserInfo] = useState(null);
   const [loading, setLoading] = useState(true);
+  const refreshTimer = useRef(null);
 
   // Load saved user info on app start
   useEffect(() => {
+    setRefreshHandler(refreshStoredSession);
     checkAuthToken();
+    // Timers do not run while the app is in the background; catch up when it returns
+    const subscription = AppState.addEventListener('change', (state) => {
+      if (state === 'active') {
+        refreshIfExpiring();
+      }
+    });
+    return () => {
+      clearTimeout(refreshTimer.current);
+      subscription.remove();
+      setRefreshHandler(null);
+    };
   }, []);
 
+  // Store the session and schedule the next access token refresh
+  const saveSession = async (nextUserInfo) => {
+    if (nextUserInfo.expires_in) {
+      nextUserInfo = { ...nextUserInfo, expires_at: Date.now() + nextUserInfo.expires_in * 1000 };
+    }
+    await AsyncStorage.setItem('userInfo', JSON.stringify(nextUserInfo));
+    setUserInfo(nextUserInfo);
+    clearTimeout(refreshTimer.current);
+    if (nextUserInfo.refresh_token && nextUserInfo.expires_in) {
+      const delay = Math.max(nextUserInfo.expires_in * 1000 - REFRESH_MARGIN_MS, 0);
+      refreshTimer.current = setTimeout(refreshSessionOnce, delay);
+    }
+  };
+
+  const refreshIfExpiring = async () => {
+    const jsonValue = await AsyncStorage.getItem('userInfo');
+    const stored = jsonValue ? JSON.parse(jsonValue) : null;
+    if (stored?.refresh_token && (!stored.expires_at || Date.now() > stored.expires_at - REFRESH_MARGIN_MS)) {
+      await refreshSessionOnce();
+    }
+  };
+
+  // Refresh whatever session is stored now; authFetch calls this (through refreshSessionOnce) on a 401
+  const refreshStoredSession = async () => {
+    const jsonValue = await AsyncStorage.getItem('userInfo');
+    const stored = jsonValue ? JSON.parse(jsonValue) : null;
+    if (!stored?.refresh_token) {
+      return false;
+    }
+    return refreshSession(stored);
+  };
+
+  // Exchange the refresh token for a new token pair; returns false when the session is gone
+  const refreshSession = async (currentUserInfo) => {
+    try {
+      const response = await fetch(`${API_URL}/refresh`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ refresh_token: currentUserInfo.refresh_token }),
+      });
+      const data = await response.json();
+
+      if (data.status === 'success') {
+        await saveSession({
+          ...currentUserInfo,
+          token: data.token,
+          refresh_token: data.refresh_token,
+          expires_in: data.expires_in,
+        });
+        return true;
+      }
+      if (response.status === 401) {
+        await AsyncStorage.removeItem('userInfo');
+        setUserInfo(null);
+      }
+      return false;
+    } catch (error) {
+      console.error('Error refreshing auth token:', error);
+      return false;
+    }
+  };
+
   const checkAuthToken = async () => {
     try {
       const jsonValue = await AsyncStorage.getItem('userInfo');
@@ -22,7 +104,15 @@ export const AuthProvider = ({ children }) => {
         const parsedValue = JSON.parse(jsonValue);
         // Verify if the token is still valid
         if (parsedValue.token) {
-          setUserInfo(parsedValue);
+          if (parsedValue.refresh_token) {
+            // The stored access token is short-lived, so get a fresh pair before the app uses it
+            const refreshed = await refreshSessionOnce();
+            if (!refreshed) {
+              setUserInfo(parsedValue);
+            }
+          } else {
+            setUserInfo(parsedValue);
+          }
         } else {
           // If token is invalid, clear storage
           await AsyncStorage.removeItem('userInfo');
@@ -59,11 +149,12 @@ export const AuthProvider = ({ children }) => {
       if (data.status === 'success') {
         const userInfo = {
           token: data.token,
+          refresh_token: data.refresh_token,
+          expires_in: data.expires_in,
           ...data.user,
         };
         console.log('[AuthContext] UserInfo to be set:', userInfo); // Log userInfo object
-        await AsyncStorage.setItem('userInfo', JSON.stringify(userInfo));
-        setUserInfo(userInfo);
+        await saveSession(userInfo);
         return { success: true };
       } else {
         return { 
@@ -100,10 +191,11 @@ export const AuthProvider = ({ children }) => {
       if (data.status === 'success') {
         const userInfo = {
           token: data.token,
+          refresh_token: data.refresh_token,
+          expires_in: data.expires_in,
           ...data.user,
         };
-        await AsyncStorage.setItem('userInfo', JSON.stringify(userInfo));
-        setUserInfo(userInfo);
+        await saveSession(userInfo);
         return { success: true };
       } else {
         return { 
@@ -123,6 +215,14 @@ export const AuthProvider = ({ children }) => {
   // Handle Sign Out
   const signOut = async () => {
     try {
+      clearTimeout(refreshTimer.current);
+      if (userInfo?.token) {
+        // Revoke the refresh token server-side; signing out locally must not depend on it
+        fetch(`${API_URL}/logout`, {
+          method: 'POST',
+          headers: { Authorization: `Bearer ${userInfo.token}` },
+        }).catch(() => {});
+      }
       await AsyncStorage.removeItem('userInfo');
       setUserInfo(null);
     } catch (error) {
@@ -1,24 +1,19 @@
 // src/utils/ProgressManager.js
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import { API_URL } from '../utils/config';
+import { authFetch } from './authFetch';
+
+// List endpoints return one page per request; follow next_cursor for more
+export const HISTORY_PAGE_SIZE = 20;
+
+const pageQuery = (cursor) =>
+  `?limit=${HISTORY_PAGE_SIZE}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`;
 
 export const saveTestResult = async (score, riskLevel, details) => {
   try {
-    const userInfoJson = await AsyncStorage.getItem('userInfo');
-    if (!userInfoJson) {
-      throw new Error('No authentication token found');
-    }
-    
-    const userInfo = JSON.parse(userInfoJson);
-    if (!userInfo.token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(`${API_URL}/test-results`, {
+    const response = await authFetch(`${API_URL}/test-results`, {
       method: 'POST',
       headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${userInfo.token}`
+        'Content-Type': 'application/json'
       },
       body: JSON.stringify({
         score,
@@ -38,23 +33,10 @@ export const saveTestResult = async (score, riskLevel, details) => {
   }
 };
 
-export const getTestHistory = async () => {
+export const getTestHistory = async (cursor = null) => {
   try {
-    const userInfoJson = await AsyncStorage.getItem('userInfo');
-    if (!userInfoJson) {
-      throw new Error('No authentication token found');
-    }
-    
-    const userInfo = JSON.parse(userInfoJson);
-    if (!userInfo.token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(`${API_URL}/test-results`, {
-      method: 'GET',
-      headers: {
-        'Authorization': `Bearer ${userInfo.token}`
-      }
+    const response = await authFetch(`${API_URL}/test-results${pageQuery(cursor)}`, {
+      method: 'GET'
     });
 
     if (!response.ok) {
@@ -62,33 +44,21 @@ export const getTestHistory = async () => {
     }
 
     const data = await response.json();
-    return data.test_results;
+    return { testResults: data.test_results, nextCursor: data.next_cursor };
   } catch (error) {
     console.error('Error loading test history:', error);
-    return [];
+    return { testResults: [], nextCursor: null };
   }
 };
 
 export const saveScore = async (score, total = 15, topics = {}) => {
   console.log('[ProgressManager] Attempting to save score...', { score, total });
   try {
-    const userInfoJson = await AsyncStorage.getItem('userInfo');
-    if (!userInfoJson) {
-      console.error('[ProgressManager] saveScore: No userInfo found in AsyncStorage.');
-      throw new Error('No authentication token found');
-    }
-    
-    const userInfo = JSON.parse(userInfoJson);
-    if (!userInfo.token) {
-      console.error('[ProgressManager] saveScore: No token found in userInfo.');
-      throw new Error('No authentication token found');
-    }
     console.log('[ProgressManager] saveScore: Sending score to backend...');
-    const response = await fetch(`${API_URL}/test-scores`, {
+    const response = await authFetch(`${API_URL}/test-scores`, {
       method: 'POST',
       headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${userInfo.token}`
+        'Content-Type': 'application/json'
       },
       body: JSON.stringify({
         score,
@@ -112,29 +82,13 @@ export const saveScore = async (score, total = 15, topics = {}) => {
   }
 };
 
-export const getHistory = async () => {
+export const getHistory = async (cursor = null) => {
   console.log('[ProgressManager] Attempting to get history...');
   try {
-    const userInfoJson = await AsyncStorage.getItem('userInfo');
-    if (!userInfoJson) {
-      console.error('[ProgressManager] getHistory: No userInfo found in AsyncStorage.');
-      throw new Error('No authentication token found');
-    }
-    
-    const userInfo = JSON.parse(userInfoJson);
-    if (!userInfo.token) {
-      console.error('[ProgressManager] getHistory: No token found in userInfo.');
-      throw new Error('No authentication token found');
-    }
-
     console.log(`[ProgressManager] getHistory: Fetching test scores from: ${API_URL}/test-scores`);
-    // console.log(`[ProgressManager] getHistory: Using token: ${userInfo.token.substring(0, 10)}...`); // Keep token logging commented unless needed
 
-    const response = await fetch(`${API_URL}/test-scores`, {
-      method: 'GET',
-      headers: {
-        'Authorization': `Bearer ${userInfo.token}`
-      }
+    const response = await authFetch(`${API_URL}/test-scores${pageQuery(cursor)}`, {
+      method: 'GET'
     });
 
     if (!response.ok) {
@@ -148,11 +102,14 @@ export const getHistory = async () => {
     if (!data.test_scores || data.test_scores.length === 0) {
       console.log('[ProgressManager] getHistory: Backend returned empty test_scores array.');
     }
-    return data.test_scores.map(score => ({
-      date: score.test_date,
-      score: score.score,
-      total: score.max_score
-    }));
+    return {
+      history: data.test_scores.map(score => ({
+        date: score.test_date,
+        score: score.score,
+        total: score.max_score
+      })),
+      nextCursor: data.next_cursor
+    };
   } catch (error) {
     console.error('[ProgressManager] getHistory: Error caught.', error);
     if (error.name === 'TypeError' && error.message === 'Failed to fetch') {
@@ -0,0 +1,50 @@
+// Authenticated API requests: attach the stored access token and, when the
+// server answers 401 (e.g. the token expired while the app was in the
+// background), refresh the session once and retry the request.
+import AsyncStorage from '@react-native-async-storage/async-storage';
+
+let refreshHandler = null;
+let refreshInFlight = null;
+
+// AuthContext registers the function that exchanges the refresh token
+export const setRefreshHandler = (handler) => {
+  refreshHandler = handler;
+};
+
+// Concurrent callers share one refresh: the backend accepts each refresh token only once
+export const refreshSessionOnce = () => {
+  if (!refreshInFlight) {
+    refreshInFlight = (refreshHandler ? refreshHandler() : Promise.resolve(false))
+      .finally(() => {
+        refreshInFlight = null;
+      });
+  }
+  return refreshInFlight;
+};
+
+const withToken = async (options) => {
+  const userInfoJson = await AsyncStorage.getItem('userInfo');
+  const userInfo = userInfoJson ? JSON.parse(userInfoJson) : null;
+  if (!userInfo?.token) {
+    throw new Error('No authentication token found');
+  }
+  return {
+    ...options,
+    headers: {
+      ...(options.headers || {}),
+      Authorization: `Bearer ${userInfo.token}`,
+    },
+  };
+};
+
+export const authFetch = async (url, options = {}) => {
+  const response = await fetch(url, await withToken(options));
+  if (response.status !== 401) {
+    return response;
+  }
+  const refreshed = await refreshSessionOnce();
+  if (!refreshed) {
+    return response;
+  }
+  return fetch(url, await withToken(options));
+};